@@ -4,11 +4,19 @@ Clean Web Interface
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
+import json
 import tempfile
 import os
+import shutil
 import cv2
 from pathlib import Path
-from processing.video_processor import VideoProcessor
+from urllib.parse import urlsplit
+from processing import JobRunner, Settings, profile_names
+from processing.sidecar import track_script_literal
+from detection import default_registry
+from utils.file_io import copy_stream_to_file, deferred_file, prune_stale_dirs
+from utils.media_server import MediaServer, media_type
 import config
 
 # Page configuration
@@ -66,6 +74,199 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+
+
+@st.cache_resource
+def get_model_registry():
+    """Process-wide warm model registry, shared across sessions and reruns."""
+    return default_registry
+
+
+@st.cache_resource
+def get_job_runner():
+    """Process-wide job queue; all sessions share its workers and warm models."""
+    return JobRunner(Settings.from_config().MAX_CONCURRENT_JOBS, get_model_registry())
+
+
+@st.cache_resource
+def get_media_server():
+    """Process-wide server that streams result videos to the player from disk."""
+    try:
+        return MediaServer(config.MEDIA_SERVER_HOST, config.MEDIA_SERVER_PORT,
+                           config.UPLOAD_CHUNK_SIZE)
+    except OSError as e:
+        print(f"⚠️ Media server port {config.MEDIA_SERVER_PORT} unavailable ({e}), using a free port")
+        return MediaServer(config.MEDIA_SERVER_HOST, 0, config.UPLOAD_CHUNK_SIZE)
+
+
+def media_url(path):
+    """URL the browser streams a file from (served from disk, never held in memory)."""
+    server = get_media_server()
+    base = config.MEDIA_SERVER_URL
+    if not base:
+        app_url = urlsplit(st.context.url or "http://localhost")
+        base = f"{app_url.scheme}://{app_url.hostname}:{server.port}"
+    return base.rstrip('/') + server.register(path)
+
+
+def clear_results():
+    """Cancel a pending analysis and delete the previous one from disk and session state."""
+    job_id = st.session_state.pop('job_id', None)
+    if job_id:
+        get_job_runner().cancel(job_id)
+        get_job_runner().forget(job_id)
+    work_dir = st.session_state.pop('work_dir', None)
+    if work_dir:
+        get_media_server().forget(work_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    for key in ['output_path', 'output_filename', 'stats']:
+        st.session_state.pop(key, None)
+
+
+@st.fragment(run_every=1.0)
+def show_job_status(job_id):
+    """Poll the running analysis; the page reruns once it has finished."""
+    job = get_job_runner().get(job_id)
+    if job is None or job.finished:
+        st.rerun(scope="app")
+        return
+
+    st.progress(job.progress)
+    if job.status == "queued":
+        st.text(f"⏳ Queued ({get_job_runner().active_count()} analyses pending)")
+    else:
+        st.text(f"⚡ {job.current_frame}/{job.total_frames} | Fights: {job.fight_frames}")
+    if job.preview is not None:
+        st.image(job.preview, use_container_width=True)
+
+    if st.button("⏹️ Cancel", use_container_width=True):
+        get_job_runner().cancel(job_id)
+
+
+def collect_job_result(job_id):
+    """Move a finished job's result into session state."""
+    runner = get_job_runner()
+    job = runner.get(job_id)
+    st.session_state.pop('job_id', None)
+
+    if job is None or job.status != "done":
+        cancelled = job is not None and job.status == "cancelled"
+        error = job.error if job is not None else "analysis was lost (server restarted?)"
+        clear_results()
+        runner.forget(job_id)
+        if cancelled:
+            st.warning("Analysis cancelled")
+        else:
+            st.error(f"❌ {error}")
+        return
+
+    # The input is no longer needed; the result stays on disk
+    for path in job.video_paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Sidecar output keeps the input's container, so its name may differ
+    output_path = job.result.get('output_path') or job.output_path
+    st.session_state['output_path'] = output_path
+    st.session_state['output_filename'] = os.path.basename(output_path)
+    st.session_state['stats'] = job.result
+    runner.forget(job_id)
+
+
+# Draws the box track of a sidecar output over the page's video player.
+# The component iframe is same-origin, so the script attaches a canvas to the
+# <video> element of st.video in the parent page.
+SIDECAR_OVERLAY_HTML = """
+<script>
+const track = __TRACK__;
+const doc = window.parent.document;
+
+function entryAt(time) {
+    let lo = 0, hi = track.entries.length - 1, found = null;
+    while (lo <= hi) {
+        const mid = (lo + hi) >> 1;
+        if (track.entries[mid].t <= time) { found = track.entries[mid]; lo = mid + 1; }
+        else { hi = mid - 1; }
+    }
+    return found;
+}
+
+function attach() {
+    const video = doc.querySelector('[data-testid="stVideo"]');
+    if (!video || !video.videoWidth) { setTimeout(attach, 250); return; }
+
+    // One overlay per page: a rerun replaces the previous one
+    const old = doc.getElementById('vams-overlay');
+    if (old) { old.remove(); }
+    const canvas = doc.createElement('canvas');
+    canvas.id = 'vams-overlay';
+    canvas.style.cssText = 'position:absolute;left:0;top:0;pointer-events:none;';
+    video.parentElement.style.position = 'relative';
+    video.parentElement.appendChild(canvas);
+    const ctx = canvas.getContext('2d');
+
+    function draw() {
+        if (!canvas.isConnected) { return; }
+        if (!video.isConnected) { canvas.remove(); return; }
+        canvas.style.left = video.offsetLeft + 'px';
+        canvas.style.top = video.offsetTop + 'px';
+        canvas.width = video.clientWidth;
+        canvas.height = video.clientHeight;
+
+        // Displayed picture inside the element (letterboxed), in track pixels
+        const scale = Math.min(canvas.width / video.videoWidth, canvas.height / video.videoHeight);
+        const k = scale * video.videoWidth / track.width;
+        const ox = (canvas.width - video.videoWidth * scale) / 2;
+        const oy = (canvas.height - video.videoHeight * scale) / 2;
+        ctx.font = 'bold 13px sans-serif';
+
+        const entry = entryAt(video.currentTime);
+        if (entry) {
+            for (const [x1, y1, x2, y2, conf, ghost] of entry.fights) {
+                ctx.globalAlpha = ghost ? 0.5 : 1.0;
+                ctx.strokeStyle = ctx.fillStyle = 'rgb(255, 50, 50)';
+                ctx.lineWidth = 2;
+                ctx.strokeRect(ox + x1 * k, oy + y1 * k, (x2 - x1) * k, (y2 - y1) * k);
+                ctx.fillText('FIGHT ' + conf.toFixed(2), ox + x1 * k + 4, oy + y1 * k + 15);
+            }
+            ctx.globalAlpha = 1.0;
+            for (const [cx, cy, label, fighting] of entry.persons) {
+                ctx.fillStyle = fighting ? 'rgb(255, 50, 50)' : 'rgb(30, 140, 220)';
+                ctx.fillText(label, ox + cx * k - 8, oy + cy * k);
+            }
+            if (entry.confirmed) {
+                ctx.fillStyle = 'rgba(255, 50, 50, 0.85)';
+                ctx.fillRect(ox + 8, oy + 8, 118, 24);
+                ctx.fillStyle = 'white';
+                ctx.fillText('FIGHT ACTIVE', ox + 16, oy + 25);
+            }
+        }
+        requestAnimationFrame(draw);
+    }
+    requestAnimationFrame(draw);
+}
+
+attach();
+</script>
+"""
+
+
+def show_sidecar_player(video_path, sidecar):
+    """Play the untouched video with the fight cues and the overlay drawn in the browser."""
+    with open(sidecar['boxes'], encoding='utf-8') as f:
+        track = json.load(f)
+
+
+    # Streamed by URL: st.video(path) would read the whole video into memory
+    st.video(media_url(video_path), format=media_type(video_path),
+             subtitles={"Fights": sidecar['vtt']})
+    components.html(SIDECAR_OVERLAY_HTML.replace('__TRACK__', track_script_literal(track)),
+                    height=0)
+
+    st.caption(f"Original video, not re-encoded — {len(track['cues'])} fight cue(s), "
+               "overlay drawn by the player")
+
+
 # Header
 st.markdown("<h1 style='text-align: center; color: #667eea;'>🎥 VAMS</h1>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; color: #666; margin-bottom: 2rem;'>Violence Detection System</p>", unsafe_allow_html=True)
@@ -96,66 +297,70 @@ if uploaded_file is not None:
             0.1, 0.5, config.CONF_THRESHOLD, 0.05,
             help="Lower = more sensitive"
         )
-        config.CONF_THRESHOLD = sensitivity
 
-    # Analyze button
-    if st.button("🚀 Analyze Video"):
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        preview_placeholder = st.empty()
+        # None runs with the individual values in config.py, like main.py
+        # without --profile
+        profiles = [None] + profile_names()
+        profile = st.selectbox(
+            "Performance Profile",
+            profiles,
+            index=profiles.index(config.PERFORMANCE_PROFILE),
+            format_func=lambda name: name or "config defaults",
+            help="realtime = fastest, forensic = most accurate"
+        )
+
+        sidecar = st.toggle(
+            "Keep original video",
+            help="Skip re-encoding: the overlay is drawn by the player from a sidecar box track"
+        )
+
+    # Analyze button (the analysis runs as a background job)
+    if 'job_id' not in st.session_state and st.button("🚀 Analyze Video"):
+        # Results live on disk in a per-session work dir (only paths and
+        # stats are kept in session state)
+        clear_results()
+        prune_stale_dirs(os.path.join(tempfile.gettempdir(), "vams_*"), config.WORK_DIR_MAX_AGE)
+        work_dir = tempfile.mkdtemp(prefix="vams_")
+        st.session_state['work_dir'] = work_dir
 
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Save file
-                input_path = os.path.join(temp_dir, uploaded_file.name)
-                with open(input_path, 'wb') as f:
-                    f.write(uploaded_file.getbuffer())
-
-                output_filename = f"analyzed_{uploaded_file.name}"
-                output_path = os.path.join(temp_dir, output_filename)
-
-                # Get total frames
-                temp_cap = cv2.VideoCapture(input_path)
-                total_frames = int(temp_cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                temp_cap.release()
-
-                # Progress callback
-                def progress_callback(frame, stats):
-                    progress = min(stats['current_frame'] / total_frames, 1.0)
-                    progress_bar.progress(progress)
-                    status_text.text(f"⚡ {stats['current_frame']}/{total_frames} | Fights: {stats['fight_frames']}")
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    preview_placeholder.image(frame_rgb, use_container_width=True)
-
-                # Process
-                processor = VideoProcessor(
-                    video_paths=[input_path],
-                    output_path=output_path,
-                    progress_callback=progress_callback,
-                    headless=True
-                )
-
-                stats = processor.process()
-                progress_bar.progress(1.0)
-                status_text.empty()
-                preview_placeholder.empty()
-
-                # Read result
-                with open(output_path, 'rb') as f:
-                    processed_video = f.read()
-
-                st.session_state['processed_video'] = processed_video
-                st.session_state['output_filename'] = output_filename
-                st.session_state['stats'] = stats
+            # Save file in chunks
+            input_path = os.path.join(work_dir, uploaded_file.name)
+            copy_stream_to_file(uploaded_file, input_path, config.UPLOAD_CHUNK_SIZE)
 
-            st.success("✅ Complete!")
-            st.rerun()
+            output_filename = f"analyzed_{uploaded_file.name}"
+            output_path = os.path.join(work_dir, output_filename)
+
+            # Get total frames
+            temp_cap = cv2.VideoCapture(input_path)
+            total_frames = int(temp_cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            temp_cap.release()
+
+            # Settings of this analysis only; config.py is left untouched
+            settings = Settings.from_config(profile, CONF_THRESHOLD=sensitivity,
+                                            OUTPUT_MODE='sidecar' if sidecar else 'burn')
+
+            # Queue the analysis; it keeps running if the browser disconnects
+            st.session_state['job_id'] = get_job_runner().submit(
+                [input_path], output_path, total_frames, settings=settings
+            )
 
         except Exception as e:
+            clear_results()
             st.error(f"❌ {str(e)}")
 
+# Running analysis
+if 'job_id' in st.session_state:
+    job = get_job_runner().get(st.session_state['job_id'])
+    if job is None or job.finished:
+        collect_job_result(st.session_state['job_id'])
+        if 'output_path' in st.session_state:
+            st.success("✅ Complete!")
+    else:
+        show_job_status(st.session_state['job_id'])
+
 # Results
-if 'processed_video' in st.session_state:
+if 'output_path' in st.session_state:
     st.markdown("---")
     stats = st.session_state['stats']
 
@@ -169,26 +374,56 @@ if 'processed_video' in st.session_state:
         fight_pct = (stats['fight_frames'] / stats['total_frames'] * 100) if stats['total_frames'] > 0 else 0
         st.metric("Rate", f"{fight_pct:.1f}%")
 
+    startup = stats.get('model_startup') or {}
+    startup_parts = []
+    for name, timing in startup.items():
+        if timing is None:
+            continue
+        if timing['cached']:
+            startup_parts.append(f"{name}: warm")
+        else:
+            startup_parts.append(f"{name}: cold {timing['load_s'] + timing['warmup_s']:.1f}s")
+    if startup_parts:
+        st.caption("Model startup — " + " | ".join(startup_parts))
+
     st.markdown("<br>", unsafe_allow_html=True)
 
     # # Video player
-    # st.video(st.session_state['processed_video'])
+    # st.video(st.session_state['output_path'])
+
+    # Sidecar output: the original video plays with the overlay on top
+    if stats.get('sidecar'):
+        show_sidecar_player(st.session_state['output_path'], stats['sidecar'])
 
-    # Buttons
+    # Buttons (file is read from disk only when download is clicked)
     st.download_button(
         "⬇️ Download",
-        st.session_state['processed_video'],
+        deferred_file(st.session_state['output_path']),
         st.session_state['output_filename'],
-        "video/mp4",
+        media_type(st.session_state['output_filename']),
         use_container_width=True
     )
 
+    if stats.get('sidecar'):
+        st.download_button(
+            "⬇️ Box Track (JSON)",
+            deferred_file(stats['sidecar']['boxes']),
+            os.path.basename(stats['sidecar']['boxes']),
+            "application/json",
+            use_container_width=True
+        )
+        st.download_button(
+            "⬇️ Fight Cues (WebVTT)",
+            deferred_file(stats['sidecar']['vtt']),
+            os.path.basename(stats['sidecar']['vtt']),
+            "text/vtt",
+            use_container_width=True
+        )
+
     if st.button("🔄 New Analysis", use_container_width=True):
-        for key in ['processed_video', 'output_filename', 'stats']:
-            if key in st.session_state:
-                del st.session_state[key]
+        clear_results()
         st.rerun()
 
-else:
+elif 'job_id' not in st.session_state:
     if uploaded_file is None:
         st.info("👆 Upload a video to start", icon="ℹ️")
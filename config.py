@@ -13,6 +13,15 @@ BASE_DIR = Path(__file__).parent.resolve()
 FIGHT_MODEL_PATH = os.path.join(BASE_DIR, "weights", "last.pt")
 PERSON_MODEL_PATH = "yolo11x.pt"  # Ultralytics will auto-download if not found
 
+# ========================
+# MODEL VARIANTS
+# ========================
+# fp32 = original .pt weights, fp16 / int8 = ONNX exports built by
+# `python -m tools.quantize_models` and stored in QUANTIZED_MODEL_DIR
+FIGHT_MODEL_VARIANT = "fp32"
+PERSON_MODEL_VARIANT = "fp32"
+QUANTIZED_MODEL_DIR = os.path.join(BASE_DIR, "weights", "quantized")
+
 # ========================
 # VIDEO PATHS
 # ========================
@@ -21,6 +30,12 @@ VIDEO_PATHS = [
 ]
 
 OUTPUT_PATH = os.path.join(BASE_DIR, "output_fight_detection.mp4")
+DETECTION_LOG_PATH = None  # optional JSONL file with per-frame results
+
+# ========================
+# CHECKPOINTING
+# ========================
+CHECKPOINT_INTERVAL = 0  # frames between checkpoints (0 = disabled)
 
 # ========================
 # DETECTION PARAMETERS
@@ -28,6 +43,84 @@ OUTPUT_PATH = os.path.join(BASE_DIR, "output_fight_detection.mp4")
 CONF_THRESHOLD = 0.15
 IMG_SIZE = 960
 PERSON_CONF_THRESHOLD = 0.3
+PERSON_IMG_SIZE = 640  # input size for the person model
+FRAME_STRIDE = 1       # run inference every N frames (others reuse last results)
+PERSON_STRIDE = 1      # run the person model every N inference frames (others reuse its last results)
+SHARED_PREPROCESS = True  # letterbox each frame once per input size for both models
+
+# ========================
+# LOAD SHEDDING
+# ========================
+# On live feeds, step detection quality down while frames take longer than
+# the target frame time, and back up when there is headroom again. Levels,
+# each adding to the previous one: 1 = glow/shadows off, 2 = person model
+# every LOAD_SHEDDING_PERSON_STRIDE frames, 3 = input sizes scaled by
+# LOAD_SHEDDING_INPUT_SCALE
+LOAD_SHEDDING_ENABLED = False
+LOAD_SHEDDING_TARGET_FPS = 0          # frames per second to keep up with (0 = source FPS)
+LOAD_SHEDDING_PERSON_STRIDE = 2
+LOAD_SHEDDING_INPUT_SCALE = 0.75
+LOAD_SHEDDING_WINDOW = 30             # frames averaged, and minimum frames between changes
+LOAD_SHEDDING_HEADROOM = 0.7          # step up when frames take < this fraction of the budget
+
+# ========================
+# VIDEO READER
+# ========================
+# "opencv" = cv2.VideoCapture, "ffmpeg" = ffmpeg subprocess (needs ffmpeg on
+# PATH, falls back to OpenCV otherwise). The options below apply to ffmpeg
+# only; they change the size/rate of the processed and written video
+VIDEO_READER = "opencv"
+READER_MAX_WIDTH = 0     # downscale wider sources while decoding (0 = source size)
+READER_FPS = 0           # decode at this frame rate (0 = source rate)
+READER_THREADS = 0       # ffmpeg decoder threads (0 = automatic)
+
+# ========================
+# ALERTS
+# ========================
+# An alert is published as soon as the FIGHT_TRIGGER rule confirms a new
+# fight, before the frame is drawn or encoded, and delivered from a
+# background thread: to VideoProcessor(alert_callback=...), a webhook (JSON
+# POST) and/or a UDP socket (one JSON datagram per alert)
+ALERT_WEBHOOK_URL = None      # e.g. "http://127.0.0.1:8080/alerts"
+ALERT_UDP_ADDRESS = None      # "host:port", e.g. "127.0.0.1:9999"
+ALERT_CAMERA_ID = None        # camera name in alerts (None = video file name)
+ALERT_QUEUE_SIZE = 64         # undelivered alerts kept; newer ones are dropped beyond this
+ALERT_TIMEOUT = 2.0           # seconds per webhook request
+
+# ========================
+# THREADS
+# ========================
+# Thread pools of torch (inference) and OpenCV (resizing, colour conversion,
+# encoding); None = library default, about one thread per core each, which
+# oversubscribes the cores when both are busy or the node is shared.
+# `python -m tools.autotune_threads` measures the fastest values on this
+# machine and writes them (with READER_THREADS and MAX_CONCURRENT_JOBS) to
+# THREAD_PROFILE_PATH, which replaces the values in this file when present
+TORCH_THREADS = None
+OPENCV_THREADS = None    # 0 = OpenCV runs single-threaded
+THREAD_PROFILE_PATH = os.path.join(BASE_DIR, "thread_profile.json")  # None = ignore
+
+# ========================
+# MOTION GATE
+# ========================
+# Skip inference on frames without motion (static CCTV scenes); skipped
+# frames reuse the last results like FRAME_STRIDE
+MOTION_GATE_ENABLED = False
+MOTION_THRESHOLD = 0.002        # fraction of changed pixels that counts as motion
+MOTION_PIXEL_DELTA = 25         # gray-level change for a pixel to count as changed
+MOTION_WIDTH = 160              # width of the downscaled comparison image
+MOTION_REFRESH_INTERVAL = 30    # force inference after this many skipped frames
+
+# ========================
+# ARCHIVE SCAN
+# ========================
+# Two-pass scanning of recorded footage (main.py --scan): a sparse,
+# low-resolution fight-model pass finds candidate ranges, then only those
+# ranges (plus padding) run through the full pipeline
+ARCHIVE_COARSE_IMG_SIZE = 480       # fight model input size in the coarse pass
+ARCHIVE_COARSE_FPS = 2.0            # frames per second sampled in the coarse pass
+ARCHIVE_COARSE_CONF_THRESHOLD = 0.1 # below CONF_THRESHOLD: favour recall at low resolution
+ARCHIVE_PADDING_S = 2.0             # seconds added around every candidate
 
 # ========================
 # TEMPORAL WINDOW SETTINGS
@@ -39,6 +132,45 @@ FIGHT_TRIGGER = 6    # minimum frames in window to confirm fight
 # PERSISTENCE SETTINGS
 # ========================
 MAX_PATIENCE = 10    # frames to keep ghost box after fight disappears
+REGION_MATCH_IOU = 0.3  # IoU for a detection to continue an existing fight region
+
+# ========================
+# PERFORMANCE PROFILES
+# ========================
+# A profile sets model size, input sizes, frame stride and overlay detail
+# together. None keeps the individual values defined in this file.
+PERFORMANCE_PROFILE = None
+PERFORMANCE_PROFILES = {
+    "realtime": {
+        "PERSON_MODEL_PATH": "yolo11n.pt",
+        "IMG_SIZE": 480,
+        "PERSON_IMG_SIZE": 416,
+        "FRAME_STRIDE": 2,
+        "OVERLAY_DETAIL": "minimal",
+    },
+    "balanced": {
+        "PERSON_MODEL_PATH": "yolo11s.pt",
+        "IMG_SIZE": 640,
+        "PERSON_IMG_SIZE": 640,
+        "FRAME_STRIDE": 1,
+        "OVERLAY_DETAIL": "standard",
+    },
+    "forensic": {
+        "PERSON_MODEL_PATH": "yolo11x.pt",
+        "IMG_SIZE": 960,
+        "PERSON_IMG_SIZE": 960,
+        "FRAME_STRIDE": 1,
+        "OVERLAY_DETAIL": "full",
+    },
+}
+
+# Overlay detail -> (GLOW_ENABLED, SHADOW_ENABLED)
+OVERLAY_DETAIL = "full"
+OVERLAY_DETAIL_LEVELS = {
+    "full": (True, True),
+    "standard": (False, True),
+    "minimal": (False, False),
+}
 
 # ========================
 # GRAPH SETTINGS
@@ -50,6 +182,34 @@ GRAPH_HISTORY_SIZE = 100  # number of intensity values to store
 # ========================
 FOURCC = 'XVID'  # Video codec
 DEFAULT_FPS = 25  # Default FPS if video metadata is unavailable
+# "burn" = overlay drawn into every frame and encoded to OUTPUT_PATH;
+# "sidecar" = the input is copied to OUTPUT_PATH untouched (several inputs
+# are remuxed with ffmpeg, OUTPUT_PATH takes the input's extension) and the
+# results are written next to it as WebVTT cues (.vtt) and a JSON box track
+# (.boxes.json) for players that draw the overlay; nothing is encoded
+OUTPUT_MODE = "burn"
+# Frames are decoded into a ring of reused buffers; a frame passed to
+# progress_callback stays valid until this many more frames were read
+FRAME_POOL_SIZE = 3
+# Background jobs (web UI): analyses running at once on this node; more
+# submissions wait in the queue. Each job already uses all CPU cores for
+# inference, so raise this only on machines with spare cores or a GPU
+MAX_CONCURRENT_JOBS = 1
+
+# Live preview (web UI): previews and progress updates are rate-limited
+PREVIEW_MAX_FPS = 2                  # previews per second (0 = progress only)
+PREVIEW_MAX_WIDTH = 640              # previews are downscaled to this width
+PREVIEW_JPEG_QUALITY = 70            # JPEG quality of previews
+PROGRESS_INTERVAL = 0.25             # seconds between progress updates
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # bytes per chunk when saving uploads
+WORK_DIR_MAX_AGE = 6 * 3600          # web results left behind are deleted after this (s)
+# Result videos are streamed to the web player from disk by a small HTTP
+# server on this port (0 = any free port). MEDIA_SERVER_URL is its address as
+# seen by the browser, e.g. behind a reverse proxy (None = the app's host name
+# with MEDIA_SERVER_PORT)
+MEDIA_SERVER_HOST = "0.0.0.0"
+MEDIA_SERVER_PORT = 8502
+MEDIA_SERVER_URL = None
 
 # ========================
 # VISUAL THEME - UNIQUE PROFESSIONAL STYLE
@@ -83,6 +243,7 @@ BOX_CORNER_RADIUS = 12             # Rounded corner radius
 LABEL_PADDING = 10                 # Padding inside labels
 SHADOW_ENABLED = True              # Enable drop shadows
 GLOW_ENABLED = True                # Enable glow effects
+LABEL_SPRITE_CACHE_SIZE = 512      # Rendered labels kept for reuse (LRU)
 
 # Dashboard Design
 DASHBOARD_ALPHA = 0.85             # Transparency for dashboard panels
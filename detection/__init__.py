@@ -5,8 +5,13 @@ Provides fight detection and person tracking components.
 
 from .fight_detector import FightDetector
 from .person_tracker import PersonTracker
+from .model_registry import ModelRegistry, default_registry
+from .temporal import TemporalState
 
 __all__ = [
     'FightDetector',
     'PersonTracker',
+    'ModelRegistry',
+    'default_registry',
+    'TemporalState',
 ]
@@ -1,108 +1,245 @@
 
 import cv2
-from ultralytics import YOLO
-import config
-from utils.drawing import draw_text_with_background, draw_rounded_rectangle, draw_glow_effect
+import numpy as np
+from settings import Settings
+from .model_registry import ModelHandle
+from .tracker_state import reset_trackers, restore_trackers, snapshot_trackers
+from .temporal import TemporalState
+from utils.geometry import box_iou
+from utils.drawing import draw_rounded_rectangle, draw_glow_effect
+from utils.sprites import blit_sprites, default_sprite_cache
 
 
 class FightDetector:
 
 
-    def __init__(self, model_path=None):
-
-        model_path = model_path or config.FIGHT_MODEL_PATH
-        self.model = YOLO(model_path)
-        self.names = self.model.names
-
-        # Persistence variables
-        self.last_fight_box = None
-        self.fight_patience = 0
-
-    def detect(self, frame):
-
+    def __init__(self, model_path=None, variant=None, registry=None, state=None, settings=None):
+
+        # Per-run settings, resolved once (config.py values by default)
+        self.update_settings(settings or Settings.from_config())
+
+        model_path = model_path or self.settings.FIGHT_MODEL_PATH
+        variant = variant or self.settings.FIGHT_MODEL_VARIANT
+
+        # Model is loaded (or taken warm from the registry) on first use
+        self._model = ModelHandle(model_path, variant, self.img_size, registry)
+        self._fight_class_ids = None
+
+        # Per-stream temporal state; holds the fight regions (current
+        # detections and ghosts) and how many frames each one has gone
+        # without a matching detection
+        self.state = state or TemporalState(self.settings.WINDOW, self.settings.FIGHT_TRIGGER,
+                                            self.settings.GRAPH_HISTORY_SIZE)
+
+    def update_settings(self, settings):
+        """
+        Switch to other settings mid-run (e.g. load shedding). Only the
+        per-frame values change; the model and the fight regions stay.
+        """
+        self.settings = settings
+        self.conf_threshold = settings.CONF_THRESHOLD
+        self.img_size = settings.IMG_SIZE
+        self.max_patience = settings.MAX_PATIENCE
+        self.region_match_iou = settings.REGION_MATCH_IOU
+
+    @property
+    def model(self):
+        return self._model.get()
+
+    @property
+    def names(self):
+        return self.model.names
+
+    @property
+    def fight_class_ids(self):
+        """Class ids named "fight" in the model."""
+        if self._fight_class_ids is None:
+            self._fight_class_ids = np.array(
+                [cls_id for cls_id, name in self.names.items() if name == "fight"], dtype=int
+            )
+        return self._fight_class_ids
+
+    @property
+    def startup(self):
+        """Load/warm-up timings of the model, None until first use."""
+        return self._model.startup
+
+    def close(self):
+        """Return the model to the registry."""
+        self._model.release()
+
+    def tracker_snapshot(self):
+        """Pickled tracker state (None before the first frame)."""
+        return snapshot_trackers(self.model) if self._model.loaded else None
+
+    def restore_tracker(self, blob):
+        """Restore tracker state saved with tracker_snapshot()."""
+        if blob:
+            restore_trackers(self.model, blob)
+
+    def reset_tracker(self):
+        """Forget tracks, e.g. before jumping to another part of the video."""
+        if self._model.loaded:
+            reset_trackers(self.model)
+
+    def detect(self, frame, draw=True, inputs=None):
+        """
+        Detect fights in a frame and update the fight regions.
+
+        Args:
+            frame: BGR frame
+            draw: Draw the fight regions onto frame
+            inputs: Optional FrameInputs of this frame, to share the
+                    letterboxed model input with the person tracker
+
+        Returns:
+            tuple: (frame_has_fight, current_fight_found, max_fight_conf, region_boxes)
+        """
+
+        image = inputs.image_for(self.model, self.img_size) if inputs is not None else None
         results = self.model.track(
-            source=frame,
-            conf=config.CONF_THRESHOLD,
-            imgsz=config.IMG_SIZE,
+            source=frame if image is None else image,
+            conf=self.conf_threshold,
+            imgsz=self.img_size,
             persist=True,
             verbose=False
         )
 
-        frame_has_fight = 0
-        current_fight_found = False
-        max_fight_conf = 0.0
-        current_fight_box_coords = None
-
-        # Process fight detections
-        for r in results:
-            if r.boxes is None:
-                continue
+        det_boxes, det_confs = self._fight_boxes(results, inputs, image)
 
-            for box in r.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                cls_id = int(box.cls[0])
-                conf = float(box.conf[0])
+        current_fight_found = len(det_boxes) > 0
+        max_fight_conf = float(det_confs.max()) if current_fight_found else 0.0
 
-                class_name = self.names[cls_id]
+        self._update_regions(det_boxes, det_confs)
 
-                if class_name == "fight":
-                    label = f"FIGHT {conf:.2f}"
-                    frame_has_fight = 1
-                    current_fight_found = True
-                    max_fight_conf = max(max_fight_conf, conf)
-                    current_fight_box_coords = [x1, y1, x2, y2]
+        frame_has_fight = 1 if len(self.state.region_boxes) else 0
 
-                    # Update persistence
-                    self.last_fight_box = (x1, y1, x2, y2, label, conf)
-                    self.fight_patience = 0
+        if draw:
+            self.draw(frame)
 
-                    # Draw fight box
-                    self._draw_fight_box(frame, x1, y1, x2, y2, label, conf)
+        return frame_has_fight, current_fight_found, max_fight_conf, self.state.region_boxes.copy()
 
-        # Apply Ghost Box if no fight detected but we have patience
-        if not current_fight_found and self.last_fight_box is not None \
-           and self.fight_patience < config.MAX_PATIENCE:
-            self.fight_patience += 1
-            frame_has_fight = 1  # Treat as fight frame
+    def scan(self, frame):
+        """
+        Stateless fight detection for sparse sampling (no tracking, no
+        regions, no drawing).
 
-            x1, y1, x2, y2, label, conf = self.last_fight_box
-            current_fight_box_coords = [x1, y1, x2, y2]
-
-            # Draw ghost box (slightly transparent)
-            self._draw_fight_box(frame, x1, y1, x2, y2, label, conf, is_ghost=True)
+        Returns:
+            tuple: (boxes, confs) of the fight detections in this frame
+        """
+        results = self.model.predict(
+            source=frame,
+            conf=self.conf_threshold,
+            imgsz=self.img_size,
+            verbose=False
+        )
+        return self._fight_boxes(results)
+
+    def _fight_boxes(self, results, inputs=None, image=None):
+        """
+        Collect every fight box of a result list as arrays: one device->host
+        copy per frame, then class filtering on arrays.
+
+        Args:
+            results: Ultralytics results
+            inputs, image: FrameInputs and the letterboxed image the results
+                           were computed on (boxes are mapped back to the frame)
+
+        Returns:
+            tuple: ((N, 4) int boxes, (N,) float confidences)
+        """
+        det_boxes = [np.empty((0, 4), dtype=int)]
+        det_confs = [np.empty(0, dtype=float)]
+        for r in results:
+            if r.boxes is None or len(r.boxes) == 0:
+                continue
 
-        return frame_has_fight, current_fight_found, max_fight_conf, current_fight_box_coords
+            boxes = r.boxes.cpu().numpy()
+            fight_mask = np.isin(boxes.cls.astype(int), self.fight_class_ids)
+            xyxy = boxes.xyxy[fight_mask]
+            if image is not None:
+                xyxy = inputs.to_frame(image, xyxy)
+            det_boxes.append(xyxy.astype(int))
+            det_confs.append(boxes.conf[fight_mask].astype(float))
+
+        return np.concatenate(det_boxes), np.concatenate(det_confs)
+
+    def _update_regions(self, det_boxes, det_confs):
+        """
+        Per-region ghost persistence.
+
+        A previous region that overlaps a current detection is replaced by
+        it. Regions without a matching detection stay as ghost boxes for up
+        to MAX_PATIENCE frames, independently of each other.
+        """
+
+        state = self.state
+        if len(state.region_boxes) and len(det_boxes):
+            matched = box_iou(state.region_boxes, det_boxes).max(axis=1) >= self.region_match_iou
+        else:
+            matched = np.zeros(len(state.region_boxes), dtype=bool)
+
+        ghost = ~matched & (state.region_patience < self.max_patience)
+
+        state.region_boxes = np.concatenate((det_boxes, state.region_boxes[ghost]))
+        state.region_confs = np.concatenate((det_confs, state.region_confs[ghost]))
+        state.region_patience = np.concatenate((
+            np.zeros(len(det_boxes), dtype=int),
+            state.region_patience[ghost] + 1,
+        ))
+
+    def draw(self, frame):
+        """Draw the fight regions from the most recent detect() call onto frame."""
+
+        state = self.state
+        labels = []
+        for (x1, y1, x2, y2), conf, patience in zip(state.region_boxes.tolist(),
+                                                     state.region_confs.tolist(),
+                                                     state.region_patience.tolist()):
+            # Ghost boxes are drawn slightly transparent
+            labels.append(self._draw_fight_box(frame, x1, y1, x2, y2, f"FIGHT {conf:.2f}", conf,
+                                               is_ghost=patience > 0))
+
+        # Labels go on top of all boxes, as one batch of cached sprites
+        blit_sprites(frame, labels)
 
     def _draw_fight_box(self, frame, x1, y1, x2, y2, label, conf, is_ghost=False):
-        """Draw fight bounding box with unique styling."""
+        """
+        Draw fight bounding box with unique styling.
+
+        Returns:
+            tuple: (label sprite, x, y) placement for blit_sprites()
+        """
 
-        color = config.COLOR_FIGHT
+        s = self.settings
+        color = s.COLOR_FIGHT
 
         # Add glow effect for high confidence fights
-        if config.GLOW_ENABLED and conf > 0.3 and not is_ghost:
+        if s.GLOW_ENABLED and conf > 0.3 and not is_ghost:
             draw_glow_effect(frame, (x1, y1), (x2, y2), color,
                            intensity=int(15 * min(conf / 0.3, 1.0)),
-                           radius=config.BOX_CORNER_RADIUS)
+                           radius=s.BOX_CORNER_RADIUS)
 
         # Draw rounded rectangle box
         alpha = 0.6 if is_ghost else 1.0
         draw_rounded_rectangle(
             frame, (x1, y1), (x2, y2), color,
-            thickness=config.BOX_THICKNESS,
-            radius=config.BOX_CORNER_RADIUS,
+            thickness=s.BOX_THICKNESS,
+            radius=s.BOX_CORNER_RADIUS,
             alpha=alpha
         )
 
-        # Draw label with enhanced style
-        draw_text_with_background(
-            frame,
+        # Label with enhanced style
+        sprite = default_sprite_cache.label(
             label,
-            (x1 + 5, y1 - 10),
-            font_scale=config.FONT_SCALE_SMALL,
-            text_color=config.COLOR_TEXT_PRIMARY,
-            bg_color=config.COLOR_FIGHT,
-            thickness=config.FONT_THICKNESS,
-            padding=config.LABEL_PADDING,
-            radius=config.BOX_CORNER_RADIUS // 2,
-            alpha=0.9 if not is_ghost else 0.7
+            font_scale=s.FONT_SCALE_SMALL,
+            text_color=s.COLOR_TEXT_PRIMARY,
+            bg_color=s.COLOR_FIGHT,
+            thickness=s.FONT_THICKNESS,
+            padding=s.LABEL_PADDING,
+            radius=s.BOX_CORNER_RADIUS // 2,
+            alpha=0.9 if not is_ghost else 0.7,
+            shadow=s.SHADOW_ENABLED,
+            shadow_offset=s.PANEL_SHADOW_OFFSET
         )
+        return sprite, x1 + 5, y1 - 10
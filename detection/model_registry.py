@@ -0,0 +1,122 @@
+"""
+Process-wide model registry.
+Loads YOLO models lazily, warms them up once and keeps them for reuse across
+VideoProcessor instances (and Streamlit reruns).
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .model_variants import load_model, variant_path
+from .tracker_state import reset_trackers
+
+
+class ModelRegistry:
+    """
+    Pool of loaded, warmed-up models keyed by resolved model file.
+
+    A model is handed to one user at a time (YOLO tracking keeps per-stream
+    state on the model), and returned to the pool when that user is done.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = {}
+        self.timings = {}
+
+    def acquire(self, model_path, variant=None, imgsz=640):
+        """
+        Get a ready-to-use model, loading and warming it up on first use.
+
+        Args:
+            model_path: Base model path
+            variant: Model variant (fp32, fp16, int8)
+            imgsz: Input size used for the warm-up inference
+
+        Returns:
+            tuple: (model, startup) where startup is a dict with
+                   'cached', 'load_s' and 'warmup_s'
+        """
+        key = variant_path(model_path, variant)
+
+        with self._lock:
+            idle = self._idle.get(key)
+            model = idle.pop() if idle else None
+
+        if model is not None:
+            reset_trackers(model)
+            startup = {'cached': True, 'load_s': 0.0, 'warmup_s': 0.0}
+        else:
+            start = time.perf_counter()
+            model = load_model(model_path, variant)
+            loaded = time.perf_counter()
+
+            # First inference builds the predictor and initialises the backend
+            dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+            model.predict(source=dummy, imgsz=imgsz, verbose=False)
+            warmed = time.perf_counter()
+
+            startup = {'cached': False, 'load_s': loaded - start, 'warmup_s': warmed - loaded}
+
+        with self._lock:
+            entry = self.timings.setdefault(key, {'loads': 0, 'reuses': 0})
+            entry['reuses' if startup['cached'] else 'loads'] += 1
+            if not startup['cached']:
+                entry['load_s'] = startup['load_s']
+                entry['warmup_s'] = startup['warmup_s']
+
+        return model, startup
+
+    def release(self, model_path, variant, model):
+        """Return a model to the pool for the next user."""
+        key = variant_path(model_path, variant)
+        with self._lock:
+            self._idle.setdefault(key, []).append(model)
+
+    def preload(self, model_path, variant=None, imgsz=640):
+        """Load and warm up a model now so the first analysis starts warm."""
+        model, startup = self.acquire(model_path, variant, imgsz)
+        self.release(model_path, variant, model)
+        return startup
+
+    def clear(self):
+        """Drop all idle models."""
+        with self._lock:
+            self._idle.clear()
+
+
+class ModelHandle:
+    """Lazily acquired model owned by one detector."""
+
+    def __init__(self, model_path, variant=None, imgsz=640, registry=None):
+        self.model_path = model_path
+        self.variant = variant
+        self.imgsz = imgsz
+        self.registry = registry or default_registry
+        self.startup = None
+        self._model = None
+
+    @property
+    def loaded(self):
+        """Whether the model is currently held by this handle."""
+        return self._model is not None
+
+    def get(self):
+        """Return the model, acquiring it from the registry on first call."""
+        if self._model is None:
+            self._model, self.startup = self.registry.acquire(
+                self.model_path, self.variant, self.imgsz
+            )
+        return self._model
+
+    def release(self):
+        """Hand the model back to the registry."""
+        if self._model is not None:
+            self.registry.release(self.model_path, self.variant, self._model)
+            self._model = None
+
+
+# Shared by every VideoProcessor in this process
+default_registry = ModelRegistry()
@@ -0,0 +1,63 @@
+"""
+Model variant resolution.
+Maps a base model path plus a precision variant (fp32, fp16, int8) to the
+file that should be loaded, and loads it with Ultralytics.
+"""
+
+import os
+import config
+
+# Variants produced by tools/quantize_models.py
+VARIANTS = ('fp32', 'fp16', 'int8')
+
+
+def variant_path(model_path, variant=None):
+    """
+    Resolve the file for a model variant.
+
+    ``fp32`` is the original Ultralytics checkpoint. Other variants are ONNX
+    exports stored in ``config.QUANTIZED_MODEL_DIR`` as ``<stem>_<variant>.onnx``.
+
+    Args:
+        model_path: Base model path (e.g. weights/last.pt or yolo11x.pt)
+        variant: One of VARIANTS (None means fp32)
+
+    Returns:
+        str: Path of the model file to load
+    """
+    variant = (variant or 'fp32').lower()
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown model variant '{variant}', expected one of {VARIANTS}")
+
+    if variant == 'fp32':
+        return model_path
+
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(config.QUANTIZED_MODEL_DIR, f"{stem}_{variant}.onnx")
+
+
+def load_model(model_path, variant=None):
+    """
+    Load a YOLO model, optionally a quantized variant of it.
+
+    Args:
+        model_path: Base model path
+        variant: One of VARIANTS (None means fp32)
+
+    Returns:
+        ultralytics.YOLO: Loaded model
+    """
+    # Deferred: importing ultralytics pulls in torch, which takes seconds
+    from ultralytics import YOLO
+
+    path = variant_path(model_path, variant)
+    if path != model_path and not os.path.exists(path):
+        raise FileNotFoundError(
+            f"❌ Model variant not found: {path} "
+            f"(run: python -m tools.quantize_models)"
+        )
+
+    # ONNX exports carry no task metadata Ultralytics can always recover
+    if path.endswith('.onnx'):
+        return YOLO(path, task='detect')
+    return YOLO(path)
@@ -1,83 +1,191 @@
 
 import cv2
-from ultralytics import YOLO
-import config
-from utils.drawing import draw_text_with_background
-from utils.geometry import point_in_box
+import numpy as np
+from settings import Settings
+from utils.sprites import blit_sprites, default_sprite_cache
+from utils.geometry import box_centers, points_in_boxes
+from .model_registry import ModelHandle
+from .tracker_state import reset_trackers, restore_trackers, snapshot_trackers
 
 
 class PersonTracker:
 
 
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, variant=None, registry=None, settings=None):
 
-        model_path = model_path or config.PERSON_MODEL_PATH
-        self.model = YOLO(model_path)
+        # Per-run settings, resolved once (config.py values by default)
+        self.update_settings(settings or Settings.from_config())
 
-    def track(self, frame, fight_box_coords=None):
+        model_path = model_path or self.settings.PERSON_MODEL_PATH
+        variant = variant or self.settings.PERSON_MODEL_VARIANT
 
+        # Model is loaded (or taken warm from the registry) on first use
+        self._model = ModelHandle(model_path, variant, self.img_size, registry)
+
+        # People of the last track() call: centres (N, 2) and track ids (-1 = none)
+        self._centers = np.empty((0, 2), dtype=int)
+        self._ids = np.empty(0, dtype=int)
+
+        # Labels from the last track() call: (cx, cy, label, is_fighting)
+        self.last_labels = []
+
+    def update_settings(self, settings):
+        """
+        Switch to other settings mid-run (e.g. load shedding). Only the
+        per-frame values change; the model stays the same.
+        """
+        self.settings = settings
+        self.conf_threshold = settings.PERSON_CONF_THRESHOLD
+        self.img_size = settings.PERSON_IMG_SIZE
+
+    @property
+    def model(self):
+        return self._model.get()
+
+    @property
+    def startup(self):
+        """Load/warm-up timings of the model, None until first use."""
+        return self._model.startup
+
+    def close(self):
+        """Return the model to the registry."""
+        self._model.release()
+
+    def tracker_snapshot(self):
+        """Pickled tracker state (None before the first frame)."""
+        return snapshot_trackers(self.model) if self._model.loaded else None
+
+    def restore_tracker(self, blob):
+        """Restore tracker state saved with tracker_snapshot()."""
+        if blob:
+            restore_trackers(self.model, blob)
+
+    def reset_tracker(self):
+        """Forget tracks, e.g. before jumping to another part of the video."""
+        if self._model.loaded:
+            reset_trackers(self.model)
+
+    def association_state(self):
+        """JSON-serialisable people of the last track() call (used by associate())."""
+        return {'centers': self._centers.tolist(), 'ids': self._ids.tolist()}
+
+    def restore_association(self, data):
+        """Restore people saved with association_state()."""
+        if data:
+            self._centers = np.array(data['centers'], dtype=int).reshape(-1, 2)
+            self._ids = np.array(data['ids'], dtype=int)
+
+    def track(self, frame, fight_boxes=None, draw=True, inputs=None):
+        """
+        Track people and associate them with fight regions.
+
+        Args:
+            frame: BGR frame
+            fight_boxes: (R, 4) array of fight regions (x1, y1, x2, y2)
+            draw: Draw person labels onto frame
+            inputs: Optional FrameInputs of this frame, to share the
+                    letterboxed model input with the fight detector
+
+        Returns:
+            tuple: (person_count, fighting_people_ids)
+        """
+
+        image = inputs.image_for(self.model, self.img_size) if inputs is not None else None
         person_results = self.model.track(
-            source=frame,
+            source=frame if image is None else image,
             classes=[0],  # 0 is person class
-            conf=config.PERSON_CONF_THRESHOLD,
+            conf=self.conf_threshold,
+            imgsz=self.img_size,
             persist=True,
             verbose=False
         )
 
-        person_count = 0
-        fighting_people_ids = []
-
+        centers = [np.empty((0, 2), dtype=int)]
+        ids = [np.empty(0, dtype=int)]
         for r in person_results:
-            if r.boxes is None:
+            if r.boxes is None or len(r.boxes) == 0:
                 continue
 
-            person_count += len(r.boxes)
+            # One device->host copy per frame, then array ops
+            boxes = r.boxes.cpu().numpy()
 
-            for box in r.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                conf = float(box.conf[0])
+            ids.append(boxes.id.astype(int) if boxes.id is not None
+                       else np.full(len(boxes), -1, dtype=int))
 
-                # Get ID if available
-                p_id = int(box.id[0]) if box.id is not None else -1
+            # Centre of each person (tracked on the letterboxed image when
+            # inputs are shared, mapped back to the frame)
+            xyxy = boxes.xyxy if image is None else inputs.to_frame(image, boxes.xyxy)
+            centers.append(box_centers(xyxy.astype(int)))
 
-                # Calculate center of person
-                cx = int((x1 + x2) / 2)
-                cy = int((y1 + y2) / 2)
+        self._centers = np.concatenate(centers)
+        self._ids = np.concatenate(ids)
 
-                # Check if person's CENTER is inside fight box (stricter check)
-                is_fighting = False
-                if fight_box_coords:
-                    if point_in_box((cx, cy), fight_box_coords):
-                        if p_id != -1:
-                            fighting_people_ids.append(p_id)
-                        is_fighting = True
+        person_count, fighting_people_ids = self.associate(fight_boxes)
 
-                # Draw person label with unique styling
-                label = f"P{p_id}" if p_id != -1 else f"P?"
-                self._draw_person_label(frame, cx, cy, label, is_fighting)
+        if draw:
+            self.draw(frame)
 
         return person_count, fighting_people_ids
 
-    def _draw_person_label(self, frame, cx, cy, label, is_fighting=False):
-        """Draw person label with unique rounded styling."""
+    def associate(self, fight_boxes=None):
+        """
+        Match the people of the last track() call with fight regions.
+
+        Runs no inference, so frames that skip the person model can still
+        follow the current fight regions.
+
+        Args:
+            fight_boxes: (R, 4) array of fight regions (x1, y1, x2, y2)
+
+        Returns:
+            tuple: (person_count, fighting_people_ids)
+        """
+        centers, ids = self._centers, self._ids
+
+        # Person is fighting if their CENTER is inside any fight region
+        # (stricter than box overlap); one (people x regions) array op
+        if fight_boxes is not None and len(fight_boxes):
+            fighting = points_in_boxes(centers, fight_boxes).any(axis=1)
+        else:
+            fighting = np.zeros(len(centers), dtype=bool)
+
+        self.last_labels = [
+            (cx, cy, f"P{p_id}" if p_id != -1 else f"P?", is_fighting)
+            for (cx, cy), p_id, is_fighting in zip(centers.tolist(), ids.tolist(), fighting.tolist())
+        ]
+        return len(centers), ids[fighting & (ids != -1)].tolist()
+
+    def draw(self, frame):
+        """Draw the labels from the most recent track() call onto frame."""
+
+        # Cached label sprites, all composited in one batch
+        blit_sprites(frame, [
+            (self._person_label_sprite(label, is_fighting), cx - 15, cy + 5)
+            for cx, cy, label, is_fighting in self.last_labels
+        ])
+
+    def _person_label_sprite(self, label, is_fighting=False):
+        """Person label with unique rounded styling, as a cached sprite."""
+
+        s = self.settings
 
         # Use different colors for fighting vs non-fighting people
         if is_fighting:
-            text_color = config.COLOR_TEXT_PRIMARY
-            bg_color = config.COLOR_DANGER
+            text_color = s.COLOR_TEXT_PRIMARY
+            bg_color = s.COLOR_DANGER
         else:
-            text_color = config.COLOR_TEXT_PRIMARY
-            bg_color = config.COLOR_PERSON
+            text_color = s.COLOR_TEXT_PRIMARY
+            bg_color = s.COLOR_PERSON
 
-        draw_text_with_background(
-            frame,
+        return default_sprite_cache.label(
             label,
-            (cx - 15, cy + 5),
-            font_scale=config.FONT_SCALE_SMALL,
+            font_scale=s.FONT_SCALE_SMALL,
             text_color=text_color,
             bg_color=bg_color,
-            thickness=config.FONT_THICKNESS,
+            thickness=s.FONT_THICKNESS,
             padding=8,
-            radius=config.BOX_CORNER_RADIUS // 2,
-            alpha=0.9
+            radius=s.BOX_CORNER_RADIUS // 2,
+            alpha=0.9,
+            shadow=s.SHADOW_ENABLED,
+            shadow_offset=s.PANEL_SHADOW_OFFSET
         )
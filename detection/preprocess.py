@@ -0,0 +1,79 @@
+"""
+Shared preprocessing.
+Letterboxes a frame once per model input shape, so the fight and person
+models share one resize/pad when they use the same input size, and maps
+boxes found on the letterboxed image back to frame coordinates.
+
+Ultralytics is imported lazily so that importing the detection package
+stays cheap (see tools/startup_time.py).
+"""
+
+
+def letterbox_params(model):
+    """
+    Letterbox settings the model's predictor uses for its input.
+
+    Args:
+        model: ultralytics.YOLO model that has run at least once (warm)
+
+    Returns:
+        tuple: (auto, stride); auto=True pads to a multiple of stride
+               (rectangular inference), False pads to a square
+    """
+    predictor = model.predictor
+    backend = predictor.model
+    fmt = getattr(backend, 'format', 'pt')
+    auto = bool(predictor.args.rect) and \
+        (fmt == 'pt' or (getattr(backend, 'dynamic', False) and fmt != 'imx'))
+    return auto, backend.stride
+
+
+class FrameInputs:
+    """
+    Model inputs of one frame.
+
+    image() returns the frame letterboxed exactly as Ultralytics would do
+    it, computed on the first request per (imgsz, auto, stride). Passed to
+    the model as the source, Ultralytics' own letterbox is a no-op on it.
+    """
+
+    def __init__(self, frame):
+        """
+        Args:
+            frame: BGR frame; must not be drawn on before the last image()
+                   call of this frame
+        """
+        self.frame = frame
+        self._images = {}
+
+    def image(self, imgsz, auto=True, stride=32):
+        """Letterboxed BGR uint8 image for a model input size."""
+        key = (imgsz, auto, int(stride))
+        image = self._images.get(key)
+        if image is None:
+            from ultralytics.data.augment import LetterBox
+            image = LetterBox(imgsz, auto=auto, stride=stride)(image=self.frame)
+            self._images[key] = image
+        return image
+
+    def image_for(self, model, imgsz):
+        """Letterboxed image for a warm model at imgsz."""
+        return self.image(imgsz, *letterbox_params(model))
+
+    def to_frame(self, image, boxes):
+        """
+        Map xyxy boxes from a letterboxed image to frame coordinates.
+
+        Args:
+            image: Image returned by image()
+            boxes: (N, 4) float array, modified in place
+
+        Returns:
+            The boxes, clipped to the frame
+        """
+        from ultralytics.utils.ops import scale_boxes
+        return scale_boxes(image.shape[:2], boxes, self.frame.shape[:2])
+
+    def __len__(self):
+        """Number of distinct letterboxed images computed."""
+        return len(self._images)
@@ -0,0 +1,195 @@
+"""
+Temporal confirmation.
+Per-stream temporal state (sliding confirmation window, intensity graph,
+ghost fight regions) and helpers to turn per-frame fight flags into
+confirmed fight intervals.
+"""
+
+from array import array
+
+import numpy as np
+
+import config
+
+
+class TemporalState:
+    """
+    Compact temporal state of one video stream.
+
+    The confirmation window is a ring buffer with a running count, so
+    confirming a frame is O(1) regardless of WINDOW. The whole state can be
+    serialised with to_dict() and restored with from_dict().
+    """
+
+    __slots__ = (
+        'window', 'trigger', 'count', '_flags', '_pos',
+        'graph_size', '_graph', '_graph_pos', '_graph_len',
+        'region_boxes', 'region_confs', 'region_patience',
+    )
+
+    def __init__(self, window=None, trigger=None, graph_size=None):
+        self.window = window or config.WINDOW
+        self.trigger = trigger or config.FIGHT_TRIGGER
+        self.graph_size = graph_size or config.GRAPH_HISTORY_SIZE
+
+        # Confirmation window: ring buffer of 0/1 flags plus running sum
+        self._flags = array('B', bytes(self.window))
+        self._pos = 0
+        self.count = 0
+
+        # Intensity graph: ring buffer of the last graph_size values
+        self._graph = array('f', bytes(4 * self.graph_size))
+        self._graph_pos = 0
+        self._graph_len = 0
+
+        # Fight regions (current detections and ghosts), see FightDetector
+        self.region_boxes = np.empty((0, 4), dtype=int)
+        self.region_confs = np.empty(0, dtype=float)
+        self.region_patience = np.empty(0, dtype=int)
+
+    def update(self, frame_has_fight):
+        """
+        Push one frame's fight flag into the window.
+
+        Returns:
+            bool: True if the frame is a confirmed fight frame
+        """
+        flag = 1 if frame_has_fight else 0
+        self.count += flag - self._flags[self._pos]
+        self._flags[self._pos] = flag
+        self._pos = (self._pos + 1) % self.window
+        return self.count >= self.trigger
+
+    @property
+    def confirmed(self):
+        """Whether the most recent frame was confirmed."""
+        return self.count >= self.trigger
+
+    def push_intensity(self, value):
+        """Append one value to the intensity graph."""
+        self._graph[self._graph_pos] = value
+        self._graph_pos = (self._graph_pos + 1) % self.graph_size
+        self._graph_len = min(self._graph_len + 1, self.graph_size)
+
+    def graph_history(self):
+        """Intensity graph values, oldest first."""
+        start = (self._graph_pos - self._graph_len) % self.graph_size
+        return [self._graph[(start + i) % self.graph_size] for i in range(self._graph_len)]
+
+    def to_dict(self):
+        """JSON-serialisable snapshot of the state."""
+        return {
+            'window': self.window,
+            'trigger': self.trigger,
+            'graph_size': self.graph_size,
+            'flags': list(self._flags),
+            'pos': self._pos,
+            'graph': self.graph_history(),
+            'region_boxes': self.region_boxes.tolist(),
+            'region_confs': self.region_confs.tolist(),
+            'region_patience': self.region_patience.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a state saved with to_dict()."""
+        state = cls(data['window'], data['trigger'], data['graph_size'])
+        state._flags = array('B', data['flags'])
+        state._pos = data['pos']
+        state.count = sum(state._flags)
+        for value in data['graph']:
+            state.push_intensity(value)
+        state.region_boxes = np.array(data['region_boxes'], dtype=int).reshape(-1, 4)
+        state.region_confs = np.array(data['region_confs'], dtype=float)
+        state.region_patience = np.array(data['region_patience'], dtype=int)
+        return state
+
+
+def confirmed_flags(frame_flags, window=None, trigger=None):
+    """
+    Apply the sliding-window confirmation rule to a sequence of per-frame flags.
+
+    A frame is confirmed when at least ``trigger`` of the last ``window``
+    frames (including itself) were fight frames, exactly as
+    ``VideoProcessor`` counts ``fight_frames``.
+
+    Args:
+        frame_flags: Iterable of 0/1 per-frame fight flags
+        window: Window size in frames (defaults to config.WINDOW)
+        trigger: Minimum fight frames in window (defaults to config.FIGHT_TRIGGER)
+
+    Returns:
+        list: 0/1 confirmation flag per frame
+    """
+    state = TemporalState(window, trigger, graph_size=1)
+    return [1 if state.update(flag) else 0 for flag in frame_flags]
+
+
+def flags_to_intervals(flags):
+    """
+    Convert 0/1 flags into inclusive (start, end) frame index intervals.
+
+    Args:
+        flags: Sequence of 0/1 flags
+
+    Returns:
+        list: List of (start, end) tuples
+    """
+    intervals = []
+    start = None
+    for i, flag in enumerate(flags):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            intervals.append((start, i - 1))
+            start = None
+    if start is not None:
+        intervals.append((start, len(flags) - 1))
+    return intervals
+
+
+def confirmed_intervals(frame_flags, window=None, trigger=None):
+    """
+    Confirmed fight intervals for a sequence of per-frame flags.
+
+    Returns:
+        list: List of inclusive (start, end) frame index tuples
+    """
+    return flags_to_intervals(confirmed_flags(frame_flags, window, trigger))
+
+
+def interval_agreement(reference, candidate):
+    """
+    Compare two interval lists.
+
+    Args:
+        reference: Reference (start, end) intervals
+        candidate: Candidate (start, end) intervals
+
+    Returns:
+        dict: Frame-level IoU, recall/precision of reference intervals
+              (an interval counts as found if any candidate overlaps it)
+    """
+    ref_frames = set()
+    for s, e in reference:
+        ref_frames.update(range(s, e + 1))
+    cand_frames = set()
+    for s, e in candidate:
+        cand_frames.update(range(s, e + 1))
+
+    union = ref_frames | cand_frames
+    iou = len(ref_frames & cand_frames) / len(union) if union else 1.0
+
+    def _overlaps(a, others):
+        return any(a[0] <= b[1] and b[0] <= a[1] for b in others)
+
+    found = sum(1 for iv in reference if _overlaps(iv, candidate))
+    matched = sum(1 for iv in candidate if _overlaps(iv, reference))
+
+    return {
+        'frame_iou': iou,
+        'interval_recall': found / len(reference) if reference else 1.0,
+        'interval_precision': matched / len(candidate) if candidate else 1.0,
+        'reference_intervals': len(reference),
+        'candidate_intervals': len(candidate),
+    }
@@ -0,0 +1,54 @@
+"""
+Tracker state snapshots.
+Save and restore the Ultralytics tracker attached to a model so a resumed
+run continues with the same track IDs as an uninterrupted one.
+"""
+
+import pickle
+
+
+def snapshot_trackers(model):
+    """
+    Serialise the trackers attached to a model.
+
+    Args:
+        model: ultralytics.YOLO model that has been used with track()
+
+    Returns:
+        bytes: Pickled tracker state, or None if the model has no trackers yet
+    """
+    from ultralytics.trackers.basetrack import BaseTrack
+
+    trackers = getattr(getattr(model, 'predictor', None), 'trackers', None)
+    if not trackers:
+        return None
+    return pickle.dumps({'trackers': trackers, 'next_id': BaseTrack._count})
+
+
+def reset_trackers(model):
+    """Clear the tracker state attached to a model (new stream, same model)."""
+    predictor = getattr(model, 'predictor', None)
+    for tracker in getattr(predictor, 'trackers', None) or []:
+        tracker.reset()
+
+
+def restore_trackers(model, blob):
+    """
+    Attach trackers saved with snapshot_trackers() to a loaded model.
+
+    Args:
+        model: ultralytics.YOLO model (already warmed up, so it has a predictor)
+        blob: Bytes returned by snapshot_trackers()
+    """
+    from ultralytics.trackers import register_tracker
+    from ultralytics.trackers.basetrack import BaseTrack
+
+    data = pickle.loads(blob)
+
+    # Register the tracking callbacks with persist=True so the next track()
+    # call keeps the restored trackers instead of creating new ones
+    register_tracker(model, True)
+    model.predictor.trackers = data['trackers']
+
+    # Track IDs come from a process-wide counter
+    BaseTrack._count = max(BaseTrack._count, data['next_id'])
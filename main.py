@@ -1,15 +1,120 @@
 
-from processing import VideoProcessor
+import argparse
+import sys
+import time
+
+_START = time.perf_counter()
+
+import config
+from processing import ArchiveScanner, Settings, VideoProcessor
+from processing.archive_scan import print_report
+from processing.preflight import check_setup
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(description="Fight Detection System")
+    parser.add_argument(
+        '--profile',
+        choices=list(config.PERFORMANCE_PROFILES),
+        default=config.PERFORMANCE_PROFILE,
+        help="Performance profile (default: values from config.py)"
+    )
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=int,
+        default=config.CHECKPOINT_INTERVAL,
+        help="Save a checkpoint every N frames (0 disables)"
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="Continue from the last checkpoint of the output video"
+    )
+    parser.add_argument(
+        '--detection-log',
+        default=config.DETECTION_LOG_PATH,
+        help="Write per-frame detection results to this JSONL file"
+    )
+    parser.add_argument(
+        '--output-mode',
+        choices=['burn', 'sidecar'],
+        default=config.OUTPUT_MODE,
+        help="burn = draw the overlay into the video, sidecar = copy the video "
+             "and write the overlay to .vtt / .boxes.json files"
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help="Validate config and inputs without loading models, then exit"
+    )
+    parser.add_argument(
+        '--scan',
+        action='store_true',
+        help="Two-pass archive scan: full pipeline only on candidate ranges"
+    )
+    parser.add_argument(
+        '--scan-compare',
+        action='store_true',
+        help="With --scan, also run a full single pass and compare confirmed intervals"
+    )
+    return parser.parse_args()
+
+
+def run_check(settings):
+
+    print("=" * 60)
+    print("VAMS Preflight Check")
+    print("=" * 60)
+
+    results = check_setup(settings=settings)
+    for ok, message in results:
+        print(f"[{'OK' if ok else 'FAIL'}] {message}")
+
+    all_passed = all(ok for ok, _ in results)
+    print("=" * 60)
+    print(f"{'[SUCCESS]' if all_passed else '[ERROR]'} "
+          f"{sum(ok for ok, _ in results)}/{len(results)} checks passed "
+          f"in {time.perf_counter() - _START:.2f}s "
+          f"(torch imported: {'torch' in sys.modules})")
+    return all_passed
+
+
+def run_scan(args):
+
+    print("=" * 60)
+    print("Fight Detection System - Archive Scan")
+    print("=" * 60)
+
+    scanner = ArchiveScanner(
+        settings=Settings.from_config(args.profile, OUTPUT_MODE=args.output_mode),
+        detection_log_path=args.detection_log
+    )
+    print_report(scanner.run(compare=args.scan_compare))
 
 
 def main():
-    
+
+    args = parse_args()
+
+    if args.check:
+        sys.exit(0 if run_check(Settings.from_config(args.profile, OUTPUT_MODE=args.output_mode)) else 1)
+
+    if args.scan:
+        run_scan(args)
+        return
+
     print("=" * 60)
     print("Fight Detection System")
     print("=" * 60)
     
     # Create and run video processor
-    processor = VideoProcessor()
+    processor = VideoProcessor(
+        settings=Settings.from_config(args.profile, OUTPUT_MODE=args.output_mode),
+        checkpoint_interval=args.checkpoint_interval,
+        resume=args.resume,
+        detection_log_path=args.detection_log
+    )
     
     try:
         stats = processor.process()
@@ -27,6 +132,8 @@ def main():
         
     except KeyboardInterrupt:
         print("\n\n⚠️ Processing interrupted by user")
+        if processor.checkpoints and processor.checkpoints.exists():
+            print("Run again with --resume to continue from the last checkpoint")
     except Exception as e:
         print(f"\n\n❌ Error during processing: {e}")
         raise
@@ -4,7 +4,16 @@ Provides video processing pipeline.
 """
 
 from .video_processor import VideoProcessor
+from .jobs import JobRunner
+from .archive_scan import ArchiveScanner
+from .preview import PreviewPolicy
+from settings import Settings, profile_names
 
 __all__ = [
     'VideoProcessor',
+    'PreviewPolicy',
+    'JobRunner',
+    'ArchiveScanner',
+    'Settings',
+    'profile_names',
 ]
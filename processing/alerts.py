@@ -0,0 +1,156 @@
+"""
+Fight alerts.
+Publishes a compact event when a fight is first confirmed, from a
+background thread, to a callback, a webhook and/or a UDP socket. The frame
+loop only queues the event, so a slow or unreachable receiver never delays
+processing.
+"""
+
+import json
+import queue
+import socket
+import threading
+import time
+import urllib.request
+
+
+class WebhookTarget:
+    """POSTs each event as JSON to a URL."""
+
+    def __init__(self, url, timeout=2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, event):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(event).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def __repr__(self):
+        return f"webhook {self.url}"
+
+
+class UdpTarget:
+    """Sends each event as one JSON datagram to host:port."""
+
+    def __init__(self, address):
+        host, _, port = address.rpartition(':')
+        self.address = (host or '127.0.0.1', int(port))
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __call__(self, event):
+        self._socket.sendto(json.dumps(event).encode('utf-8'), self.address)
+
+    def close(self):
+        self._socket.close()
+
+    def __repr__(self):
+        return f"udp {self.address[0]}:{self.address[1]}"
+
+
+def alert_targets(settings, callback=None):
+    """
+    Alert targets configured in settings, plus an optional callback.
+
+    Args:
+        settings: Settings (ALERT_WEBHOOK_URL, ALERT_UDP_ADDRESS, ALERT_TIMEOUT)
+        callback: Optional function(event)
+
+    Returns:
+        list: Callables taking an event dict
+    """
+    targets = []
+    if callback:
+        targets.append(callback)
+    if settings.ALERT_WEBHOOK_URL:
+        targets.append(WebhookTarget(settings.ALERT_WEBHOOK_URL, settings.ALERT_TIMEOUT))
+    if settings.ALERT_UDP_ADDRESS:
+        targets.append(UdpTarget(settings.ALERT_UDP_ADDRESS))
+    return targets
+
+
+class AlertPublisher:
+    """
+    Delivers alert events to the targets on a worker thread.
+
+    publish() never blocks: events wait in a bounded queue and are dropped
+    (and counted) when it is full. Latencies are measured from the moment
+    the frame was decoded: to publish() (in the event as 'latency_ms') and
+    to the end of delivery (delivery_ms).
+    """
+
+    def __init__(self, targets, queue_size=64):
+        """
+        Args:
+            targets: Callables taking an event dict (see alert_targets())
+            queue_size: Events waiting for delivery before new ones are dropped
+        """
+        self.targets = targets
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="vams-alerts", daemon=True)
+        self._thread.start()
+
+        self.events = []        # every published event
+        self.delivery_ms = []   # decode to delivered, per delivered event
+        self.dropped = 0
+        self.failures = 0
+
+    def publish(self, event, decoded_at):
+        """
+        Queue an event for delivery.
+
+        Args:
+            event: JSON-serialisable dict
+            decoded_at: time.perf_counter() when the frame was decoded
+        """
+        event['latency_ms'] = round((time.perf_counter() - decoded_at) * 1000, 2)
+        self.events.append(event)
+        try:
+            self._queue.put_nowait((event, decoded_at))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Deliver what is queued (up to timeout seconds) and stop the worker."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        for target in self.targets:
+            if hasattr(target, 'close'):
+                target.close()
+
+    def summary(self):
+        """Alert counts and decode-to-alert latencies (ms)."""
+        published = [e['latency_ms'] for e in self.events]
+        return {
+            'alerts': len(self.events),
+            'dropped': self.dropped,
+            'failures': self.failures,
+            'publish_ms_max': max(published, default=None),
+            'delivery_ms_mean': round(sum(self.delivery_ms) / len(self.delivery_ms), 2)
+            if self.delivery_ms else None,
+            'delivery_ms_max': max(self.delivery_ms, default=None),
+        }
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            event, decoded_at = item
+
+            delivered = True
+            for target in self.targets:
+                try:
+                    target(event)
+                except Exception as e:
+                    delivered = False
+                    self.failures += 1
+                    print(f"⚠️ Alert delivery failed ({target!r}): {e}")
+            if delivered:
+                self.delivery_ms.append(round((time.perf_counter() - decoded_at) * 1000, 2))
@@ -0,0 +1,269 @@
+"""
+Two-pass archive scanning.
+A coarse pass runs only the fight model, at a low input size and on a
+sparse sample of frames, to find candidate time ranges. The full pipeline
+(full IMG_SIZE, person tracking, overlay) then runs only on those ranges
+plus padding, seeking directly in the source videos.
+"""
+
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from detection import FightDetector
+from detection.temporal import flags_to_intervals, interval_agreement
+from settings import Settings
+from .detection_log import read_detection_log
+from .video_processor import VideoProcessor
+from .video_reader import open_video
+
+
+def merge_ranges(ranges):
+    """Merge overlapping or touching inclusive (start, end) ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ArchiveScanner:
+    """
+    Coarse-to-fine scan of recorded videos.
+
+    run() returns a report with the candidate ranges, the frames and time
+    spent in each pass, the estimated compute saved and, with compare=True,
+    how the confirmed fight intervals agree with a full single-pass run.
+    """
+
+    def __init__(self, video_paths=None, output_path=None, settings=None, registry=None,
+                 detection_log_path=None, coarse_img_size=None, coarse_fps=None,
+                 coarse_conf_threshold=None, padding_s=None):
+        """
+        Args:
+            video_paths: Input videos (defaults to settings.VIDEO_PATHS)
+            output_path: Output video with the processed ranges only
+                         (defaults to settings.OUTPUT_PATH)
+            settings: Settings of the full pipeline (defaults to config.py)
+            registry: ModelRegistry shared by both passes
+            detection_log_path: Detection log of the fine pass
+            coarse_img_size: Fight model input size in the coarse pass
+            coarse_fps: Frames per second sampled in the coarse pass
+            coarse_conf_threshold: Fight confidence that makes a sample a candidate
+            padding_s: Seconds processed before and after every candidate
+        """
+        self.settings = settings or Settings.from_config()
+        s = self.settings
+        self.video_paths = video_paths or s.VIDEO_PATHS
+        self.output_path = output_path or s.OUTPUT_PATH
+        self.registry = registry
+        self.detection_log_path = detection_log_path or s.DETECTION_LOG_PATH
+
+        self.coarse_img_size = coarse_img_size or s.ARCHIVE_COARSE_IMG_SIZE
+        self.coarse_fps = coarse_fps or s.ARCHIVE_COARSE_FPS
+        self.coarse_conf_threshold = s.ARCHIVE_COARSE_CONF_THRESHOLD \
+            if coarse_conf_threshold is None else coarse_conf_threshold
+        self.padding_s = s.ARCHIVE_PADDING_S if padding_s is None else padding_s
+
+    def coarse_pass(self):
+        """
+        Sample every source sparsely with the fight model at low resolution.
+
+        Returns:
+            tuple: (ranges, source_frames, samples) with ranges one list of
+                   inclusive (start, end) frames per source, source_frames
+                   the frame count of each source and samples the number
+                   of frames that went through the model
+        """
+        detector = FightDetector(
+            registry=self.registry,
+            settings=self.settings.replace(IMG_SIZE=self.coarse_img_size,
+                                           CONF_THRESHOLD=self.coarse_conf_threshold)
+        )
+
+        ranges, source_frames, samples = [], [], 0
+        try:
+            for video_path in self.video_paths:
+                cap = open_video(video_path, self.settings)
+                if not cap.isOpened():
+                    print(f"❌ Skipping: {video_path}")
+                    ranges.append([])
+                    source_frames.append(0)
+                    continue
+
+                fps = cap.get(cv2.CAP_PROP_FPS) or self.settings.DEFAULT_FPS
+                step = max(1, round(fps / self.coarse_fps))
+                # Padding covers at least the gap between two samples
+                padding = max(step, round(self.padding_s * fps))
+
+                hits, index = [], 0
+                while True:
+                    # Skipped frames are only demuxed/decoded, never converted
+                    if index % step == 0:
+                        ret, frame = cap.read()
+                        if not ret:
+                            break
+                        samples += 1
+                        _, confs = detector.scan(frame)
+                        if len(confs):
+                            hits.append(index)
+                    elif not cap.grab():
+                        break
+                    index += 1
+                cap.release()
+
+                last = index - 1
+                ranges.append(merge_ranges(
+                    (max(0, f - padding), min(last, f + padding)) for f in hits
+                ))
+                source_frames.append(index)
+                print(f"🔎 {video_path}: {len(hits)} of {-(-index // step)} samples "
+                      f"-> {len(ranges[-1])} candidate ranges")
+        finally:
+            detector.close()
+
+        return ranges, source_frames, samples
+
+    def fine_pass(self, ranges, detection_log_path=None):
+        """Run the full pipeline on the candidate ranges only."""
+        processor = VideoProcessor(
+            video_paths=self.video_paths,
+            output_path=self.output_path,
+            headless=True,
+            registry=self.registry,
+            checkpoint_interval=0,
+            detection_log_path=detection_log_path or self.detection_log_path,
+            settings=self.settings,
+            frame_ranges=ranges,
+        )
+        return processor.process()
+
+    def full_pass(self, output_path, detection_log_path):
+        """Reference: the full pipeline on every frame."""
+        processor = VideoProcessor(
+            video_paths=self.video_paths,
+            output_path=output_path,
+            headless=True,
+            registry=self.registry,
+            checkpoint_interval=0,
+            detection_log_path=detection_log_path,
+            settings=self.settings,
+        )
+        return processor.process()
+
+    def run(self, compare=False):
+        """
+        Run both passes (and the reference pass with compare=True).
+
+        Returns:
+            dict: Report, see print_report()
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            fine_log = self.detection_log_path or os.path.join(tmp, 'fine.jsonl')
+
+            started = time.perf_counter()
+            ranges, source_frames, samples = self.coarse_pass()
+            coarse_s = time.perf_counter() - started
+
+            fine_frames = sum(end - start + 1 for source in ranges for start, end in source)
+            started = time.perf_counter()
+            if fine_frames:
+                self.fine_pass(ranges, fine_log)
+            fine_s = time.perf_counter() - started
+
+            total_frames = sum(source_frames)
+            report = {
+                'total_frames': total_frames,
+                'coarse_samples': samples,
+                'coarse_img_size': self.coarse_img_size,
+                'candidate_ranges': [[i, start, end] for i, source in enumerate(ranges)
+                                     for start, end in source],
+                'fine_frames': fine_frames,
+                'coarse_s': coarse_s,
+                'fine_s': fine_s,
+                'estimated_compute_saved': self._estimated_saving(ranges, source_frames,
+                                                                  samples),
+            }
+
+            if compare:
+                full_log = os.path.join(tmp, 'full.jsonl')
+                ext = os.path.splitext(self.output_path)[1] or '.mp4'
+                started = time.perf_counter()
+                self.full_pass(os.path.join(tmp, 'full' + ext), full_log)
+                report['full_s'] = time.perf_counter() - started
+
+                reference = self._confirmed_intervals(full_log, source_frames)
+                candidate = self._confirmed_intervals(fine_log, source_frames) \
+                    if fine_frames else []
+                report['agreement'] = interval_agreement(reference, candidate)
+
+        return report
+
+    def _estimated_saving(self, ranges, source_frames, samples):
+        """
+        Fraction of model compute saved against a full pass, counting model
+        cost as proportional to input pixels (imgsz squared).
+
+        Both the fine and the full pass run the models every FRAME_STRIDE
+        frames (the person model every PERSON_STRIDE of those), starting
+        on the first frame of every range or source.
+        """
+        s = self.settings
+        stride = max(1, s.FRAME_STRIDE)
+        full_inferences = sum(-(-frames // stride) for frames in source_frames)
+        if not full_inferences:
+            return 0.0
+        fine_inferences = sum(-(-(end - start + 1) // stride)
+                              for source in ranges for start, end in source)
+
+        frame_cost = s.IMG_SIZE ** 2 + s.PERSON_IMG_SIZE ** 2 / max(1, s.PERSON_STRIDE)
+        coarse_cost = self.coarse_img_size ** 2
+        scan_cost = samples * coarse_cost + fine_inferences * frame_cost
+        return 1.0 - scan_cost / (full_inferences * frame_cost)
+
+    @staticmethod
+    def _confirmed_intervals(log_path, source_frames):
+        """
+        Confirmed fight intervals of a detection log, as inclusive frame
+        ranges over all sources laid end to end.
+        """
+        offsets = np.concatenate(([0], np.cumsum(source_frames)))
+        flags = np.zeros(int(offsets[-1]), dtype=np.uint8)
+        for record in read_detection_log(log_path):
+            if record['confirmed']:
+                flags[offsets[record['source']] + record['source_frame']] = 1
+        return flags_to_intervals(flags.tolist())
+
+
+def print_report(report):
+    """Print an ArchiveScanner.run() report."""
+    total = report['total_frames']
+    print("\n" + "=" * 60)
+    print("Archive Scan Report")
+    print("=" * 60)
+    print(f"Source frames: {total}")
+    print(f"Coarse pass: {report['coarse_samples']} samples at imgsz "
+          f"{report['coarse_img_size']} in {report['coarse_s']:.1f}s")
+    print(f"Candidate ranges: {len(report['candidate_ranges'])}")
+    for source, start, end in report['candidate_ranges']:
+        print(f"  video {source + 1}: frames {start}-{end}")
+    if total:
+        print(f"Fine pass: {report['fine_frames']} frames "
+              f"({report['fine_frames'] / total:.1%} of source) in {report['fine_s']:.1f}s")
+    print(f"Estimated model compute saved: {report['estimated_compute_saved']:.1%}")
+
+    if 'full_s' in report:
+        scan_s = report['coarse_s'] + report['fine_s']
+        print(f"Full single pass: {report['full_s']:.1f}s, two-pass scan: {scan_s:.1f}s "
+              f"({1 - scan_s / report['full_s']:.1%} time saved)")
+        agreement = report['agreement']
+        print(f"Confirmed intervals: {agreement['reference_intervals']} (full) vs "
+              f"{agreement['candidate_intervals']} (scan)")
+        print(f"Interval recall: {agreement['interval_recall']:.1%}, "
+              f"precision: {agreement['interval_precision']:.1%}, "
+              f"frame IoU: {agreement['frame_iou']:.3f}")
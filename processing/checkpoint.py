@@ -0,0 +1,124 @@
+"""
+Checkpoint and resume support.
+Keeps the output of a long run as finalized video segments next to a JSON
+checkpoint, so an interrupted run can continue from the last checkpoint.
+"""
+
+import glob
+import json
+import os
+import pickle
+import shutil
+import subprocess
+
+import cv2
+
+
+class CheckpointManager:
+    """
+    Files kept next to the output video while a run is in progress:
+
+        <output>.checkpoint.json      position, stats, temporal state
+        <output>.checkpoint.pkl       tracker state of both models
+        <output>.segments/            finalized output segments
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.path = output_path + '.checkpoint.json'
+        self.tracker_path = output_path + '.checkpoint.pkl'
+        self.segment_dir = output_path + '.segments'
+        self.ext = os.path.splitext(output_path)[1] or '.avi'
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def segment_path(self, index):
+        """Path of the index-th output segment."""
+        os.makedirs(self.segment_dir, exist_ok=True)
+        return os.path.join(self.segment_dir, f"segment_{index:05d}{self.ext}")
+
+    def save(self, data, trackers):
+        """
+        Atomically write a checkpoint.
+
+        Args:
+            data: JSON-serialisable checkpoint dict (must contain 'frame_count')
+            trackers: Dict of pickled tracker snapshots
+        """
+        tmp = self.tracker_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump({'frame_count': data['frame_count'], 'trackers': trackers}, f)
+        os.replace(tmp, self.tracker_path)
+
+        # The JSON file is written last; it is what marks a checkpoint valid
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        """
+        Read the last checkpoint.
+
+        Returns:
+            tuple: (data, trackers) where trackers is {} if the tracker file
+                   is missing or belongs to another checkpoint
+        """
+        with open(self.path) as f:
+            data = json.load(f)
+
+        trackers = {}
+        if os.path.exists(self.tracker_path):
+            with open(self.tracker_path, 'rb') as f:
+                saved = pickle.load(f)
+            if saved.get('frame_count') == data['frame_count']:
+                trackers = saved['trackers']
+        return data, trackers
+
+    def discard_unlisted(self, segments):
+        """Delete partial segments written after the last checkpoint."""
+        keep = set(segments)
+        for path in glob.glob(os.path.join(self.segment_dir, f"segment_*{self.ext}")):
+            if path not in keep:
+                os.remove(path)
+
+    def finalize(self, segments, fourcc, fps, size):
+        """
+        Join the segments into the output video.
+
+        Segments are concatenated without re-encoding when ffmpeg is
+        available, otherwise they are re-encoded with OpenCV.
+        """
+        if len(segments) == 1:
+            os.replace(segments[0], self.output_path)
+        elif segments and shutil.which('ffmpeg'):
+            list_path = os.path.join(self.segment_dir, 'segments.txt')
+            with open(list_path, 'w') as f:
+                for path in segments:
+                    f.write(f"file '{os.path.abspath(path)}'\n")
+            subprocess.run(
+                ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                 '-i', list_path, '-c', 'copy', self.output_path],
+                check=True
+            )
+        elif segments:
+            writer = cv2.VideoWriter(self.output_path, fourcc, fps, size)
+            for path in segments:
+                cap = cv2.VideoCapture(path)
+                while True:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    writer.write(frame)
+                cap.release()
+            writer.release()
+
+        self.clear()
+
+    def clear(self):
+        """Remove checkpoint files and segments."""
+        for path in (self.path, self.tracker_path):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self.segment_dir, ignore_errors=True)
@@ -0,0 +1,47 @@
+"""
+Per-frame detection log.
+Writes one JSON line per processed frame (fight regions, people, confirmation)
+so results can be inspected, resumed from a byte offset, or post-processed.
+"""
+
+import json
+import os
+
+
+class DetectionLog:
+
+    def __init__(self, path, resume_offset=None):
+        """
+        Open the log.
+
+        Args:
+            path: JSONL file path
+            resume_offset: If given, keep the first ``resume_offset`` bytes of
+                           an existing log (from a checkpoint) and append after them
+        """
+        self.path = path
+        if resume_offset is not None and os.path.exists(path):
+            self._file = open(path, 'r+b')
+            self._file.truncate(resume_offset)
+            self._file.seek(resume_offset)
+        else:
+            self._file = open(path, 'wb')
+
+    def write(self, record):
+        """Append one frame record."""
+        self._file.write((json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8'))
+
+    def offset(self):
+        """Flush and return the current byte offset (for checkpoints)."""
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_detection_log(path):
+    """Load every record of a detection log."""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
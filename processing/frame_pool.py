@@ -0,0 +1,50 @@
+"""
+Frame pool.
+A fixed ring of frame buffers that the capture decodes into, so the frame
+loop does not allocate a new full-size frame for every frame it reads.
+"""
+
+
+class FramePool:
+    """
+    Ring of reusable frame buffers.
+
+    Buffers are created by the first reads (and again when the frame size
+    changes, e.g. at the next input video), after that every read decodes
+    in place. A frame handed out by read() stays valid until ``size`` more
+    frames have been read; stages that keep a frame longer (previews,
+    reference frames) must copy it.
+    """
+
+    def __init__(self, size=3):
+        """
+        Args:
+            size: Number of buffers (at least 1)
+        """
+        self.size = max(1, size)
+        self._buffers = [None] * self.size
+        self._slot = 0
+        self.allocations = 0  # reads that could not reuse a buffer
+
+    def read(self, cap):
+        """
+        Read the next frame from a cv2.VideoCapture into the pool.
+
+        Returns:
+            tuple: (ret, frame) like cap.read()
+        """
+        slot = self._slot
+        self._slot = (slot + 1) % self.size
+
+        buffer = self._buffers[slot]
+        ret, frame = cap.read(image=buffer)
+        if ret and frame is not buffer:
+            # First use of this slot or a new frame size
+            self._buffers[slot] = frame
+            self.allocations += 1
+        return ret, frame
+
+    def clear(self):
+        """Drop all buffers."""
+        self._buffers = [None] * self.size
+        self._slot = 0
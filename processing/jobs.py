@@ -0,0 +1,184 @@
+"""
+Background analysis jobs.
+An in-process worker pool that runs VideoProcessor off the caller's thread,
+so the web UI only submits jobs and polls their status.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from detection import default_registry
+from settings import Settings
+from .preview import PreviewPolicy
+from .video_processor import VideoProcessor
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Job:
+    """Status of one submitted analysis. Fields are updated by the worker."""
+
+    def __init__(self, job_id, video_paths, output_path, total_frames=0, options=None):
+        self.id = job_id
+        self.video_paths = video_paths
+        self.output_path = output_path
+        self.options = options or {}
+
+        self.status = QUEUED
+        self.current_frame = 0
+        self.total_frames = total_frames
+        self.fight_frames = 0
+        self.preview = None          # latest JPEG preview (bytes)
+        self.result = None           # stats returned by VideoProcessor.process()
+        self.error = None
+
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self._processor = None
+        self._future = None
+        self._cancel_requested = False
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def progress(self):
+        """Fraction of frames processed (0.0 - 1.0)."""
+        if self.status == DONE:
+            return 1.0
+        if not self.total_frames:
+            return 0.0
+        return min(self.current_frame / self.total_frames, 1.0)
+
+
+class JobRunner:
+    """
+    Runs analyses on a bounded thread pool.
+
+    All jobs share one model registry, so a model loaded for one job is
+    reused warm by the next. At most ``max_workers`` analyses run at once;
+    further submissions wait in the queue.
+    """
+
+    def __init__(self, max_workers=None, registry=None, preview_policy=None):
+        """
+        Args:
+            max_workers: Concurrent analyses (defaults to MAX_CONCURRENT_JOBS of the
+                         thread profile or config.py)
+            registry: ModelRegistry shared by all jobs (defaults to default_registry)
+            preview_policy: PreviewPolicy for all job previews (defaults to
+                            one built from each job's settings)
+        """
+        self.max_workers = max_workers or Settings.from_config().MAX_CONCURRENT_JOBS
+        self.registry = registry or default_registry
+        self.preview_policy = preview_policy
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="vams-job")
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, video_paths, output_path, total_frames=0, **options):
+        """
+        Queue an analysis.
+
+        Args:
+            video_paths: List of input video paths
+            output_path: Output video path
+            total_frames: Expected frame count, for progress reporting
+            **options: Extra VideoProcessor arguments (settings, detection_log_path, ...)
+
+        Returns:
+            Job id
+        """
+        with self._lock:
+            job_id = f"job-{next(self._ids)}"
+            job = Job(job_id, list(video_paths), output_path, total_frames, options)
+            self._jobs[job_id] = job
+
+        job._future = self._executor.submit(self._run, job)
+        return job_id
+
+    def get(self, job_id):
+        """Job by id, or None if unknown (e.g. after a server restart)."""
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        """All known jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def active_count(self):
+        """Number of queued or running jobs."""
+        return sum(1 for job in self.jobs() if not job.finished)
+
+    def cancel(self, job_id):
+        """Cancel a queued job or stop a running one after its current frame."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return
+        job._cancel_requested = True
+        if job._future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        elif job._processor:
+            job._processor.stop()
+
+    def forget(self, job_id):
+        """Drop a finished job from the list (its files are left to the caller)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        """Stop running jobs and shut the pool down."""
+        for job in self.jobs():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job):
+        if job.status == CANCELLED:
+            return
+
+        def progress_callback(preview, stats):
+            job.current_frame = stats['current_frame']
+            job.fight_frames = stats['fight_frames']
+            if preview is not None:
+                job.preview = preview
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job._processor = VideoProcessor(
+                video_paths=job.video_paths,
+                output_path=job.output_path,
+                progress_callback=progress_callback,
+                preview_policy=self.preview_policy or
+                PreviewPolicy(settings=job.options.get('settings')),
+                headless=True,
+                registry=self.registry,
+                **job.options
+            )
+            if job._cancel_requested:
+                job._processor.stop()
+            job.result = job._processor.process()
+            job.status = CANCELLED if job.result.get('stopped') else DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+            print(f"❌ {job.id} failed: {e}")
+        finally:
+            job._processor = None
+            job.finished_at = time.time()
@@ -0,0 +1,168 @@
+"""
+Load shedding.
+Watches the per-frame processing time against a real-time budget and steps
+detection quality down (overlay effects, person-model stride, input size)
+while the pipeline falls behind, and back up when there is headroom.
+"""
+
+import time
+from datetime import datetime
+
+
+def _scaled_size(size, scale):
+    """Input size scaled and rounded to a multiple of 32 (at least 320)."""
+    return max(320, int(round(size * scale / 32)) * 32)
+
+
+def shedding_levels(settings):
+    """
+    Degradation levels for a run, each adding to the previous one.
+
+    Levels that would not change anything (e.g. glow already off in the
+    realtime profile) are left out.
+
+    Args:
+        settings: Settings of the run (level 0)
+
+    Returns:
+        list: (name, Settings) tuples, level 0 first
+    """
+    s = settings
+    steps = [
+        ("overlay effects off", dict(GLOW_ENABLED=False, SHADOW_ENABLED=False)),
+        (f"person model every {s.LOAD_SHEDDING_PERSON_STRIDE} frames",
+         dict(PERSON_STRIDE=max(s.PERSON_STRIDE, s.LOAD_SHEDDING_PERSON_STRIDE))),
+        (f"input size x{s.LOAD_SHEDDING_INPUT_SCALE}",
+         dict(IMG_SIZE=_scaled_size(s.IMG_SIZE, s.LOAD_SHEDDING_INPUT_SCALE),
+              PERSON_IMG_SIZE=_scaled_size(s.PERSON_IMG_SIZE, s.LOAD_SHEDDING_INPUT_SCALE))),
+    ]
+
+    levels = [("full quality", settings)]
+    for name, changes in steps:
+        current = levels[-1][1]
+        if any(getattr(current, key) != value for key, value in changes.items()):
+            levels.append((name, current.replace(**changes)))
+    return levels
+
+
+class LoadShedder:
+    """
+    Chooses the degradation level from measured frame times.
+
+    The frame time is averaged over about ``window`` frames. The level goes
+    down one step when the average exceeds the budget (1 / target_fps) and
+    up one step when it is below ``headroom`` x budget; after a change the
+    average is restarted and at least ``window`` frames pass before the next
+    one. A step up that has to be undone right away doubles the wait before
+    the next step up, so the level does not flap at a boundary.
+    """
+
+    def __init__(self, target_fps, levels, window=30, headroom=0.7):
+        """
+        Args:
+            target_fps: Frames per second to keep up with
+            levels: Output of shedding_levels()
+            window: Frames averaged, and minimum frames between changes
+            headroom: Fraction of the budget below which quality goes up
+        """
+        self.budget = 1.0 / target_fps
+        self.levels = levels
+        self.window = max(1, window)
+        self.headroom = headroom
+
+        self.level = 0
+        self.events = []  # one dict per level change
+
+        self._avg = None
+        self._frames = 0
+        self._up_wait = self.window
+        self._last_up = None
+        self._frame_index = 0
+
+    @property
+    def name(self):
+        return self.levels[self.level][0]
+
+    @property
+    def settings(self):
+        return self.levels[self.level][1]
+
+    def to_dict(self):
+        """JSON-serialisable snapshot of the level and frame-time average."""
+        return {
+            'level': self.level,
+            'events': self.events,
+            'avg': self._avg,
+            'frames': self._frames,
+            'up_wait': self._up_wait,
+            'last_up': self._last_up,
+            'frame_index': self._frame_index,
+        }
+
+    def restore(self, data):
+        """Continue from a snapshot saved with to_dict() (same levels)."""
+        self.level = min(data['level'], len(self.levels) - 1)
+        self.events = data['events']
+        self._avg = data['avg']
+        self._frames = data['frames']
+        self._up_wait = data['up_wait']
+        self._last_up = data['last_up']
+        self._frame_index = data['frame_index']
+
+    def observe(self, seconds, source_time=None):
+        """
+        Record one frame's processing time.
+
+        Args:
+            seconds: Wall time spent on the frame
+            source_time: Position of the frame in the video (s), for the log
+
+        Returns:
+            Settings of the new level if it changed, otherwise None
+        """
+        self._frame_index += 1
+        self._frames += 1
+        alpha = 2.0 / (self.window + 1)
+        self._avg = seconds if self._avg is None else self._avg + alpha * (seconds - self._avg)
+
+        if self._frames < self.window:
+            return None
+
+        if self._avg > self.budget and self.level < len(self.levels) - 1:
+            # An undone step up: wait longer before trying again
+            if self._last_up is not None and self._frame_index - self._last_up <= 2 * self.window:
+                self._up_wait = min(self._up_wait * 2, 32 * self.window)
+            return self._change(self.level + 1, source_time)
+
+        if self._avg < self.headroom * self.budget and self.level > 0 \
+           and self._frames >= self._up_wait:
+            self._last_up = self._frame_index
+            return self._change(self.level - 1, source_time)
+
+        return None
+
+    def _change(self, level, source_time):
+        event = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'unix_time': time.time(),
+            'frame': self._frame_index,
+            'source_time': source_time,
+            'from_level': self.level,
+            'level': level,
+            'name': self.levels[level][0],
+            'frame_ms': round(self._avg * 1000, 2),
+            'budget_ms': round(self.budget * 1000, 2),
+        }
+        self.events.append(event)
+
+        direction = "down" if level > self.level else "up"
+        print(f"{'⚠️' if direction == 'down' else '✅'} {event['time']} quality {direction} "
+              f"to level {level} ({event['name']}): {event['frame_ms']:.1f} ms/frame, "
+              f"budget {event['budget_ms']:.1f} ms")
+
+        self.level = level
+        if level == 0:
+            self._up_wait = self.window
+        self._avg = None
+        self._frames = 0
+        return self.settings
@@ -0,0 +1,77 @@
+"""
+Motion gate.
+A cheap pre-filter that skips inference on static scenes by comparing a
+small, blurred grayscale copy of each frame with the last frame that went
+through the models.
+"""
+
+import cv2
+
+
+class MotionGate:
+    """
+    Decides per frame whether the models need to run.
+
+    A frame passes when enough pixels changed since the last inference
+    frame, or when refresh_interval frames in a row were skipped, so that
+    trackers and ghost boxes keep being updated on long static stretches.
+    """
+
+    def __init__(self, threshold, pixel_delta=25, width=160, refresh_interval=30):
+        """
+        Args:
+            threshold: Fraction of changed pixels (0-1) that counts as motion;
+                       lower = more sensitive
+            pixel_delta: Gray-level change for a pixel to count as changed
+            width: Width of the downscaled comparison image
+            refresh_interval: Force inference after this many skipped frames
+        """
+        self.threshold = threshold
+        self.pixel_delta = pixel_delta
+        self.width = width
+        self.refresh_interval = refresh_interval
+
+        self._reference = None
+        self._skipped_in_row = 0
+        self.last_motion = 1.0  # changed-pixel fraction of the last check
+
+    def reset(self):
+        """Let the next frame through and make it the new reference."""
+        self._reference = None
+        self._skipped_in_row = 0
+
+    def _small_gray(self, frame):
+        h, w = frame.shape[:2]
+        height = max(1, int(h * self.width / w))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        # Blur suppresses sensor noise and compression artefacts
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def check(self, frame, force=False):
+        """
+        Args:
+            frame: BGR frame, before anything is drawn on it
+            force: Run inference regardless of motion
+
+        Returns:
+            bool: True if inference should run on this frame
+        """
+        small = self._small_gray(frame)
+
+        if self._reference is None or self._reference.shape != small.shape:
+            self.last_motion = 1.0
+        else:
+            diff = cv2.absdiff(small, self._reference)
+            _, changed = cv2.threshold(diff, self.pixel_delta, 255, cv2.THRESH_BINARY)
+            self.last_motion = cv2.countNonZero(changed) / changed.size
+
+        run = force or self.last_motion >= self.threshold or \
+            self._skipped_in_row >= self.refresh_interval
+
+        if run:
+            self._reference = small
+            self._skipped_in_row = 0
+        else:
+            self._skipped_in_row += 1
+        return run
@@ -0,0 +1,137 @@
+"""
+Preflight checks.
+Validate configuration and inputs without loading any model, so the check
+runs in well under a second and never imports torch.
+"""
+
+import os
+import shutil
+
+import cv2
+import config
+from detection.model_variants import VARIANTS, variant_path
+from settings import Settings, load_thread_profile
+
+
+def _check_config(settings):
+    """Validate numeric settings. Yields (ok, message)."""
+
+    for name in ('CONF_THRESHOLD', 'PERSON_CONF_THRESHOLD'):
+        value = getattr(settings, name)
+        yield 0 < value <= 1, f"{name} = {value} (must be in (0, 1])"
+
+    for name in ('IMG_SIZE', 'PERSON_IMG_SIZE'):
+        value = getattr(settings, name)
+        yield value > 0 and value % 32 == 0, f"{name} = {value} (must be a positive multiple of 32)"
+
+    yield 0 < settings.FIGHT_TRIGGER <= settings.WINDOW, \
+        f"FIGHT_TRIGGER = {settings.FIGHT_TRIGGER}, WINDOW = {settings.WINDOW} (need 0 < trigger <= window)"
+    yield settings.MAX_PATIENCE >= 0, f"MAX_PATIENCE = {settings.MAX_PATIENCE} (must be >= 0)"
+    yield settings.FRAME_STRIDE >= 1, f"FRAME_STRIDE = {settings.FRAME_STRIDE} (must be >= 1)"
+    yield settings.VIDEO_READER in ('opencv', 'ffmpeg'), \
+        f"VIDEO_READER = {settings.VIDEO_READER!r} (must be 'opencv' or 'ffmpeg')"
+    if settings.VIDEO_READER == 'ffmpeg':
+        yield shutil.which('ffmpeg') is not None, "ffmpeg found on PATH (needed for VIDEO_READER = 'ffmpeg')"
+    yield settings.OUTPUT_MODE in ('burn', 'sidecar'), \
+        f"OUTPUT_MODE = {settings.OUTPUT_MODE!r} (must be 'burn' or 'sidecar')"
+    if settings.OUTPUT_MODE == 'sidecar' and len(settings.VIDEO_PATHS) > 1:
+        yield shutil.which('ffmpeg') is not None, \
+            "ffmpeg found on PATH (needed to join several videos with OUTPUT_MODE = 'sidecar')"
+    yield settings.TORCH_THREADS is None or settings.TORCH_THREADS >= 1, \
+        f"TORCH_THREADS = {settings.TORCH_THREADS} (must be None or >= 1)"
+    yield settings.OPENCV_THREADS is None or settings.OPENCV_THREADS >= 0, \
+        f"OPENCV_THREADS = {settings.OPENCV_THREADS} (must be None or >= 0)"
+    if settings.MOTION_GATE_ENABLED:
+        yield 0 <= settings.MOTION_THRESHOLD <= 1, \
+            f"MOTION_THRESHOLD = {settings.MOTION_THRESHOLD} (must be in [0, 1])"
+        yield settings.MOTION_REFRESH_INTERVAL >= 1, \
+            f"MOTION_REFRESH_INTERVAL = {settings.MOTION_REFRESH_INTERVAL} (must be >= 1)"
+
+
+def _check_models(settings):
+    """Validate model variants and that the model files are present. Yields (ok, message)."""
+
+    for label, path, variant in (
+        ("Fight model", settings.FIGHT_MODEL_PATH, settings.FIGHT_MODEL_VARIANT),
+        ("Person model", settings.PERSON_MODEL_PATH, settings.PERSON_MODEL_VARIANT),
+    ):
+        if variant not in VARIANTS:
+            yield False, f"{label}: unknown variant '{variant}' (expected one of {VARIANTS})"
+            continue
+
+        resolved = variant_path(path, variant)
+        if os.path.exists(resolved):
+            yield True, f"{label} [{variant}]: {resolved}"
+        elif resolved == path and not os.path.dirname(path):
+            # Bare Ultralytics names (yolo11x.pt) are downloaded on first use
+            yield True, f"{label} [{variant}]: {path} (will be auto-downloaded)"
+        else:
+            yield False, f"{label} [{variant}]: not found: {resolved}"
+
+
+def _check_inputs(video_paths, output_path, default_fps):
+    """Validate that every input opens and the output is writable. Yields (ok, message)."""
+
+    if not video_paths:
+        yield False, "No input videos configured"
+
+    for path in video_paths:
+        if not os.path.exists(path):
+            yield False, f"Input not found: {path}"
+            continue
+
+        cap = cv2.VideoCapture(path)
+        ok = cap.isOpened() and cap.read()[0]
+        if ok:
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = cap.get(cv2.CAP_PROP_FPS) or default_fps
+            frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            yield True, f"Input: {path} ({width}x{height} @ {fps:.1f} FPS, {frames} frames)"
+        else:
+            yield False, f"Input cannot be decoded: {path}"
+        cap.release()
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    yield os.path.isdir(output_dir) and os.access(output_dir, os.W_OK), \
+        f"Output directory writable: {output_dir}"
+
+
+def check_setup(video_paths=None, output_path=None, profile=None, settings=None):
+    """
+    Run all preflight checks.
+
+    Args:
+        video_paths: Input videos (defaults to VIDEO_PATHS of the settings)
+        output_path: Output video path (defaults to OUTPUT_PATH of the settings)
+        profile: Performance profile to validate (defaults to config.PERFORMANCE_PROFILE)
+        settings: Settings of the run to validate (replaces profile, e.g. with
+                  command-line overrides applied)
+
+    Returns:
+        list: (ok, message) tuples
+    """
+    results = []
+
+    try:
+        settings = settings or Settings.from_config(profile)
+        results.append((True, f"Performance profile: {settings.PERFORMANCE_PROFILE or 'config defaults'}"))
+        tuned = load_thread_profile(settings.THREAD_PROFILE_PATH)
+        if tuned:
+            values = ", ".join(f"{name} = {value}" for name, value in tuned.items())
+            results.append((True, f"Thread profile: {settings.THREAD_PROFILE_PATH} ({values})"))
+        inputs = settings
+    except ValueError as e:
+        results.append((False, str(e)))
+        settings = None
+        # Inputs and output do not depend on the (invalid) profile
+        inputs = config
+
+    # Settings and models are only meaningful with a valid profile
+    if settings is not None:
+        results.extend(_check_config(settings))
+        results.extend(_check_models(settings))
+    results.extend(_check_inputs(video_paths or inputs.VIDEO_PATHS,
+                                 output_path or inputs.OUTPUT_PATH,
+                                 inputs.DEFAULT_FPS))
+    return results
@@ -0,0 +1,121 @@
+"""
+Live preview publishing.
+Rate-limits progress updates and downscaled JPEG previews, and delivers them
+from a background thread so the frame loop never waits on the UI.
+"""
+
+import threading
+import time
+
+import cv2
+from settings import Settings
+
+
+class PreviewPolicy:
+    """How often and how large previews and progress updates are."""
+
+    def __init__(self, max_fps=None, max_width=None, jpeg_quality=None, progress_interval=None,
+                 settings=None):
+        """
+        Args:
+            max_fps: Maximum previews per second (0 disables previews)
+            max_width: Previews wider than this are downscaled
+            jpeg_quality: JPEG quality of previews (0-100)
+            progress_interval: Minimum seconds between progress-only updates
+            settings: Settings the unset values come from (defaults to config.py)
+        """
+        s = settings or Settings.from_config()
+        self.max_fps = s.PREVIEW_MAX_FPS if max_fps is None else max_fps
+        self.max_width = max_width or s.PREVIEW_MAX_WIDTH
+        self.jpeg_quality = jpeg_quality or s.PREVIEW_JPEG_QUALITY
+        self.progress_interval = s.PROGRESS_INTERVAL if progress_interval is None \
+            else progress_interval
+
+
+class PreviewPublisher:
+    """
+    Delivers callback(preview, stats) on a worker thread.
+
+    ``preview`` is JPEG bytes, or None for a progress-only update. Only the
+    most recent pending update is kept: if the UI is slower than the frame
+    loop, older updates are dropped instead of blocking processing.
+    """
+
+    def __init__(self, callback, policy=None):
+        self.callback = callback
+        self.policy = policy or PreviewPolicy()
+
+        self._last_preview = float('-inf')
+        self._last_progress = float('-inf')
+        self._pending = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="vams-preview", daemon=True)
+        self._thread.start()
+
+        # Counters for the summary
+        self.previews_sent = 0
+        self.updates_dropped = 0
+
+    def offer(self, frame, stats):
+        """Called for every frame; cheap unless an update is due."""
+        now = time.monotonic()
+        preview = None
+
+        if self.policy.max_fps and now - self._last_preview >= 1.0 / self.policy.max_fps:
+            preview = self._downscale(frame)
+            self._last_preview = now
+        elif now - self._last_progress < self.policy.progress_interval:
+            return
+
+        self._last_progress = now
+        self._submit(preview, dict(stats))
+
+    def flush(self, stats):
+        """Queue a final progress update regardless of rate limits."""
+        self._submit(None, dict(stats))
+
+    def close(self, timeout=5.0):
+        """Deliver what is pending and stop the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _downscale(self, frame):
+        h, w = frame.shape[:2]
+        if w <= self.policy.max_width:
+            return frame.copy()
+        new_h = int(h * self.policy.max_width / w)
+        return cv2.resize(frame, (self.policy.max_width, new_h), interpolation=cv2.INTER_AREA)
+
+    def _submit(self, preview, stats):
+        with self._cond:
+            if self._pending is not None:
+                self.updates_dropped += 1
+                # Never lose a pending preview to a progress-only update
+                if preview is None:
+                    preview = self._pending[0]
+            self._pending = (preview, stats)
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                preview, stats = self._pending
+                self._pending = None
+
+            if preview is not None:
+                ok, buf = cv2.imencode('.jpg', preview,
+                                       [cv2.IMWRITE_JPEG_QUALITY, self.policy.jpeg_quality])
+                preview = buf.tobytes() if ok else None
+                self.previews_sent += 1
+
+            try:
+                self.callback(preview, stats)
+            except Exception as e:
+                print(f"⚠️ Preview callback failed: {e}")
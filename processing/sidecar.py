@@ -0,0 +1,161 @@
+"""
+Sidecar overlay output.
+Instead of drawing the overlay into every frame and re-encoding the video,
+the input is copied (or remuxed, for several inputs) untouched and the
+results are written next to it, on the timeline of the output video:
+
+- <output>.vtt: WebVTT cues, one per confirmed fight
+- <output>.boxes.json: box track for drawing the overlay in a player; one
+  entry whenever the fight regions or people change, valid until the next
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+# Fixed identifier of the box track format (file names stay out of the track)
+TRACK_ID = 'vams-boxes'
+
+
+def sidecar_paths(output_path):
+    """WebVTT and box track paths of a sidecar output."""
+    base = os.path.splitext(output_path)[0]
+    return {'vtt': base + '.vtt', 'boxes': base + '.boxes.json'}
+
+
+def sidecar_video_path(output_path, video_paths):
+    """Output path with the container of the first input, which is kept as is."""
+    return os.path.splitext(output_path)[0] + os.path.splitext(video_paths[0])[1]
+
+
+def copy_inputs(video_paths, output_path):
+    """
+    Copy the input to the output without re-encoding.
+
+    One video is copied byte for byte; several are joined with ffmpeg's
+    concat demuxer (stream copy, so the inputs need the same codec and size).
+    """
+    if len(video_paths) == 1:
+        if os.path.abspath(video_paths[0]) != os.path.abspath(output_path):
+            shutil.copyfile(video_paths[0], output_path)
+        return
+
+    if not shutil.which('ffmpeg'):
+        raise RuntimeError("❌ Sidecar output of several videos needs ffmpeg on PATH")
+
+    list_path = output_path + '.inputs.txt'
+    with open(list_path, 'w') as f:
+        for path in video_paths:
+            f.write(f"file '{os.path.abspath(path)}'\n")
+    try:
+        subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+             '-i', list_path, '-c', 'copy', output_path],
+            check=True
+        )
+    finally:
+        os.remove(list_path)
+
+
+def vtt_timestamp(seconds):
+    """WebVTT timestamp (HH:MM:SS.mmm)."""
+    ms = int(round(seconds * 1000))
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:03d}"
+
+
+def track_script_literal(track):
+    """JavaScript literal of a box track, safe to embed in an HTML <script> block."""
+    # No '</' in the output, so nothing in the track can close the block
+    return json.dumps(track).replace('</', '<\\/')
+
+
+class SidecarWriter:
+    """
+    Collects per-frame results and writes the WebVTT cues and box track.
+
+    Coordinates are pixels of the processed frames (width x height), which
+    differ from the video's own size when the ffmpeg reader downscales;
+    players scale them to the displayed size.
+    """
+
+    def __init__(self, output_path, width, height):
+        """
+        Args:
+            output_path: Output video path (the sidecar files go next to it)
+            width: Width of the processed frames
+            height: Height of the processed frames
+        """
+        self.paths = sidecar_paths(output_path)
+        self.width = width
+        self.height = height
+
+        self.entries = []
+        self.cues = []
+        self._last = None
+        self._cue = None  # confirmed fight in progress
+
+    def add(self, time, duration, confirmed, fights, persons, fighting_ids, confidence):
+        """
+        Record one frame.
+
+        Args:
+            time: Start of the frame on the output timeline (seconds)
+            duration: Frame duration (seconds)
+            confirmed: Fight confirmed on this frame
+            fights: [x1, y1, x2, y2, conf, ghost] per fight region
+            persons: [cx, cy, label, fighting] per person
+            fighting_ids: Track IDs of the people in fight regions
+            confidence: Highest fight confidence of the frame
+        """
+        state = (int(confirmed), fights, persons)
+        if state != self._last:
+            self.entries.append({'t': round(time, 3), 'confirmed': state[0],
+                                 'fights': fights, 'persons': persons})
+            self._last = state
+
+        if confirmed:
+            if self._cue is None:
+                self._cue = {'start': time, 'confidence': 0.0, 'ids': set()}
+            self._cue['end'] = time + duration
+            self._cue['confidence'] = max(self._cue['confidence'], confidence)
+            self._cue['ids'].update(fighting_ids)
+        else:
+            self._end_cue()
+
+    def gap(self, time):
+        """Nothing is known from time on (end of a video or frame range)."""
+        self._end_cue()
+        if self._last is not None and self._last != (0, [], []):
+            self.entries.append({'t': round(time, 3), 'confirmed': 0, 'fights': [], 'persons': []})
+        self._last = None
+
+    def write(self):
+        """Write the WebVTT and box track files."""
+        self._end_cue()
+
+        with open(self.paths['vtt'], 'w', encoding='utf-8') as f:
+            f.write("WEBVTT\n")
+            for index, cue in enumerate(self.cues, 1):
+                text = f"FIGHT {cue['confidence']:.2f}"
+                if cue['ids']:
+                    text += " - " + ", ".join(f"P{p_id}" for p_id in sorted(cue['ids']))
+                f.write(f"\n{index}\n{vtt_timestamp(cue['start'])} --> "
+                        f"{vtt_timestamp(cue['end'])}\n{text}\n")
+
+        with open(self.paths['boxes'], 'w', encoding='utf-8') as f:
+            json.dump({
+                'id': TRACK_ID,
+                'width': self.width,
+                'height': self.height,
+                'cues': [[round(c['start'], 3), round(c['end'], 3)] for c in self.cues],
+                'entries': self.entries,
+            }, f, separators=(',', ':'))
+
+    def _end_cue(self):
+        if self._cue is not None:
+            self.cues.append(self._cue)
+            self._cue = None
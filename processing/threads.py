@@ -0,0 +1,35 @@
+"""
+Thread pools.
+Sizes the process-wide torch and OpenCV thread pools from the settings
+(config.py THREADS, or the thread profile of tools.autotune_threads).
+"""
+
+import os
+
+import cv2
+
+
+def available_cores():
+    """CPU cores this process may run on (its affinity mask where supported)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def apply_thread_settings(settings):
+    """
+    Size the torch and OpenCV thread pools.
+
+    Both pools are process-wide, so concurrent runs share them. None keeps
+    the current (library default) size.
+
+    Args:
+        settings: Settings (TORCH_THREADS, OPENCV_THREADS)
+    """
+    if settings.OPENCV_THREADS is not None:
+        cv2.setNumThreads(settings.OPENCV_THREADS)
+    if settings.TORCH_THREADS:
+        # Imported here so that importing processing stays cheap
+        import torch
+        torch.set_num_threads(settings.TORCH_THREADS)
@@ -1,63 +1,252 @@
 
+import os
+import shutil
+import time
+from datetime import datetime
 import cv2
-from collections import deque
-import config
 from detection import FightDetector, PersonTracker
+from detection.preprocess import FrameInputs
+from detection.temporal import TemporalState
+from settings import Settings
 from visualization import draw_advanced_dashboard
+from .alerts import AlertPublisher, alert_targets
+from .checkpoint import CheckpointManager
+from .detection_log import DetectionLog
+from .frame_pool import FramePool
+from .load_shedding import LoadShedder, shedding_levels
+from .motion import MotionGate
+from .preview import PreviewPublisher
+from .sidecar import SidecarWriter, copy_inputs, sidecar_video_path
+from .threads import apply_thread_settings
+from .video_reader import open_video, probe_video
 
 
 class VideoProcessor:
 
-    def __init__(self, video_paths=None, output_path=None, progress_callback=None, headless=False):
+    def __init__(self, video_paths=None, output_path=None, progress_callback=None, headless=False,
+                 profile=None, registry=None, checkpoint_interval=None, resume=False,
+                 detection_log_path=None, preview_policy=None, settings=None,
+                 frame_ranges=None, alert_callback=None):
         """
         Initialize video processor.
 
         Args:
             video_paths: List of input video paths (defaults to config)
             output_path: Output video path (defaults to config)
-            progress_callback: Optional callback function(frame, stats) for real-time updates
+            progress_callback: Optional callback function(frame, stats) for real-time updates.
+                               The frame is a pooled buffer, copy it to keep
+                               it (see FRAME_POOL_SIZE). With a preview_policy it is called as
+                               callback(jpeg_bytes_or_None, stats) from a
+                               background thread, rate-limited by the policy
             headless: If True, disable cv2.imshow (for web UI)
+            profile: Performance profile name (realtime, balanced, forensic);
+                     defaults to config.PERFORMANCE_PROFILE; ignored when
+                     settings are given
+            registry: ModelRegistry to take warm models from (defaults to
+                      the process-wide registry)
+            checkpoint_interval: Save a checkpoint every N frames (defaults to
+                                 config.CHECKPOINT_INTERVAL, 0 disables)
+            resume: Continue from the last checkpoint of this output if one exists
+            detection_log_path: Optional JSONL file with one record per frame
+                                (defaults to config.DETECTION_LOG_PATH)
+            preview_policy: PreviewPolicy for throttled, downscaled JPEG previews
+            settings: Settings of this run (defaults to config.py with the
+                      given profile applied)
+            frame_ranges: Optional list with one entry per video: a list of
+                          inclusive (start, end) source frames to process
+                          (None = the whole video). Only these frames are
+                          read and written; each range starts with fresh
+                          temporal and tracker state
+            alert_callback: Optional function(event) called from a background
+                            thread when a fight is first confirmed, before
+                            the frame is drawn or encoded (see processing.alerts)
         """
-        self.video_paths = video_paths or config.VIDEO_PATHS
-        self.output_path = output_path or config.OUTPUT_PATH
+        # Everything below reads this run's own settings, never the config
+        # module, so concurrent runs cannot affect each other
+        self.settings = settings or Settings.from_config(profile)
+        self.profile = self.settings.PERFORMANCE_PROFILE
+
+        self.video_paths = video_paths or self.settings.VIDEO_PATHS
+        self.output_path = output_path or self.settings.OUTPUT_PATH
+
+        # Sidecar output: the input is kept as is (in its own container) and
+        # the overlay goes to WebVTT / JSON files next to it
+        self.sidecar_mode = self.settings.OUTPUT_MODE == 'sidecar'
+        if self.sidecar_mode:
+            self.output_path = sidecar_video_path(self.output_path, self.video_paths)
+            if len(self.video_paths) > 1 and not shutil.which('ffmpeg'):
+                raise RuntimeError("❌ Sidecar output of several videos needs ffmpeg on PATH")
+        self.sidecar = None
+        self.timeline_offsets = None
+        self.timeline_offset = 0.0
+
         self.progress_callback = progress_callback
+        self.preview_policy = preview_policy
+        self.preview_publisher = None
+        self.stop_requested = False
         self.headless = headless
 
-        # Initialize detectors
-        self.fight_detector = FightDetector()
-        self.person_tracker = PersonTracker()
+        self.frame_stride = max(1, self.settings.FRAME_STRIDE)
+
+        # Temporal state (confirmation window, graph, fight regions)
+        self.temporal = TemporalState(self.settings.WINDOW, self.settings.FIGHT_TRIGGER,
+                                      self.settings.GRAPH_HISTORY_SIZE)
+
+        # Initialize detectors (models load lazily on the first frame)
+        self.fight_detector = FightDetector(registry=registry, state=self.temporal,
+                                            settings=self.settings)
+        self.person_tracker = PersonTracker(registry=registry, settings=self.settings)
+
+        # Motion gate: skip inference on static scenes
+        self.motion_gate = None
+        if self.settings.MOTION_GATE_ENABLED:
+            self.motion_gate = MotionGate(
+                self.settings.MOTION_THRESHOLD,
+                self.settings.MOTION_PIXEL_DELTA,
+                self.settings.MOTION_WIDTH,
+                self.settings.MOTION_REFRESH_INTERVAL,
+            )
 
         # Statistics
         self.frame_count = 0
         self.fight_frame_count = 0
+        self.inference_frames = 0
+        self.motion_skipped = 0
+
+        # Results of the last inference frame, reused when FRAME_STRIDE > 1
+        self.last_results = None
 
-        # Temporal state
-        self.fight_history = deque(maxlen=config.WINDOW)
-        self.graph_history = deque(maxlen=config.GRAPH_HISTORY_SIZE)
+        # Load shedding: created in process() once the source FPS is known;
+        # self.settings then follows the current degradation level
+        self.base_settings = self.settings
+        self.load_shedder = None
+        self.resumed_shedding = None
+
+        # Reused frame buffers: the frame loop decodes in place
+        self.frame_pool = FramePool(self.settings.FRAME_POOL_SIZE)
 
         # Video writer
         self.video_writer = None
-        
+        self.writer_args = None
+
+        # Per-frame detection log
+        self.detection_log_path = detection_log_path or self.settings.DETECTION_LOG_PATH
+        self.detection_log = None
+
+        # Fight alerts: published when a fight is first confirmed
+        self.alert_callback = alert_callback
+        self.alert_publisher = None
+        self.camera_id = self.settings.ALERT_CAMERA_ID
+        self.frame_decoded = 0.0
+
+        # Checkpointing: output is written as segments, one per checkpoint
+        interval = self.settings.CHECKPOINT_INTERVAL if checkpoint_interval is None \
+            else checkpoint_interval
+        self.checkpoint_interval = interval
+        self.checkpoints = CheckpointManager(self.output_path) if interval else None
+
+        # Frame ranges per source (see ArchiveScanner); checkpoints record a
+        # single position per run, so the two cannot be combined
+        self.frame_ranges = frame_ranges
+        if frame_ranges is not None:
+            if len(frame_ranges) != len(self.video_paths):
+                raise ValueError("frame_ranges needs one entry per video")
+            if self.checkpoints:
+                raise ValueError("frame_ranges cannot be combined with checkpointing")
+        if self.sidecar_mode and self.checkpoints:
+            raise ValueError("sidecar output cannot be combined with checkpointing")
+        self.resume = resume
+        self.segments = []
+        self.segment_frames = 0
+
+        # Position in the inputs: current source and next frame to read in it
+        self.source_index = 0
+        self.source_frame = 0
+        self.source_fps = self.settings.DEFAULT_FPS
+
     def process(self):
-       
+
+        # Thread pools sized before the models run (thread profile or config)
+        apply_thread_settings(self.settings)
+
+        start_index, start_frame, log_offset = self._restore_checkpoint()
+
+        # Per-frame detection log (truncated to the checkpoint when resuming)
+        if self.detection_log_path:
+            self.detection_log = DetectionLog(self.detection_log_path, log_offset)
+
+        # Alerts are delivered off the frame loop
+        targets = alert_targets(self.settings, self.alert_callback)
+        if targets:
+            self.alert_publisher = AlertPublisher(targets, self.settings.ALERT_QUEUE_SIZE)
+
+        # Throttled previews are delivered off the frame loop
+        if self.progress_callback and self.preview_policy:
+            self.preview_publisher = PreviewPublisher(self.progress_callback, self.preview_policy)
+
         # Initialize video writer from first video
         self._initialize_video_writer()
+
+        if self.base_settings.LOAD_SHEDDING_ENABLED:
+            s = self.base_settings
+            self.load_shedder = LoadShedder(
+                s.LOAD_SHEDDING_TARGET_FPS or self.writer_args[1],
+                shedding_levels(s), s.LOAD_SHEDDING_WINDOW, s.LOAD_SHEDDING_HEADROOM
+            )
+            if self.resumed_shedding:
+                # Continue at the level of the checkpoint; the restored
+                # tracks already belong to its input sizes
+                self.load_shedder.restore(self.resumed_shedding)
+                self._apply_settings(self.load_shedder.settings, reset_trackers=False)
         
         # Process each video
-        for video_path in self.video_paths:
-            print(f"\n📽️ Processing: {video_path}")
-            self._process_video(video_path)
-        
-        # Cleanup
-        self._cleanup()
+        try:
+            for index, video_path in enumerate(self.video_paths):
+                if index < start_index:
+                    continue
+                if self.stop_requested:
+                    break
+                ranges = self.frame_ranges[index] if self.frame_ranges else None
+                if ranges == []:
+                    continue
+                print(f"\n📽️ Processing: {video_path}")
+                self._process_video(video_path, index,
+                                    start_frame if index == start_index else 0, ranges)
+
+            # Join the segments into the final output
+            if self.checkpoints:
+                self._close_segment()
+                self.video_writer = None
+                self.checkpoints.finalize(self.segments, *self.writer_args)
+
+            # Sidecar files, then the untouched input as the output video
+            if self.sidecar:
+                self.sidecar.write()
+                copy_inputs(self.video_paths, self.output_path)
+        finally:
+            # Cleanup (also hands the models back to the registry)
+            self._cleanup()
         
         # Print summary
         self._print_summary()
         
         return {
             'total_frames': self.frame_count,
-            'fight_frames': self.fight_frame_count
+            'fight_frames': self.fight_frame_count,
+            'model_startup': self.model_startup,
+            'inference_frames': self.inference_frames,
+            'motion_skipped': self.motion_skipped,
+            'quality_changes': self.load_shedder.events if self.load_shedder else [],
+            'alerts': self.alert_publisher.events if self.alert_publisher else [],
+            'alert_latency': self.alert_publisher.summary() if self.alert_publisher else None,
+            'output_path': self.output_path,
+            'sidecar': self.sidecar.paths if self.sidecar else None,
+            'stopped': self.stop_requested
         }
+
+    def stop(self):
+        """Ask a running process() to stop after the current frame (thread-safe)."""
+        self.stop_requested = True
     
     def _get_optimal_codec(self):
         """
@@ -66,7 +255,6 @@ class VideoProcessor:
         Returns:
             str: Four-character codec code
         """
-        import os
 
         # Get file extension
         _, ext = os.path.splitext(self.output_path)
@@ -82,14 +270,14 @@ class VideoProcessor:
         }
 
         # Get codec from map or use config default
-        codec = codec_map.get(ext, config.FOURCC)
+        codec = codec_map.get(ext, self.settings.FOURCC)
 
         print(f"📝 Auto-selected codec: {codec} for {ext} format")
         return codec
 
     def _initialize_video_writer(self):
 
-        first_video = cv2.VideoCapture(self.video_paths[0])
+        first_video = open_video(self.video_paths[0], self.settings)
 
         if not first_video.isOpened():
             raise RuntimeError(f"❌ Error: Could not open first video: {self.video_paths[0]}")
@@ -97,41 +285,225 @@ class VideoProcessor:
         width = int(first_video.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(first_video.get(cv2.CAP_PROP_FRAME_HEIGHT))
         fps = first_video.get(cv2.CAP_PROP_FPS)
-        fps = config.DEFAULT_FPS if fps == 0 else fps
+        fps = self.settings.DEFAULT_FPS if fps == 0 else fps
         first_video.release()
 
+        if self.sidecar_mode:
+            # Nothing is encoded; sidecar times are positions in the joined
+            # inputs, so each video starts after the previous ones
+            self.writer_args = (None, fps, (width, height))
+            self.sidecar = SidecarWriter(self.output_path, width, height)
+            self.timeline_offsets = [0.0]
+            for path in self.video_paths[:-1]:
+                info = probe_video(path, self.settings.DEFAULT_FPS)
+                self.timeline_offsets.append(
+                    self.timeline_offsets[-1] + (info['frames'] / info['fps'] if info else 0.0))
+            print(f"📹 Sidecar output: {width}x{height} @ {fps} FPS (input copied, no encoding)")
+            return
+
         # Dynamically select optimal codec
         codec_string = self._get_optimal_codec()
         fourcc = cv2.VideoWriter_fourcc(*codec_string)
+        self.writer_args = (fourcc, fps, (width, height))
 
-        self.video_writer = cv2.VideoWriter(
-            self.output_path, fourcc, fps, (width, height)
-        )
+        if self.checkpoints:
+            self._open_segment()
+        else:
+            self.video_writer = cv2.VideoWriter(
+                self.output_path, fourcc, fps, (width, height)
+            )
 
         print(f"📹 Output video: {width}x{height} @ {fps} FPS")
+
+    def _open_segment(self):
+        """Start writing the next output segment."""
+        path = self.checkpoints.segment_path(len(self.segments))
+        self.video_writer = cv2.VideoWriter(path, *self.writer_args)
+        self.segment_path = path
+        self.segment_frames = 0
+
+    def _close_segment(self):
+        """Finalize the current segment (dropped if it has no frames)."""
+        self.video_writer.release()
+        if self.segment_frames:
+            self.segments.append(self.segment_path)
+        elif os.path.exists(self.segment_path):
+            os.remove(self.segment_path)
+
+    def _save_checkpoint(self):
+        """Finalize the current segment and record everything needed to resume after it."""
+        self._close_segment()
+
+        self.checkpoints.save({
+            'video_paths': list(self.video_paths),
+            'source_index': self.source_index,
+            'source_frame': self.source_frame,
+            'frame_count': self.frame_count,
+            'fight_frame_count': self.fight_frame_count,
+            'inference_frames': self.inference_frames,
+            'motion_skipped': self.motion_skipped,
+            'temporal': self.temporal.to_dict(),
+            # Carried-forward results and people of the last person-model
+            # frame, so PERSON_STRIDE continues where it left off
+            'last_results': self._results_to_list(),
+            'person_association': self.person_tracker.association_state(),
+            'load_shedding': self.load_shedder.to_dict() if self.load_shedder else None,
+            'detection_log_offset': self.detection_log.offset() if self.detection_log else None,
+            'segments': self.segments,
+        }, {
+            'fight': self.fight_detector.tracker_snapshot(),
+            'person': self.person_tracker.tracker_snapshot(),
+        })
+
+        # A resumed run starts with a fresh gate; start one here too so both
+        # make the same decisions after this point
+        if self.motion_gate:
+            self.motion_gate.reset()
+
+        self._open_segment()
+
+    def _results_to_list(self):
+        """last_results as plain JSON values (None before the first inference)."""
+        if self.last_results is None:
+            return None
+        frame_has_fight, max_fight_conf, person_count, fighting_people_ids = self.last_results
+        return [bool(frame_has_fight), float(max_fight_conf), int(person_count),
+                [int(p_id) for p_id in fighting_people_ids]]
+
+    def _restore_checkpoint(self):
+        """
+        Load the last checkpoint when resuming.
+
+        Returns:
+            tuple: (source_index, source_frame, detection_log_offset) to start from
+        """
+        if not self.checkpoints:
+            return 0, 0, None
+
+        if not self.resume or not self.checkpoints.exists():
+            # Fresh run: drop files of any earlier interrupted run
+            self.checkpoints.clear()
+            return 0, 0, None
+
+        data, trackers = self.checkpoints.load()
+        if data['video_paths'] != list(self.video_paths):
+            raise RuntimeError(
+                f"❌ Checkpoint {self.checkpoints.path} belongs to different inputs: "
+                f"{data['video_paths']}"
+            )
+
+        self.frame_count = data['frame_count']
+        self.fight_frame_count = data['fight_frame_count']
+        self.inference_frames = data.get('inference_frames', 0)
+        self.motion_skipped = data.get('motion_skipped', 0)
+        self.temporal = TemporalState.from_dict(data['temporal'])
+        self.fight_detector.state = self.temporal
+        self.segments = data['segments']
+        self.checkpoints.discard_unlisted(self.segments)
+
+        self.fight_detector.restore_tracker(trackers.get('fight'))
+        self.person_tracker.restore_tracker(trackers.get('person'))
+        self.person_tracker.restore_association(data.get('person_association'))
+        if data.get('last_results'):
+            self.last_results = tuple(data['last_results'])
+        self.resumed_shedding = data.get('load_shedding')
+
+        print(f"♻️ Resuming from frame {self.frame_count} "
+              f"(video {data['source_index'] + 1}, frame {data['source_frame']})")
+        return data['source_index'], data['source_frame'], data['detection_log_offset']
     
-    def _process_video(self, video_path):
+    def _process_video(self, video_path, source_index=0, start_frame=0, ranges=None):
         
-        cap = cv2.VideoCapture(video_path)
+        cap = open_video(video_path, self.settings)
         
         if not cap.isOpened():
             print(f"❌ Skipping: {video_path}")
             return
         
         print("✅ Opened successfully")
+
+        self.source_index = source_index
+        self.source_frame = start_frame
+        self.camera_id = self.settings.ALERT_CAMERA_ID or os.path.basename(video_path)
+        self.source_fps = cap.get(cv2.CAP_PROP_FPS) or self.settings.DEFAULT_FPS
+        if self.sidecar:
+            self.timeline_offset = self.timeline_offsets[source_index]
+        if start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+        for start, end in ranges or [(start_frame, None)]:
+            if ranges:
+                self._seek(cap, start)
+                self._reset_stream()
+            more = self._process_range(cap, end)
+            if self.sidecar:
+                self.sidecar.gap(self.timeline_time)
+            if not more:
+                break
         
-        while True:
-            ret, frame = cap.read()
+        cap.release()
+
+    def _seek(self, cap, frame_index):
+        """Move the capture to a source frame (decodes forward when close)."""
+        if frame_index - self.source_frame in range(0, 2 * self.frame_stride + 30):
+            # Short gaps: grabbing is cheaper and exact
+            while self.source_frame < frame_index and cap.grab():
+                self.source_frame += 1
+        else:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+            self.source_frame = frame_index
+
+    def _reset_stream(self):
+        """Start from a clean state, as at the start of a video (used between frame ranges)."""
+        self.temporal = TemporalState(self.settings.WINDOW, self.settings.FIGHT_TRIGGER,
+                                      self.settings.GRAPH_HISTORY_SIZE)
+        self.fight_detector.state = self.temporal
+        self.fight_detector.reset_tracker()
+        self.person_tracker.reset_tracker()
+        self.last_results = None
+        if self.motion_gate:
+            self.motion_gate.reset()
+
+    def _process_range(self, cap, end=None):
+        """
+        Process frames from the current position up to source frame end
+        (inclusive, None = end of video).
+
+        Returns:
+            bool: False if processing should stop (end of video, stop or quit)
+        """
+        while end is None or self.source_frame <= end:
+            if self.stop_requested:
+                return False
+            frame_start = time.perf_counter()
+            ret, frame = self.frame_pool.read(cap)
             if not ret:
-                break
+                return False
+            self.frame_decoded = time.perf_counter()
             
             self.frame_count += 1
             
             # Process frame
             self._process_frame(frame)
+            self.source_frame += 1
 
             # Write frame
-            self.video_writer.write(frame)
+            if self.video_writer:
+                self.video_writer.write(frame)
+                self.segment_frames += 1
+
+            # Decode to encode time of this frame against the real-time budget
+            if self.load_shedder:
+                settings = self.load_shedder.observe(time.perf_counter() - frame_start,
+                                                     self.source_frame / self.source_fps)
+                if settings is not None:
+                    self._apply_settings(settings)
+
+            # Checkpoint only where the next frame runs inference anyway, so
+            # a resumed run makes exactly the same stride decisions
+            if self.checkpoints and self.frame_count % self.checkpoint_interval == 0 \
+               and self.frame_count % self.frame_stride == 0:
+                self._save_checkpoint()
 
             # Show preview (only if not headless)
             if not self.headless:
@@ -139,49 +511,205 @@ class VideoProcessor:
 
                 # Check for quit
                 if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
+                    return False
 
-            # Send progress update to callback (every frame)
+            # Send progress update to callback
             if self.progress_callback:
-                self.progress_callback(frame, {
+                stats = {
                     'current_frame': self.frame_count,
                     'fight_frames': self.fight_frame_count
-                })
-        
-        cap.release()
+                }
+                if self.preview_publisher:
+                    self.preview_publisher.offer(frame, stats)
+                else:
+                    self.progress_callback(frame, stats)
+        return True
     
+    def _apply_settings(self, settings, reset_trackers=True):
+        """Switch to the settings of another load-shedding level."""
+        # With shared inputs both trackers work on the letterboxed image, so
+        # their tracks (and camera-motion reference frames) are in input
+        # pixels and do not carry over to another input size
+        if reset_trackers and settings.SHARED_PREPROCESS:
+            if settings.IMG_SIZE != self.fight_detector.img_size:
+                self.fight_detector.reset_tracker()
+            if settings.PERSON_IMG_SIZE != self.person_tracker.img_size:
+                self.person_tracker.reset_tracker()
+
+        self.settings = settings
+        self.fight_detector.update_settings(settings)
+        self.person_tracker.update_settings(settings)
+
+    @property
+    def timeline_time(self):
+        """Time of the current source frame in the output video (seconds)."""
+        return self.timeline_offset + self.source_frame / self.source_fps
+
+    @property
+    def quality_level(self):
+        """Current load-shedding level (0 = full quality)."""
+        return self.load_shedder.level if self.load_shedder else 0
+
     def _process_frame(self, frame):
-        
-        # Fight detection
-        frame_has_fight, current_fight_found, max_fight_conf, fight_box_coords = \
-            self.fight_detector.detect(frame)
-        
-        # Person tracking
-        person_count, fighting_people_ids = \
-            self.person_tracker.track(frame, fight_box_coords)
-        
+
+        run_inference = self.last_results is None or \
+            (self.frame_count - 1) % self.frame_stride == 0
+
+        # Motion gate: keep the last results while the scene is static (never
+        # while a fight region is on screen, so it keeps being tracked)
+        if run_inference and self.motion_gate:
+            fight_on_screen = len(self.temporal.region_boxes) > 0
+            run_inference = self.motion_gate.check(
+                frame, force=self.last_results is None or fight_on_screen
+            )
+            if not run_inference:
+                self.motion_skipped += 1
+
+        if run_inference:
+            self.inference_frames += 1
+
+            # Both models see the clean frame; with shared preprocessing it
+            # is letterboxed once per distinct input size
+            inputs = FrameInputs(frame) if self.settings.SHARED_PREPROCESS else None
+
+            # Fight detection
+            frame_has_fight, current_fight_found, max_fight_conf, fight_boxes = \
+                self.fight_detector.detect(frame, draw=False, inputs=inputs)
+
+            # Person tracking (with PERSON_STRIDE > 1 the other inference
+            # frames match the last tracked people with the new fight regions)
+            if self.last_results is None or \
+               (self.inference_frames - 1) % max(1, self.settings.PERSON_STRIDE) == 0:
+                person_count, fighting_people_ids = \
+                    self.person_tracker.track(frame, fight_boxes, draw=False, inputs=inputs)
+            else:
+                person_count, fighting_people_ids = self.person_tracker.associate(fight_boxes)
+
+            self.last_results = (frame_has_fight, max_fight_conf,
+                                 person_count, fighting_people_ids)
+        else:
+            # Strided or static frame: carry the last results forward
+            frame_has_fight, max_fight_conf, person_count, fighting_people_ids = \
+                self.last_results
+
+        # Temporal logic for fight confirmation, before anything is drawn so
+        # that an alert goes out as soon as a fight is confirmed
+        was_confirmed = self.temporal.confirmed
+        confirmed = self.temporal.update(frame_has_fight)
+        if confirmed:
+            self.fight_frame_count += 1
+            if not was_confirmed and self.alert_publisher:
+                self._publish_alert(max_fight_conf, fighting_people_ids)
+
         # Update graph history
         current_intensity = 0.0
         if frame_has_fight:
             current_intensity = max_fight_conf if max_fight_conf > 0 else 0.5
-        self.graph_history.append(current_intensity)
-        
-        # Draw dashboard
-        draw_advanced_dashboard(
-            frame, person_count, frame_has_fight, max_fight_conf,
-            fighting_people_ids, self.graph_history
+        self.temporal.push_intensity(current_intensity)
+
+        if self.sidecar:
+            # The overlay is drawn by the player; the frame stays untouched
+            self._add_sidecar_frame(confirmed, max_fight_conf, fighting_people_ids)
+        else:
+            self.fight_detector.draw(frame)
+            self.person_tracker.draw(frame)
+
+            # Draw dashboard
+            draw_advanced_dashboard(
+                frame, person_count, frame_has_fight, max_fight_conf,
+                fighting_people_ids, self.temporal.graph_history(), self.settings,
+                frame_index=self.frame_count, fps=self.source_fps
+            )
+
+        if self.detection_log:
+            self._log_frame(frame_has_fight, confirmed, max_fight_conf,
+                            person_count, fighting_people_ids, run_inference)
+
+    def _add_sidecar_frame(self, confirmed, max_fight_conf, fighting_people_ids):
+        """Record this frame's regions and people in the sidecar track."""
+        state = self.temporal
+        self.sidecar.add(
+            self.timeline_time, 1 / self.source_fps, confirmed,
+            [[*box, round(conf, 2), int(patience > 0)]
+             for box, conf, patience in zip(state.region_boxes.tolist(),
+                                            state.region_confs.tolist(),
+                                            state.region_patience.tolist())],
+            [[cx, cy, label, int(is_fighting)]
+             for cx, cy, label, is_fighting in self.person_tracker.last_labels],
+            fighting_people_ids, max_fight_conf
         )
-        
-        # Temporal logic for fight confirmation
-        self.fight_history.append(frame_has_fight)
-        if sum(self.fight_history) >= config.FIGHT_TRIGGER:
-            self.fight_frame_count += 1
+
+    def _publish_alert(self, max_fight_conf, fighting_people_ids):
+        """Queue the alert of a newly confirmed fight (non-blocking)."""
+        state = self.temporal
+        self.alert_publisher.publish({
+            'camera': self.camera_id,
+            'source': self.source_index,
+            'frame': self.source_frame,
+            'time': round(self.source_frame / self.source_fps, 3),
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'confidence': round(max_fight_conf, 4),
+            'boxes': [[*box, round(conf, 4)]
+                      for box, conf in zip(state.region_boxes.tolist(), state.region_confs.tolist())],
+            'fighting_ids': fighting_people_ids,
+        }, self.frame_decoded)
+
+    def _log_frame(self, frame_has_fight, confirmed, max_fight_conf,
+                   person_count, fighting_people_ids, inference=True):
+        """Append this frame's results to the detection log."""
+        state = self.temporal
+        self.detection_log.write({
+            'frame': self.frame_count,
+            'source': self.source_index,
+            'source_frame': self.source_frame,
+            'time': self.source_frame / self.source_fps,
+            'inference': int(inference),
+            'quality_level': self.quality_level,
+            'fight': frame_has_fight,
+            'confirmed': int(confirmed),
+            'max_conf': round(max_fight_conf, 4),
+            'fight_boxes': [
+                [*box, round(conf, 4), int(patience > 0)]
+                for box, conf, patience in zip(state.region_boxes.tolist(),
+                                               state.region_confs.tolist(),
+                                               state.region_patience.tolist())
+            ],
+            'people': person_count,
+            'fighting_ids': fighting_people_ids,
+            'persons': [[cx, cy, label, int(is_fighting)]
+                        for cx, cy, label, is_fighting in self.person_tracker.last_labels],
+        })
     
+    @property
+    def model_startup(self):
+        """Load/warm-up timings per model (cached=True means a warm start)."""
+        return {
+            'fight': self.fight_detector.startup,
+            'person': self.person_tracker.startup,
+        }
+
     def _cleanup(self):
 
         if self.video_writer:
             self.video_writer.release()
 
+        if self.alert_publisher:
+            self.alert_publisher.close()
+
+        if self.preview_publisher:
+            self.preview_publisher.flush({
+                'current_frame': self.frame_count,
+                'fight_frames': self.fight_frame_count
+            })
+            self.preview_publisher.close()
+
+        if self.detection_log:
+            self.detection_log.close()
+
+        # Return models to the registry for the next run
+        self.fight_detector.close()
+        self.person_tracker.close()
+
         # Only destroy windows if not headless
         if not self.headless:
             cv2.destroyAllWindows()
@@ -191,4 +719,40 @@ class VideoProcessor:
         print("\n✅ Done - All Videos Merged")
         print(f"Total Frames: {self.frame_count}")
         print(f"Fight confirmed frames: {self.fight_frame_count}")
-        print(f"Saved merged video to: {self.output_path}")
+        if self.frame_count:
+            print(f"Inference frames: {self.inference_frames} "
+                  f"({self.inference_frames / self.frame_count:.0%} of frames)")
+        if self.load_shedder:
+            events = self.load_shedder.events
+            print(f"Quality level changes: {len(events)} "
+                  f"(lowest level reached: {max((e['level'] for e in events), default=0)})")
+        if self.alert_publisher:
+            summary = self.alert_publisher.summary()
+            line = f"Alerts: {summary['alerts']}"
+            if summary['delivery_ms_mean'] is not None:
+                line += (f" (decode to delivered: mean {summary['delivery_ms_mean']:.1f} ms, "
+                         f"max {summary['delivery_ms_max']:.1f} ms)")
+            if summary['dropped'] or summary['failures']:
+                line += f", {summary['dropped']} dropped, {summary['failures']} failed deliveries"
+            print(line)
+        if self.motion_gate and self.frame_count:
+            print(f"Skipped by motion gate: {self.motion_skipped} "
+                  f"({self.motion_skipped / self.frame_count:.1%} of frames)")
+        if self.profile:
+            print(f"Performance profile: {self.profile}")
+        for name, startup in self.model_startup.items():
+            if startup is None:
+                continue
+            if startup['cached']:
+                print(f"Model startup ({name}): warm (reused from registry)")
+            else:
+                print(f"Model startup ({name}): cold, load {startup['load_s']:.2f}s"
+                      f" + warm-up {startup['warmup_s']:.2f}s")
+        if self.sidecar:
+            print(f"Copied input video to: {self.output_path} (not re-encoded)")
+            print(f"Sidecar: {self.sidecar.paths['vtt']}, {self.sidecar.paths['boxes']} "
+                  f"({len(self.sidecar.cues)} fight cues)")
+        else:
+            print(f"Saved merged video to: {self.output_path}")
+        if self.detection_log_path:
+            print(f"Detection log: {self.detection_log_path}")
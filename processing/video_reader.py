@@ -0,0 +1,232 @@
+"""
+Video readers.
+open_video() returns either a cv2.VideoCapture or an FFmpegReader, which
+decodes in an ffmpeg subprocess (threaded decoding, scaling and frame-rate
+selection done by ffmpeg) and exposes the subset of the cv2.VideoCapture
+interface the pipeline uses: isOpened, read, grab, get, set, release.
+"""
+
+import json
+import shutil
+import subprocess
+
+import cv2
+import numpy as np
+
+
+def open_video(path, settings):
+    """
+    Open a video with the reader selected by settings.VIDEO_READER.
+
+    Falls back to OpenCV (with a warning) when ffmpeg is not installed.
+
+    Args:
+        path: Video file path
+        settings: Settings (VIDEO_READER, READER_MAX_WIDTH, READER_FPS,
+                  READER_THREADS, DEFAULT_FPS)
+
+    Returns:
+        cv2.VideoCapture or FFmpegReader
+    """
+    if settings.VIDEO_READER == "ffmpeg":
+        if shutil.which("ffmpeg"):
+            return FFmpegReader(path, settings.READER_MAX_WIDTH, settings.READER_FPS,
+                                settings.READER_THREADS, settings.DEFAULT_FPS)
+        print("⚠️ ffmpeg not found, reading with OpenCV")
+    elif settings.VIDEO_READER != "opencv":
+        raise ValueError(f"Unknown VIDEO_READER '{settings.VIDEO_READER}', "
+                         f"expected 'opencv' or 'ffmpeg'")
+    return cv2.VideoCapture(path)
+
+
+def probe_video(path, default_fps=25):
+    """
+    Size, frame rate and frame count of a video.
+
+    Uses ffprobe when installed (any container/codec ffmpeg can decode),
+    otherwise OpenCV.
+
+    Returns:
+        dict: width, height, fps, frames (0 if unknown), or None if the
+              file cannot be read
+    """
+    if shutil.which("ffprobe"):
+        try:
+            out = subprocess.run(
+                ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_streams',
+                 '-show_format', '-of', 'json', path],
+                capture_output=True, check=True, timeout=30
+            ).stdout
+            info = json.loads(out)
+            stream = info['streams'][0]
+        except (subprocess.SubprocessError, ValueError, KeyError, IndexError):
+            return None
+
+        width, height = int(stream['width']), int(stream['height'])
+        # ffmpeg applies the rotation while decoding
+        rotation = stream.get('tags', {}).get('rotate') or next(
+            (d.get('rotation') for d in stream.get('side_data_list', []) if 'rotation' in d), 0)
+        if int(float(rotation)) % 180:
+            width, height = height, width
+
+        fps = _rate(stream.get('avg_frame_rate')) or _rate(stream.get('r_frame_rate')) \
+            or default_fps
+        frames = int(stream.get('nb_frames') or 0)
+        if not frames:
+            duration = float(stream.get('duration') or info.get('format', {}).get('duration') or 0)
+            frames = int(round(duration * fps))
+        return {'width': width, 'height': height, 'fps': fps, 'frames': frames}
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return None
+    info = {
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': cap.get(cv2.CAP_PROP_FPS) or default_fps,
+        'frames': max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT))),
+    }
+    cap.release()
+    return info
+
+
+def _rate(text):
+    """Frame rate from an ffprobe fraction like '30000/1001' (0 if unknown)."""
+    try:
+        num, _, den = (text or '').partition('/')
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+class FFmpegReader:
+    """
+    cv2.VideoCapture replacement that decodes with an ffmpeg subprocess.
+
+    Frames arrive as raw BGR24 on a pipe and are read straight into the
+    caller's buffer (read(image=...)), so it works with FramePool. Seeking
+    (set(cv2.CAP_PROP_POS_FRAMES, n)) restarts ffmpeg at the frame's time.
+    """
+
+    def __init__(self, path, max_width=0, fps=0, threads=0, default_fps=25):
+        """
+        Args:
+            path: Video file path
+            max_width: Downscale frames wider than this while decoding (0 = source size)
+            fps: Output frame rate; frames are dropped or duplicated by
+                 ffmpeg (0 = source rate)
+            threads: Decoder threads (0 = ffmpeg picks)
+            default_fps: Frame rate to assume when the file has none
+        """
+        self.path = path
+        self.threads = threads
+        self._proc = None
+        self._scratch = None
+        self.position = 0
+
+        info = probe_video(path, default_fps)
+        self._opened = info is not None
+        if not self._opened:
+            return
+
+        self.source_fps = info['fps']
+        self.fps = fps or info['fps']
+        self.width, self.height = info['width'], info['height']
+        if max_width and self.width > max_width:
+            # Even dimensions, as ffmpeg's scale=W:-2
+            self.height = max(2, int(round(self.height * max_width / self.width / 2)) * 2)
+            self.width = max_width
+        self.frame_count = int(round(info['frames'] * self.fps / info['fps']))
+        self._frame_bytes = self.width * self.height * 3
+
+        self._start(0)
+
+    def _start(self, frame_index):
+        """(Re)start ffmpeg so the next frame read is frame_index."""
+        self._stop()
+
+        filters = [f"fps={self.fps}"] if self.fps != self.source_fps else []
+        filters.append(f"scale={self.width}:{self.height}")
+
+        cmd = ['ffmpeg', '-nostdin', '-loglevel', 'error', '-threads', str(self.threads)]
+        if frame_index:
+            cmd += ['-ss', f"{frame_index / self.fps:.6f}"]
+        cmd += ['-i', self.path, '-an', '-sn', '-vf', ','.join(filters),
+                '-f', 'rawvideo', '-pix_fmt', 'bgr24', 'pipe:1']
+
+        self._proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      bufsize=self._frame_bytes)
+        self.position = frame_index
+
+    def _stop(self):
+        if self._proc is not None:
+            self._proc.stdout.close()
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def isOpened(self):
+        return self._opened and self._proc is not None
+
+    def _read_into(self, buffer):
+        """Fill buffer with the next frame. Returns False at the end of the video."""
+        view = memoryview(buffer).cast('B')
+        filled = 0
+        while filled < self._frame_bytes:
+            n = self._proc.stdout.readinto(view[filled:])
+            if not n:
+                return False
+            filled += n
+        self.position += 1
+        return True
+
+    def read(self, image=None):
+        """
+        Decode the next frame.
+
+        Args:
+            image: Optional (H, W, 3) uint8 buffer to decode into; used
+                   when its shape matches, otherwise a new array is returned
+
+        Returns:
+            tuple: (ret, frame) like cv2.VideoCapture.read()
+        """
+        if not self.isOpened():
+            return False, None
+        shape = (self.height, self.width, 3)
+        if image is None or image.shape != shape or image.dtype != np.uint8 \
+           or not image.flags.c_contiguous:
+            image = np.empty(shape, dtype=np.uint8)
+        if not self._read_into(image):
+            return False, None
+        return True, image
+
+    def grab(self):
+        """Skip one frame."""
+        if not self.isOpened():
+            return False
+        if self._scratch is None:
+            self._scratch = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        return self._read_into(self._scratch)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.height
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.position
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES and self._opened:
+            self._start(int(value))
+            return True
+        return False
+
+    def release(self):
+        self._stop()
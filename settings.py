@@ -0,0 +1,113 @@
+"""
+Per-run settings.
+An immutable snapshot of config.py with a performance profile, the tuned
+thread profile and per-run overrides applied. Each run gets its own Settings object, so concurrent
+analyses never see each other's values and config.py is never modified.
+"""
+
+import copy
+import json
+import os
+
+import config
+
+# Settings written by tools.autotune_threads
+TUNED_SETTINGS = ('TORCH_THREADS', 'OPENCV_THREADS', 'READER_THREADS', 'MAX_CONCURRENT_JOBS')
+
+
+def _config_values():
+    """All settings defined in config.py (the UPPER_CASE names)."""
+    return {name: copy.deepcopy(getattr(config, name)) for name in dir(config) if name.isupper()}
+
+
+def load_thread_profile(path):
+    """
+    Thread settings measured by tools.autotune_threads.
+
+    Args:
+        path: Thread profile (JSON) path, None for none
+
+    Returns:
+        dict: The tuned settings in the file ({} if there is no file)
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            tuned = json.load(f).get('settings', {})
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"⚠️ Ignoring thread profile {path}: {e}")
+        return {}
+    return {name: tuned[name] for name in TUNED_SETTINGS if name in tuned}
+
+
+def profile_names():
+    """Names of the available performance profiles."""
+    return list(config.PERFORMANCE_PROFILES)
+
+
+class Settings:
+    """
+    Read-only settings of one run.
+
+    Attributes have the same names as in config.py (settings.CONF_THRESHOLD,
+    settings.IMG_SIZE, ...). Use replace() to derive modified settings.
+    """
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+    @classmethod
+    def from_config(cls, profile=None, **overrides):
+        """
+        Build settings from config.py.
+
+        Args:
+            profile: Performance profile from config.PERFORMANCE_PROFILES
+                     (defaults to config.PERFORMANCE_PROFILE, None for none)
+            **overrides: Values that replace the config/profile ones,
+                         e.g. CONF_THRESHOLD=0.25
+
+        Returns:
+            Settings
+        """
+        values = _config_values()
+        profile = profile or values['PERFORMANCE_PROFILE']
+
+        if profile is not None:
+            if profile not in values['PERFORMANCE_PROFILES']:
+                raise ValueError(
+                    f"Unknown performance profile '{profile}', "
+                    f"expected one of {profile_names()}"
+                )
+            values.update(values['PERFORMANCE_PROFILES'][profile])
+
+            # Overlay detail only changes the effects when a profile sets it
+            values['GLOW_ENABLED'], values['SHADOW_ENABLED'] = \
+                values['OVERLAY_DETAIL_LEVELS'][values['OVERLAY_DETAIL']]
+
+        values['PERFORMANCE_PROFILE'] = profile
+
+        # Thread counts measured on this machine replace the config values
+        values.update(load_thread_profile(overrides.get('THREAD_PROFILE_PATH',
+                                                        values['THREAD_PROFILE_PATH'])))
+        return cls(values).replace(**overrides)
+
+    def replace(self, **changes):
+        """New Settings with some values changed."""
+        unknown = set(changes) - set(self.__dict__)
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        return Settings({**self.__dict__, **changes})
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings are read-only, use replace() to change values")
+
+    def __delattr__(self, name):
+        raise AttributeError("Settings are read-only")
+
+    def __repr__(self):
+        return f"Settings(profile={self.PERFORMANCE_PROFILE!r})"
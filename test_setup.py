@@ -5,6 +5,7 @@ Tests imports, model loading, and basic functionality.
 
 import sys
 import os
+import importlib.util
 
 def test_imports():
     """Test that all required modules can be imported."""
@@ -19,11 +20,12 @@ def test_imports():
         print(f"[FAIL] Failed to import OpenCV: {e}")
         return False
 
-    try:
-        import ultralytics
-        print(f"[OK] Ultralytics imported successfully")
-    except ImportError as e:
-        print(f"[FAIL] Failed to import Ultralytics: {e}")
+    # Only check that Ultralytics is installed; importing it (and torch) is
+    # deferred until the model loading test
+    if importlib.util.find_spec("ultralytics") is not None:
+        print(f"[OK] Ultralytics is installed")
+    else:
+        print(f"[FAIL] Ultralytics is not installed")
         return False
 
     try:
@@ -100,6 +102,7 @@ def test_model_loading():
         print("Loading fight detection model...")
         from detection.fight_detector import FightDetector
         fight_detector = FightDetector()
+        fight_detector.model  # models load lazily on first use
         print("[OK] Fight detection model loaded successfully")
     except Exception as e:
         print(f"[FAIL] Failed to load fight detection model: {e}")
@@ -109,6 +112,7 @@ def test_model_loading():
         print("Loading person tracking model...")
         from detection.person_tracker import PersonTracker
         person_tracker = PersonTracker()
+        person_tracker.model
         print("[OK] Person tracking model loaded successfully")
         print("  (YOLOv11x may have been downloaded automatically)")
     except Exception as e:
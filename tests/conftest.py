@@ -0,0 +1,91 @@
+"""
+Shared fixtures.
+
+Pipeline tests run on a synthetic clip with untrained YOLO11n weights built
+from the model config bundled with Ultralytics (no download). The class bias
+of the detection head is raised so the boxes are confident enough to start
+tracks; they are not meaningful, but deterministic and stable from frame to
+frame, which is all that tracking and resume tests need.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from settings import Settings
+
+
+def write_video(path, frames=40, size=(480, 352), fps=25):
+    """Write a clip with a few moving rectangles on a textured background."""
+    width, height = size
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 80, (height, width, 3), dtype=np.uint8)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    for i in range(frames):
+        frame = background.copy()
+        for k, color in enumerate([(40, 200, 40), (200, 60, 60), (60, 60, 220)]):
+            x = (30 + 7 * i + 120 * k) % (width - 80)
+            y = 60 + 90 * k
+            cv2.rectangle(frame, (x, y), (x + 60, y + 120), color, -1)
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def yolo_weights(tmp_path_factory):
+    """Untrained YOLO11n weights with confident (tracked) detections."""
+    import torch
+    from ultralytics import YOLO
+
+    model = YOLO('yolo11n.yaml')
+    with torch.no_grad():
+        for branch in model.model.model[-1].cv3:
+            branch[-1].bias += 12.0
+    path = tmp_path_factory.mktemp('weights') / 'yolo11n.pt'
+    model.save(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def video(tmp_path):
+    return write_video(tmp_path / 'clip.avi')
+
+
+@pytest.fixture
+def pipeline_settings(yolo_weights, monkeypatch):
+    """
+    Small, fast pipeline settings on the untrained weights; every class of
+    the model counts as a fight so the fight tracker has detections.
+    """
+    from detection.fight_detector import FightDetector
+    monkeypatch.setattr(FightDetector, 'fight_class_ids',
+                        property(lambda self: np.arange(len(self.names))))
+
+    return Settings.from_config(
+        None,
+        FIGHT_MODEL_PATH=yolo_weights, FIGHT_MODEL_VARIANT='fp32',
+        PERSON_MODEL_PATH=yolo_weights, PERSON_MODEL_VARIANT='fp32',
+        CONF_THRESHOLD=0.25, PERSON_CONF_THRESHOLD=0.25,
+        IMG_SIZE=416, PERSON_IMG_SIZE=416,
+        FRAME_STRIDE=1, PERSON_STRIDE=1, WINDOW=3, FIGHT_TRIGGER=2,
+        MOTION_GATE_ENABLED=False, LOAD_SHEDDING_ENABLED=False,
+        THREAD_PROFILE_PATH=None, DETECTION_LOG_PATH=None, OUTPUT_MODE='burn',
+    )
+
+
+@pytest.fixture
+def script_shedding(monkeypatch):
+    """Make LoadShedder change level on given frames ({frame: level}) instead of by timing."""
+    from processing.load_shedding import LoadShedder
+
+    def install(script):
+        def observe(self, seconds, source_time=None):
+            self._frame_index += 1
+            level = script.get(self._frame_index)
+            if level is None or level == self.level:
+                return None
+            self._avg = seconds
+            return self._change(level, source_time)
+        monkeypatch.setattr(LoadShedder, 'observe', observe)
+    return install
@@ -0,0 +1,30 @@
+import pytest
+
+from processing.archive_scan import ArchiveScanner, merge_ranges
+from settings import Settings
+
+
+def scanner(**overrides):
+    settings = Settings.from_config(None, IMG_SIZE=640, PERSON_IMG_SIZE=640, PERSON_STRIDE=1,
+                                    THREAD_PROFILE_PATH=None, **overrides)
+    return ArchiveScanner(video_paths=['unused.mp4'], settings=settings, coarse_img_size=320)
+
+
+def test_merge_ranges():
+    assert merge_ranges([(10, 20), (0, 5), (6, 8), (18, 30)]) == [(0, 8), (10, 30)]
+
+
+def test_saving_counts_strided_inference_frames():
+    ranges, source_frames = [[(0, 99)]], [1000]
+    # 100 of 1000 frames, 10 coarse samples at a quarter of the pixels
+    expected = 1 - (10 * 0.25 / 2 + 100) / 1000
+
+    assert scanner(FRAME_STRIDE=1)._estimated_saving(ranges, source_frames, 10) == \
+        pytest.approx(expected)
+    # With stride 2 both passes run half the frames; the coarse samples weigh double
+    assert scanner(FRAME_STRIDE=2)._estimated_saving(ranges, source_frames, 10) == \
+        pytest.approx(1 - (10 * 0.25 / 2 + 50) / 500)
+
+
+def test_saving_without_frames():
+    assert scanner()._estimated_saving([[]], [0], 0) == 0.0
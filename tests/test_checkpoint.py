@@ -0,0 +1,93 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from processing import VideoProcessor
+from processing.checkpoint import CheckpointManager
+from processing.detection_log import read_detection_log
+
+
+def test_save_and_load(tmp_path):
+    manager = CheckpointManager(str(tmp_path / 'out.avi'))
+    assert not manager.exists()
+
+    manager.save({'frame_count': 50, 'temporal': {'pos': 2}}, {'fight': b'state'})
+    assert manager.exists()
+    assert manager.load() == ({'frame_count': 50, 'temporal': {'pos': 2}}, {'fight': b'state'})
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_tracker_state_of_another_checkpoint_is_ignored(tmp_path):
+    manager = CheckpointManager(str(tmp_path / 'out.avi'))
+    manager.save({'frame_count': 50}, {'fight': b'old'})
+    # Interrupted between the tracker file and the JSON file of the next checkpoint
+    with open(manager.path, 'w') as f:
+        f.write('{"frame_count": 100}')
+    assert manager.load() == ({'frame_count': 100}, {})
+
+
+def write_segment(path, frames, value):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 25, (64, 48))
+    for _ in range(frames):
+        writer.write(np.full((48, 64, 3), value, dtype=np.uint8))
+    writer.release()
+
+
+def test_segments_are_joined_and_cleared(tmp_path):
+    output = str(tmp_path / 'out.avi')
+    manager = CheckpointManager(output)
+    segments = [manager.segment_path(i) for i in range(3)]
+    for i, path in enumerate(segments):
+        write_segment(path, 5, 60 * i)
+
+    # A partial segment written after the last checkpoint is discarded
+    manager.discard_unlisted(segments[:2])
+    assert not os.path.exists(segments[2])
+
+    manager.save({'frame_count': 10}, {})
+    manager.finalize(segments[:2], cv2.VideoWriter_fourcc(*'MJPG'), 25, (64, 48))
+
+    cap = cv2.VideoCapture(output)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 10
+    cap.release()
+    assert not manager.exists() and not os.path.exists(manager.segment_dir)
+
+
+class Crash(Exception):
+    pass
+
+
+def run(settings, video, tmp_path, log_name, resume=False, crash_at=None):
+    def progress(frame, stats):
+        if stats['current_frame'] == crash_at:
+            raise Crash()
+
+    processor = VideoProcessor(video_paths=[video], output_path=str(tmp_path / f'{log_name}.avi'),
+                               headless=True, settings=settings, checkpoint_interval=5,
+                               resume=resume, progress_callback=progress,
+                               detection_log_path=str(tmp_path / f'{log_name}.jsonl'))
+    return processor.process()
+
+
+def test_resume_matches_uninterrupted_run_with_person_stride(pipeline_settings, video, tmp_path,
+                                                              script_shedding):
+    # Person model on every other inference frame; the checkpoint after
+    # frame 15 falls between two person-model frames, at shedding level 1
+    script_shedding({8: 1, 18: 0})
+    settings = pipeline_settings.replace(PERSON_STRIDE=2, LOAD_SHEDDING_ENABLED=True,
+                                         GLOW_ENABLED=True)
+
+    full = run(settings, video, tmp_path, 'full')
+
+    with pytest.raises(Crash):
+        run(settings, video, tmp_path, 'resumed', crash_at=17)
+    resumed = run(settings, video, tmp_path, 'resumed', resume=True)
+
+    expected = read_detection_log(str(tmp_path / 'full.jsonl'))
+    assert any(r['persons'] for r in expected)
+    assert read_detection_log(str(tmp_path / 'resumed.jsonl')) == expected
+
+    assert resumed['inference_frames'] == full['inference_frames']
+    assert [e['level'] for e in resumed['quality_changes']] == [1, 0]
@@ -0,0 +1,67 @@
+import numpy as np
+
+from utils.compositing import Layer, composite, composite_pixels
+
+
+def reference_blend(dst, color, alpha):
+    """Straight-alpha blend in float, rounded."""
+    return np.rint(dst * (1 - alpha / 255) + np.asarray(color) * alpha / 255)
+
+
+def test_bgra_layer_matches_float_blend_within_rounding():
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+    bgra = rng.integers(0, 256, (20, 30, 4), dtype=np.uint8)
+    expected = reference_blend(img.astype(float), bgra[:, :, :3].astype(float),
+                               bgra[:, :, 3:4].astype(float))
+
+    composite(img, Layer.from_bgra(bgra))
+    assert np.abs(img.astype(int) - expected).max() <= 2
+
+
+def test_opaque_and_transparent_mask():
+    img = np.full((4, 4, 3), 50, dtype=np.uint8)
+    mask = np.zeros((4, 4), dtype=np.uint8)
+    mask[:2] = 255
+    composite(img, Layer.from_mask(mask, (10, 200, 30)))
+    assert (img[:2] == (10, 200, 30)).all()
+    assert (img[2:] == 50).all()
+
+
+def test_mask_alpha_scales_coverage():
+    img = np.zeros((2, 2, 3), dtype=np.uint8)
+    composite(img, Layer.from_mask(np.full((2, 2), 255, np.uint8), (200, 100, 0), alpha=0.5))
+    assert np.abs(img.astype(int) - (100, 50, 0)).max() <= 1
+
+
+def test_layer_is_clipped_to_the_image():
+    img = np.zeros((10, 10, 3), dtype=np.uint8)
+    layer = Layer.from_mask(np.full((4, 4), 255, np.uint8), (255, 255, 255))
+
+    composite(img, layer, x=-2, y=8)
+    assert img[8:, :2].min() == 255
+    assert img.sum() == 2 * 2 * 3 * 255
+
+    composite(img, layer, x=20, y=20)  # fully outside: nothing happens
+    assert img.sum() == 2 * 2 * 3 * 255
+
+
+def test_blend_layer():
+    img = np.full((1, 2, 3), 100, dtype=np.uint8)
+    scale = np.array([[[0.5], [1.0]]])
+    offset = np.array([[[20, 20, 20], [0, 0, 0]]], dtype=float)
+    composite(img, Layer.from_blend(scale, offset))
+    assert np.abs(img.astype(int) - [[[70] * 3, [100] * 3]]).max() <= 1
+
+
+def test_pixels_use_the_same_arithmetic_as_layers():
+    rng = np.random.default_rng(1)
+    img = rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    bgra = rng.integers(0, 256, (8, 8, 4), dtype=np.uint8)
+    layer = Layer.from_bgra(bgra)
+    ys, xs = np.nonzero(np.ones((8, 8), dtype=bool))
+
+    by_pixels = img.copy()
+    composite_pixels(by_pixels, ys, xs, layer.premul[ys, xs], layer.inv_alpha[ys, xs])
+    composite(img, layer)
+    assert np.abs(by_pixels.astype(int) - img.astype(int)).max() <= 1
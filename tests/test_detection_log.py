@@ -0,0 +1,36 @@
+from processing.detection_log import DetectionLog, read_detection_log
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / 'log.jsonl')
+    log = DetectionLog(path)
+    log.write({'frame': 1, 'fight': True, 'persons': [[10, 20, 'P3', 1]]})
+    log.write({'frame': 2, 'fight': False, 'persons': []})
+    log.close()
+    log.close()
+
+    assert read_detection_log(path) == [
+        {'frame': 1, 'fight': True, 'persons': [[10, 20, 'P3', 1]]},
+        {'frame': 2, 'fight': False, 'persons': []},
+    ]
+
+
+def test_resume_truncates_to_the_checkpoint_offset(tmp_path):
+    path = str(tmp_path / 'log.jsonl')
+    log = DetectionLog(path)
+    log.write({'frame': 1})
+    offset = log.offset()
+    log.write({'frame': 2})  # written after the checkpoint, lost on resume
+    log.close()
+
+    log = DetectionLog(path, resume_offset=offset)
+    log.write({'frame': 2, 'resumed': True})
+    log.close()
+    assert read_detection_log(path) == [{'frame': 1}, {'frame': 2, 'resumed': True}]
+
+
+def test_new_run_starts_a_fresh_log(tmp_path):
+    path = tmp_path / 'log.jsonl'
+    path.write_text('{"frame": 99}\n')
+    DetectionLog(str(path)).close()
+    assert read_detection_log(str(path)) == []
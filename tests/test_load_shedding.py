@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from processing import VideoProcessor
+from processing.detection_log import read_detection_log
+from processing.load_shedding import LoadShedder, shedding_levels
+from settings import Settings
+
+
+def make_levels(**overrides):
+    return shedding_levels(Settings.from_config(None, THREAD_PROFILE_PATH=None, **overrides))
+
+
+def test_levels_add_up():
+    levels = make_levels(GLOW_ENABLED=True, SHADOW_ENABLED=True, PERSON_STRIDE=1,
+                         IMG_SIZE=640, PERSON_IMG_SIZE=1280, LOAD_SHEDDING_INPUT_SCALE=0.75)
+    assert [name for name, _ in levels][0] == "full quality"
+    assert len(levels) == 4
+
+    effects, stride, size = (s for _, s in levels[1:])
+    assert not effects.GLOW_ENABLED and not effects.SHADOW_ENABLED
+    assert stride.PERSON_STRIDE == 2 and not stride.GLOW_ENABLED
+    assert (size.IMG_SIZE, size.PERSON_IMG_SIZE) == (480, 960)
+    assert size.PERSON_STRIDE == 2
+
+
+def test_levels_skip_steps_without_effect():
+    levels = make_levels(GLOW_ENABLED=False, SHADOW_ENABLED=False, PERSON_STRIDE=2,
+                         IMG_SIZE=320, PERSON_IMG_SIZE=320)
+    assert len(levels) == 1
+
+
+def test_scaled_sizes_stay_multiples_of_32_and_at_least_320():
+    size = make_levels(IMG_SIZE=416, PERSON_IMG_SIZE=1280, LOAD_SHEDDING_INPUT_SCALE=0.5)[-1][1]
+    assert size.IMG_SIZE == 320
+    assert size.PERSON_IMG_SIZE == 640
+
+
+def fake_levels(count):
+    return [(f"level {i}", i) for i in range(count)]
+
+
+def feed(shedder, seconds, frames):
+    """Observe frames of a constant duration, return the settings of each change."""
+    return [s for s in (shedder.observe(seconds) for _ in range(frames)) if s is not None]
+
+
+def test_steps_down_after_a_window_over_budget():
+    shedder = LoadShedder(10, fake_levels(4), window=5)
+    assert feed(shedder, 0.2, 4) == []
+    assert feed(shedder, 0.2, 1) == [1]
+    # A full window passes before the next step
+    assert feed(shedder, 0.2, 4) == []
+    assert feed(shedder, 0.2, 1) == [2]
+    assert feed(shedder, 0.2, 20) == [3]
+    assert shedder.level == 3
+    assert [e['level'] for e in shedder.events] == [1, 2, 3]
+
+
+def test_steps_up_with_headroom_and_holds_in_between():
+    shedder = LoadShedder(10, fake_levels(3), window=5, headroom=0.7)
+    feed(shedder, 0.2, 10)
+    assert shedder.level == 2
+    # Between headroom and budget: no change
+    assert feed(shedder, 0.08, 20) == []
+    assert feed(shedder, 0.01, 10) == [1, 0]
+    assert shedder.level == 0
+
+
+def test_undone_step_up_doubles_the_wait():
+    shedder = LoadShedder(10, fake_levels(2), window=5)
+    feed(shedder, 0.2, 5)
+    assert feed(shedder, 0.01, 5) == [0]
+    assert feed(shedder, 0.2, 5) == [1]       # the step up did not hold
+    # The next step up waits two windows instead of one
+    assert feed(shedder, 0.01, 9) == []
+    assert feed(shedder, 0.01, 1) == [0]
+
+
+def test_trackers_survive_input_size_changes(pipeline_settings, video, tmp_path, monkeypatch,
+                                             script_shedding):
+    from ultralytics.utils import LOGGER
+
+    warnings = []
+    monkeypatch.setattr(LOGGER, 'warning', lambda msg, *a, **k: warnings.append(str(msg)))
+    # Down to level 3 (smaller inputs) and back up to full quality
+    script_shedding({4: 1, 6: 2, 8: 3, 16: 2, 18: 1, 20: 0})
+
+    settings = pipeline_settings.replace(LOAD_SHEDDING_ENABLED=True, SHARED_PREPROCESS=True,
+                                         GLOW_ENABLED=True, SHADOW_ENABLED=True)
+    assert shedding_levels(settings)[3][1].IMG_SIZE < settings.IMG_SIZE
+
+    processor = VideoProcessor(video_paths=[video], output_path=str(tmp_path / 'out.avi'),
+                               headless=True, settings=settings,
+                               detection_log_path=str(tmp_path / 'log.jsonl'))
+    fight_tracks = []
+    detect = processor.fight_detector.detect
+
+    def counting_detect(*args, **kwargs):
+        result = detect(*args, **kwargs)
+        fight_tracks.append(len(processor.fight_detector.model.predictor.trackers[0].tracked_stracks))
+        return result
+
+    processor.fight_detector.detect = counting_detect
+    stats = processor.process()
+
+    assert [e['level'] for e in stats['quality_changes']] == [1, 2, 3, 2, 1, 0]
+    assert not [w for w in warnings if 'GMC' in w]
+
+    # Both trackers keep (re)confirming tracks after every size change
+    records = read_detection_log(str(tmp_path / 'log.jsonl'))
+    for start, end in ((8, 16), (20, len(records))):
+        assert any(fight_tracks[start + 2:end])
+        assert any(label != 'P?' for r in records[start + 2:end] for _, _, label, _ in r['persons'])
+
+
+def test_snapshot_continues_where_it_left_off():
+    shedder = LoadShedder(10, fake_levels(3), window=3)
+    feed(shedder, 0.2, 4)
+    restored = LoadShedder(10, fake_levels(3), window=3)
+    restored.restore(json.loads(json.dumps(shedder.to_dict())))
+
+    assert (restored.level, restored.events) == (shedder.level, shedder.events)
+    assert feed(restored, 0.2, 5) == feed(shedder, 0.2, 5)
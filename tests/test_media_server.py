@@ -0,0 +1,68 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from utils.media_server import MediaServer, media_type, parse_range
+
+
+@pytest.fixture
+def server():
+    server = MediaServer('127.0.0.1', 0, chunk_size=7)
+    yield server
+    server.close()
+
+
+def fetch(server, url_path, headers=None):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.port}{url_path}",
+                                     headers=headers or {})
+    with urllib.request.urlopen(request) as response:
+        return response.status, dict(response.headers), response.read()
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range('bytes=0-', 100) == (0, 99)
+    assert parse_range('bytes=10-19', 100) == (10, 19)
+    assert parse_range('bytes=90-500', 100) == (90, 99)
+    assert parse_range('bytes=-30', 100) == (70, 99)
+    assert parse_range('bytes=0-1,5-6', 100) is None
+    with pytest.raises(ValueError):
+        parse_range('bytes=100-', 100)
+
+
+def test_media_type():
+    assert media_type('out/analyzed_clip.MP4') == 'video/mp4'
+    assert media_type('analyzed_clip.webm') == 'video/webm'
+    assert media_type('analyzed_clip.unknown') == 'application/octet-stream'
+
+
+def test_serves_registered_files_with_ranges(server, tmp_path):
+    data = bytes(range(256)) * 4
+    path = tmp_path / 'clip.webm'
+    path.write_bytes(data)
+    url_path = server.register(str(path))
+    assert url_path.endswith('/clip.webm') and server.register(str(path)) == url_path
+
+    status, headers, body = fetch(server, url_path)
+    assert (status, body) == (200, data)
+    assert headers['Content-Type'] == 'video/webm' and headers['Accept-Ranges'] == 'bytes'
+
+    status, headers, body = fetch(server, url_path, {'Range': 'bytes=100-199'})
+    assert (status, body) == (206, data[100:200])
+    assert headers['Content-Range'] == f"bytes 100-199/{len(data)}"
+
+
+def test_unregistered_and_forgotten_files_are_not_served(server, tmp_path):
+    path = tmp_path / 'clip.mp4'
+    path.write_bytes(b'video')
+    url_path = server.register(str(path))
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch(server, '/not-a-token/clip.mp4')
+    assert error.value.code == 404
+
+    server.forget(str(tmp_path))
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch(server, url_path)
+    assert error.value.code == 404
@@ -0,0 +1,13 @@
+from processing.preflight import check_setup
+from settings import Settings
+
+
+def test_inputs_and_output_come_from_the_settings(video, tmp_path):
+    settings = Settings.from_config(None, VIDEO_PATHS=[video, str(tmp_path / 'missing.avi')],
+                                    OUTPUT_PATH=str(tmp_path / 'out' / 'result.avi'),
+                                    DEFAULT_FPS=12, THREAD_PROFILE_PATH=None)
+    messages = {message: ok for ok, message in check_setup(settings=settings)}
+
+    assert messages[f"Input: {video} (480x352 @ 25.0 FPS, 40 frames)"]
+    assert not messages[f"Input not found: {tmp_path / 'missing.avi'}"]
+    assert not messages[f"Output directory writable: {tmp_path / 'out'}"]
@@ -0,0 +1,13 @@
+from processing import PreviewPolicy
+from settings import Settings
+
+
+def test_policy_defaults_come_from_the_settings():
+    settings = Settings.from_config(None, PREVIEW_MAX_FPS=0, PREVIEW_MAX_WIDTH=320,
+                                    PREVIEW_JPEG_QUALITY=50, PROGRESS_INTERVAL=2.5,
+                                    THREAD_PROFILE_PATH=None)
+    policy = PreviewPolicy(settings=settings)
+    assert (policy.max_fps, policy.max_width, policy.jpeg_quality, policy.progress_interval) == \
+        (0, 320, 50, 2.5)
+
+    assert PreviewPolicy(max_width=640, settings=settings).max_width == 640
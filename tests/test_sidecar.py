@@ -0,0 +1,66 @@
+import json
+
+from processing.sidecar import (
+    TRACK_ID, SidecarWriter, copy_inputs, sidecar_paths, sidecar_video_path, track_script_literal,
+    vtt_timestamp,
+)
+
+
+def test_paths():
+    assert sidecar_paths('out/analyzed.mp4') == {'vtt': 'out/analyzed.vtt',
+                                                 'boxes': 'out/analyzed.boxes.json'}
+    assert sidecar_video_path('out/analyzed.mp4', ['in/a.mkv', 'in/b.mkv']) == 'out/analyzed.mkv'
+
+
+def test_vtt_timestamp():
+    assert vtt_timestamp(0) == "00:00:00.000"
+    assert vtt_timestamp(3723.4567) == "01:02:03.457"
+
+
+def test_copy_single_input(tmp_path):
+    source = tmp_path / 'in.mp4'
+    source.write_bytes(b'untouched video bytes')
+    copy_inputs([str(source)], str(tmp_path / 'out.mp4'))
+    assert (tmp_path / 'out.mp4').read_bytes() == b'untouched video bytes'
+
+
+def test_cues_and_box_track(tmp_path):
+    writer = SidecarWriter(str(tmp_path / 'out.mp4'), 640, 360)
+    fight = [[10, 20, 110, 220, 0.8, 0]]
+    person = [[60, 120, 'P3', 1]]
+    frame = 0.04
+
+    writer.add(0.00, frame, False, [], [], [], 0.0)
+    writer.add(0.04, frame, True, fight, person, [3], 0.8)
+    writer.add(0.08, frame, True, fight, person, [3, 5], 0.9)  # unchanged boxes: no entry
+    writer.add(0.12, frame, False, [], [], [], 0.0)
+    writer.add(0.16, frame, True, fight, [], [], 0.6)
+    writer.gap(0.20)  # end of the input ends the cue and clears the overlay
+    writer.write()
+
+    with open(writer.paths['vtt'], encoding='utf-8') as f:
+        assert f.read() == (
+            "WEBVTT\n"
+            "\n1\n00:00:00.040 --> 00:00:00.120\nFIGHT 0.90 - P3, P5\n"
+            "\n2\n00:00:00.160 --> 00:00:00.200\nFIGHT 0.60\n"
+        )
+
+    with open(writer.paths['boxes'], encoding='utf-8') as f:
+        track = json.load(f)
+    assert (track['id'], track['width'], track['height']) == (TRACK_ID, 640, 360)
+    assert track['cues'] == [[0.04, 0.12], [0.16, 0.2]]
+    assert [(e['t'], e['confirmed']) for e in track['entries']] == \
+        [(0.0, 0), (0.04, 1), (0.12, 0), (0.16, 1), (0.2, 0)]
+    assert track['entries'][1]['fights'] == fight and track['entries'][1]['persons'] == person
+
+
+def test_labels_cannot_break_out_of_the_player_script(tmp_path):
+    writer = SidecarWriter(str(tmp_path / 'out.mp4'), 64, 48)
+    writer.add(0.0, 0.04, False, [], [[1, 2, '</script><b>', 0]], [], 0.0)
+    writer.write()
+
+    with open(writer.paths['boxes'], encoding='utf-8') as f:
+        track = json.load(f)
+    literal = track_script_literal(track)
+    assert '</script' not in literal
+    assert json.loads(literal) == track
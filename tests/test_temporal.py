@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+
+from detection.temporal import (
+    TemporalState, confirmed_flags, confirmed_intervals, flags_to_intervals, interval_agreement,
+)
+
+
+def test_flags_to_intervals():
+    assert flags_to_intervals([]) == []
+    assert flags_to_intervals([0, 0]) == []
+    assert flags_to_intervals([1, 1, 0, 1, 0, 0, 1, 1]) == [(0, 1), (3, 3), (6, 7)]
+
+
+def test_confirmed_flags_need_trigger_frames_in_window():
+    flags = [1, 0, 1, 0, 0, 0, 1, 1, 1]
+    assert confirmed_flags(flags, window=3, trigger=2) == [0, 0, 1, 0, 0, 0, 0, 1, 1]
+    assert confirmed_intervals(flags, window=3, trigger=2) == [(2, 2), (7, 8)]
+
+
+def test_interval_agreement_identical_and_empty():
+    same = interval_agreement([(0, 9), (20, 29)], [(0, 9), (20, 29)])
+    assert same['frame_iou'] == 1.0
+    assert same['interval_recall'] == same['interval_precision'] == 1.0
+
+    assert interval_agreement([], [])['frame_iou'] == 1.0
+    missed = interval_agreement([(0, 9)], [])
+    assert missed['frame_iou'] == 0.0 and missed['interval_recall'] == 0.0
+    assert missed['interval_precision'] == 1.0
+
+
+def test_interval_agreement_partial_overlap():
+    result = interval_agreement([(0, 9), (50, 59)], [(5, 14), (100, 100)])
+    # 5 shared frames of 10 + 10 + 1 + 5 (union 26)
+    assert result['frame_iou'] == 5 / 26
+    assert result['interval_recall'] == 0.5
+    assert result['interval_precision'] == 0.5
+    assert (result['reference_intervals'], result['candidate_intervals']) == (2, 2)
+
+
+def test_state_survives_a_round_trip():
+    state = TemporalState(window=4, trigger=2, graph_size=3)
+    for flag, intensity in ((1, 0.9), (0, 0.0), (1, 0.8), (1, 0.7)):
+        state.update(flag)
+        state.push_intensity(intensity)
+    state.region_boxes = np.array([[10, 20, 30, 40]])
+    state.region_confs = np.array([0.75])
+    state.region_patience = np.array([2])
+
+    restored = TemporalState.from_dict(json.loads(json.dumps(state.to_dict())))
+    assert restored.to_dict() == state.to_dict()
+    assert restored.count == 3 and restored.confirmed
+    assert restored.graph_history() == state.graph_history()
+    # The ring buffer continues where it left off: the oldest flag (1) drops out
+    assert restored.update(0) == state.update(0)
+    assert restored.count == state.count == 2
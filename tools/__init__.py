@@ -0,0 +1,4 @@
+"""
+Tools package for fight detection system.
+Offline utilities (model quantization, benchmarks) run with `python -m tools.<name>`.
+"""
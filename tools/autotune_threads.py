@@ -0,0 +1,181 @@
+"""
+Autotune thread counts.
+
+Cuts a short clip from a real video and runs the full pipeline on it with
+different thread settings, one stage at a time (each stage keeps the best
+value of the previous ones):
+
+1. TORCH_THREADS: torch intra-op threads (inference)
+2. OPENCV_THREADS: OpenCV threads (resizing, colour conversion, encoding)
+3. READER_THREADS: ffmpeg decoder threads (only with VIDEO_READER = "ffmpeg")
+4. MAX_CONCURRENT_JOBS: analyses running at once (web jobs), measured as
+   the combined FPS of that many simultaneous runs
+
+The FPS of every configuration is printed, and the best settings are
+written to config.THREAD_PROFILE_PATH, which Settings (and so
+VideoProcessor and the web job runner) apply at startup.
+
+Frames are not batched: tracking needs the frames of a stream in order, one
+at a time, so there is no batch size to tune.
+
+Usage:
+    python -m tools.autotune_threads
+    python -m tools.autotune_threads --video videos/a.avi --frames 150 --profile realtime
+    python -m tools.autotune_threads --max-workers 2 --dry-run
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2
+import torch
+
+import config
+from processing import VideoProcessor
+from processing.threads import available_cores
+from settings import Settings
+from tools.benchmark_profiles import cpu_name, cut_clip
+
+
+def thread_candidates(cores):
+    """Thread counts worth trying on a machine with ``cores`` cores."""
+    return sorted({n for n in (1, 2, 4, 8, cores // 2, cores) if 1 <= n <= cores})
+
+
+def measure(settings, clip, frames, temp_dir, workers=1, repeats=2):
+    """
+    Combined FPS of ``workers`` simultaneous runs over the clip (best of repeats).
+
+    Each run applies the thread settings when it starts. The first round is
+    a warm-up (the registry loads one model per concurrent run) and is not
+    counted.
+    """
+    def run(worker):
+        VideoProcessor(
+            video_paths=[clip],
+            output_path=os.path.join(temp_dir, f'out{worker}.avi'),
+            headless=True,
+            settings=settings
+        ).process()
+
+    best = 0.0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for round_index in range(repeats + 1):
+            start = time.perf_counter()
+            list(executor.map(run, range(workers)))
+            if round_index:
+                best = max(best, workers * frames / (time.perf_counter() - start))
+    return best
+
+
+def tune(name, candidates, current, measure_fps, labels=None):
+    """
+    Measure every candidate value of one setting.
+
+    Returns:
+        tuple: (best value, [(value, fps)])
+    """
+    print(f"\n{name}")
+    results = []
+    for value in candidates:
+        fps = measure_fps({**current, name: value})
+        results.append((value, fps))
+        label = (labels or {}).get(value, value)
+        print(f"  {str(label):>12}  {fps:7.2f} FPS")
+    best = max(results, key=lambda r: r[1])[0]
+    print(f"  → {name} = {best}")
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Autotune torch/OpenCV threads and concurrent jobs")
+    parser.add_argument('--video', default=config.VIDEO_PATHS[0], help="Source video")
+    parser.add_argument('--frames', type=int, default=150, help="Frames in the sample clip")
+    parser.add_argument('--profile', choices=list(config.PERFORMANCE_PROFILES), default=None)
+    parser.add_argument('--repeats', type=int, default=2, help="Timed runs per configuration (best counts)")
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help="Most concurrent jobs to try (default: up to 4, at most the cores)")
+    parser.add_argument('--output', default=config.THREAD_PROFILE_PATH, help="Thread profile to write")
+    parser.add_argument('--dry-run', action='store_true', help="Measure only, do not write the profile")
+    args = parser.parse_args()
+
+    cores = available_cores()
+    candidates = thread_candidates(cores)
+    # Library defaults, measured like any other value
+    defaults = {'TORCH_THREADS': torch.get_num_threads(), 'OPENCV_THREADS': cv2.getNumThreads()}
+
+    # An existing profile must not influence the measurements
+    base = Settings.from_config(args.profile, THREAD_PROFILE_PATH=None)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        clip = os.path.join(temp_dir, 'clip.avi')
+        frames, width, height = cut_clip(args.video, args.frames, clip)
+
+        print("=" * 60)
+        print(f"CPU: {cpu_name()} ({cores} cores available)")
+        print(f"Clip: {frames} frames @ {width}x{height}, profile {base.PERFORMANCE_PROFILE or 'config defaults'}")
+        print(f"Defaults: torch {defaults['TORCH_THREADS']} threads, OpenCV {defaults['OPENCV_THREADS']} threads")
+        print("=" * 60)
+
+        def measure_fps(values, workers=1):
+            return measure(base.replace(**values), clip, frames, temp_dir, workers, args.repeats)
+
+        current = dict(defaults, READER_THREADS=base.READER_THREADS)
+        results = {}
+
+        current['TORCH_THREADS'], results['TORCH_THREADS'] = tune(
+            'TORCH_THREADS', sorted(set(candidates) | {defaults['TORCH_THREADS']}), current, measure_fps,
+            {defaults['TORCH_THREADS']: f"{defaults['TORCH_THREADS']} (default)"})
+
+        current['OPENCV_THREADS'], results['OPENCV_THREADS'] = tune(
+            'OPENCV_THREADS', sorted({0} | set(candidates) | {defaults['OPENCV_THREADS']}), current,
+            measure_fps, {0: "0 (off)", defaults['OPENCV_THREADS']: f"{defaults['OPENCV_THREADS']} (default)"})
+
+        if base.VIDEO_READER == 'ffmpeg':
+            current['READER_THREADS'], results['READER_THREADS'] = tune(
+                'READER_THREADS', [0] + candidates, current, measure_fps, {0: "0 (auto)"})
+
+        max_workers = args.max_workers or min(4, cores)
+        workers, results['MAX_CONCURRENT_JOBS'] = tune(
+            'MAX_CONCURRENT_JOBS', range(1, max_workers + 1), current,
+            lambda values: measure_fps({k: v for k, v in values.items() if k != 'MAX_CONCURRENT_JOBS'},
+                                       values['MAX_CONCURRENT_JOBS']))
+
+    tuned = {'TORCH_THREADS': current['TORCH_THREADS'], 'OPENCV_THREADS': current['OPENCV_THREADS']}
+    if 'READER_THREADS' in results:
+        tuned['READER_THREADS'] = current['READER_THREADS']
+    tuned['MAX_CONCURRENT_JOBS'] = workers
+
+    single = dict(results['MAX_CONCURRENT_JOBS'])[1]
+    baseline = dict(results['TORCH_THREADS'])[defaults['TORCH_THREADS']]
+    print("\n" + "=" * 60)
+    print("Best: " + ", ".join(f"{name} = {value}" for name, value in tuned.items()))
+    print(f"Single run: {single:.2f} FPS (library defaults: {baseline:.2f} FPS)")
+
+    if args.dry_run:
+        return
+
+    profile = {
+        'settings': tuned,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'cpu': cpu_name(),
+        'cores': cores,
+        'machine': platform.node(),
+        'video': args.video,
+        'clip': {'frames': frames, 'width': width, 'height': height},
+        'performance_profile': base.PERFORMANCE_PROFILE,
+        'fps': {name: [[value, round(fps, 2)] for value, fps in values] for name, values in results.items()},
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    print(f"✅ Thread profile written: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Check and benchmark the alpha compositing core.
+
+Correctness: draws panels, shadows, glows, labels and the watermark with
+the compositing core and with the previous full-frame cv2.addWeighted
+implementation (kept below as the reference), on random backgrounds and at
+positions that are partly outside the frame, and reports the largest pixel
+difference. Exits non-zero if it exceeds --tolerance.
+
+Throughput: times each primitive with both implementations per resolution.
+
+Usage:
+    python -m tools.benchmark_compositing
+    python -m tools.benchmark_compositing --resolutions 1280x720 3840x2160 --repeats 50
+"""
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from utils import drawing
+from utils.sprites import SpriteCache, blit_sprites
+
+
+# ========================
+# Reference: full-frame addWeighted implementation
+# ========================
+
+def ref_rounded_rectangle(img, pt1, pt2, color, thickness=-1, radius=15, alpha=1.0):
+    overlay = img.copy() if alpha < 1.0 else img
+    drawing._rounded_rectangle_shape(overlay, pt1, pt2, color, thickness, radius)
+    if alpha < 1.0:
+        cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+
+
+def ref_shadow_rectangle(img, pt1, pt2, color, shadow_offset=5, radius=15, alpha=0.85):
+    (x1, y1), (x2, y2) = pt1, pt2
+    shadow_color = tuple(int(c * 0.3) for c in color)
+    ref_rounded_rectangle(img, (x1 + shadow_offset, y1 + shadow_offset),
+                          (x2 + shadow_offset, y2 + shadow_offset), shadow_color, -1, radius, alpha * 0.4)
+    ref_rounded_rectangle(img, pt1, pt2, color, -1, radius, alpha)
+
+
+def ref_glow_effect(img, pt1, pt2, color, intensity=20, radius=15):
+    (x1, y1), (x2, y2) = pt1, pt2
+    for i in range(intensity, 0, -2):
+        alpha = 0.05 * (intensity - i) / intensity
+        glow_color = tuple(int(c * 0.8) for c in color)
+        ref_rounded_rectangle(img, (x1 - i, y1 - i), (x2 + i, y2 + i), glow_color, 2, radius + i, alpha)
+
+
+def ref_text_with_background(img, text, pos, font_scale=0.6, text_color=(255, 255, 255),
+                             bg_color=(45, 45, 45), thickness=2, padding=10, radius=8,
+                             alpha=0.9, shadow_offset=5):
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    x, y = pos
+    (text_w, text_h), _ = cv2.getTextSize(text, font, font_scale, thickness)
+    ref_shadow_rectangle(img, (x - padding, y - text_h - padding), (x + text_w + padding, y + padding),
+                         bg_color, shadow_offset=shadow_offset, radius=radius, alpha=alpha)
+    drawing.draw_text_with_outline(img, text, (x, y), font, font_scale, text_color,
+                                   outline_color=(0, 0, 0), thickness=thickness, outline_thickness=1)
+
+
+def ref_watermark(img, text="VAMS", position="bottom-right", alpha=0.3):
+    h, w = img.shape[:2]
+    font, font_scale, thickness = cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3
+    (text_w, text_h), _ = cv2.getTextSize(text, font, font_scale, thickness)
+    pos = (w - text_w - 20, h - 20)
+    overlay = img.copy()
+    cv2.putText(overlay, text, pos, font, font_scale, (200, 200, 200), thickness, cv2.LINE_AA)
+    cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+
+
+# ========================
+# Cases: (name, reference(img), new(img))
+# ========================
+
+def build_cases(width, height):
+    """Drawing operations sized like the dashboard and labels at this resolution."""
+    scale = min(width / 1000, 1.2)
+    panel_w, panel_h = int(width * 0.28), int(130 * scale)
+    px, py = int(25 * scale), height - panel_h - int(25 * scale)
+    radius = int(15 * scale)
+    red = (50, 50, 255)
+    sprites = SpriteCache(64)
+    labels = [(f"P{i}", int(x), int(y)) for i, (x, y) in enumerate(zip(
+        np.linspace(-10, width - 20, 40), np.linspace(10, height + 5, 40)))]
+    label_style = dict(font_scale=0.6, text_color=(255, 255, 255), bg_color=(30, 140, 220),
+                       thickness=2, padding=8, radius=6, alpha=0.9)
+
+    return [
+        ("panel (shadow + fill)",
+         lambda img: ref_shadow_rectangle(img, (px, py), (px + panel_w, py + panel_h), (45, 45, 45), 5, radius, 0.85),
+         lambda img: drawing.draw_shadow_rectangle(img, (px, py), (px + panel_w, py + panel_h), (45, 45, 45), 5, radius, 0.85)),
+        ("ghost box outline (clipped)",
+         lambda img: ref_rounded_rectangle(img, (-20, -15), (width // 3, height // 3), red, 3, 12, 0.6),
+         lambda img: drawing.draw_rounded_rectangle(img, (-20, -15), (width // 3, height // 3), red, 3, 12, 0.6)),
+        ("glow",
+         lambda img: ref_glow_effect(img, (px, py), (px + panel_w, py + panel_h), red, 15, radius),
+         lambda img: drawing.draw_glow_effect(img, (px, py), (px + panel_w, py + panel_h), red, 15, radius)),
+        ("glow (cached layer)",
+         lambda img: ref_glow_effect(img, (px, py), (px + panel_w, py + panel_h), red, 15, radius),
+         lambda img: drawing.draw_cached_glow(img, (px, py), (px + panel_w, py + panel_h), red, 15, radius)),
+        ("40 labels",
+         lambda img: [ref_text_with_background(img, t, (x, y), **label_style) for t, x, y in labels],
+         lambda img: blit_sprites(img, [(sprites.label(t, **label_style, shadow=True, shadow_offset=5), x, y)
+                                        for t, x, y in labels])),
+        ("watermark",
+         lambda img: ref_watermark(img),
+         lambda img: drawing.draw_watermark(img)),
+    ]
+
+
+def check(resolutions, tolerance):
+    """Compare new output with the reference. Returns True if all are within tolerance."""
+    rng = np.random.default_rng(0)
+    ok = True
+    print(f"{'case':<30}{'resolution':>12}{'max diff':>10}{'pixels > 1':>12}")
+    for width, height in resolutions:
+        background = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        for name, ref, new in build_cases(width, height):
+            expected, actual = background.copy(), background.copy()
+            ref(expected)
+            new(actual)
+            diff = np.abs(expected.astype(np.int16) - actual)
+            ok &= int(diff.max()) <= tolerance
+            print(f"{name:<30}{f'{width}x{height}':>12}{int(diff.max()):>10}{int((diff > 1).sum()):>12}")
+    return ok
+
+
+def benchmark(resolutions, repeats):
+    """Time both implementations of every case."""
+    rng = np.random.default_rng(1)
+    print(f"\n{'case':<30}{'resolution':>12}{'ref ms':>10}{'new ms':>10}{'speedup':>9}")
+    for width, height in resolutions:
+        frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        for name, ref, new in build_cases(width, height):
+            new(frame.copy())  # warm caches
+            timings = []
+            for fn in (ref, new):
+                img = frame.copy()
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    fn(img)
+                timings.append((time.perf_counter() - start) / repeats * 1000)
+            print(f"{name:<30}{f'{width}x{height}':>12}{timings[0]:>10.2f}{timings[1]:>10.2f}"
+                  f"{timings[0] / timings[1]:>8.1f}x")
+
+
+def parse_resolution(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the compositing core")
+    parser.add_argument('--resolutions', nargs='+', type=parse_resolution,
+                        default=[(1280, 720), (1920, 1080), (3840, 2160)])
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--tolerance', type=int, default=3,
+                        help="Largest allowed per-channel difference to the reference")
+    parser.add_argument('--check-only', action='store_true')
+    args = parser.parse_args()
+
+    ok = check(args.resolutions, args.tolerance)
+    print(f"\n[OK] all differences <= {args.tolerance}" if ok
+          else f"\n[FAIL] difference above {args.tolerance}")
+    if not args.check_only:
+        benchmark(args.resolutions, args.repeats)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark the performance profiles.
+
+Cuts a short clip from a video, runs the full pipeline (detection, tracking,
+overlay, encoding) with every profile and prints the end-to-end FPS together
+with the CPU it was measured on. Model loading and warm-up are not timed.
+
+Usage:
+    python -m tools.benchmark_profiles
+    python -m tools.benchmark_profiles --video videos/a.avi --frames 300
+"""
+
+import argparse
+import os
+import platform
+import tempfile
+import time
+
+import cv2
+
+import config
+from processing import VideoProcessor
+
+
+def cpu_name():
+    """Best-effort CPU model string."""
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def cut_clip(video_path, frames, out_path):
+    """Write the first ``frames`` frames of a video to out_path."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"❌ Error: Could not open video: {video_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or config.DEFAULT_FPS
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    writer = cv2.VideoWriter(out_path, cv2.VideoWriter_fourcc(*'XVID'), fps, (width, height))
+
+    written = 0
+    while written < frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        writer.write(frame)
+        written += 1
+
+    cap.release()
+    writer.release()
+    return written, width, height
+
+
+def benchmark_profile(profile, clip_path, output_path):
+    """Run one profile over the clip, return (frames, seconds)."""
+    processor = VideoProcessor(
+        video_paths=[clip_path],
+        output_path=output_path,
+        headless=True,
+        profile=profile
+    )
+
+    # Load and warm up both models first, so only frame processing is timed
+    # (models already in the registry would otherwise start warm for some
+    # profiles and cold for others)
+    processor.fight_detector.model
+    processor.person_tracker.model
+
+    start = time.perf_counter()
+    stats = processor.process()
+    return stats['total_frames'], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VAMS performance profiles")
+    parser.add_argument('--video', default=config.VIDEO_PATHS[0], help="Source video")
+    parser.add_argument('--frames', type=int, default=300, help="Frames to benchmark")
+    parser.add_argument('--profiles', nargs='+', default=list(config.PERFORMANCE_PROFILES),
+                        choices=list(config.PERFORMANCE_PROFILES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        clip = os.path.join(temp_dir, 'clip.avi')
+        frames, width, height = cut_clip(args.video, args.frames, clip)
+
+        results = []
+        for profile in args.profiles:
+            output = os.path.join(temp_dir, f'{profile}.avi')
+            processed, seconds = benchmark_profile(profile, clip, output)
+            results.append((profile, processed, seconds))
+
+    print("\n" + "=" * 60)
+    print(f"CPU: {cpu_name()}")
+    print(f"Clip: {frames} frames @ {width}x{height}")
+    print("=" * 60)
+    print(f"{'Profile':<12}{'Frames':>8}{'Seconds':>10}{'FPS':>8}")
+    for profile, processed, seconds in results:
+        print(f"{profile:<12}{processed:>8}{seconds:>10.1f}{processed / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Measure per-frame memory allocations of the frame loop with tracemalloc.
+
+Runs the non-model stages of the frame loop (decode, fight/person overlay,
+dashboard, preview, encode) on a video and reports, per stage, how much
+memory each frame allocates above what was live before the stage (the
+tracemalloc peak), once with a fresh frame per cap.read() and once with
+the FramePool used by VideoProcessor. Model inference is not included
+(its tensors are allocated by torch, outside tracemalloc).
+
+Usage:
+    python -m tools.measure_frame_allocations
+    python -m tools.measure_frame_allocations --resolution 1920x1080 --frames 50
+    python -m tools.measure_frame_allocations --video videos/a.avi
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from detection import FightDetector, PersonTracker
+from detection.temporal import TemporalState
+from processing.frame_pool import FramePool
+from processing.preview import PreviewPolicy, PreviewPublisher
+from settings import Settings
+from visualization import draw_advanced_dashboard
+
+
+def make_clip(path, width, height, frames, fps=25):
+    """Write a synthetic clip (moving noise blocks) to path."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    for i in range(frames):
+        writer.write(np.roll(base, 8 * i, axis=1))
+    writer.release()
+
+
+def overlay_state(settings, width, height):
+    """Detectors with a few fight regions and person labels to draw (no models loaded)."""
+    temporal = TemporalState(settings.WINDOW, settings.FIGHT_TRIGGER, settings.GRAPH_HISTORY_SIZE)
+    temporal.region_boxes = np.array([[width // 10, height // 8, width // 3, height // 2],
+                                      [width // 2, height // 4, 3 * width // 4, 3 * height // 4]])
+    temporal.region_confs = np.array([0.82, 0.47])
+    temporal.region_patience = np.array([0, 3])
+
+    fight_detector = FightDetector(state=temporal, settings=settings)
+    person_tracker = PersonTracker(settings=settings)
+    person_tracker.last_labels = [(width // 12 * (i + 1) % width, height // 2 + 20 * (i % 5),
+                                   f"P{i}", i % 3 == 0) for i in range(15)]
+    return temporal, fight_detector, person_tracker
+
+
+def measure(video_path, frames, pooled, settings, pool_size):
+    """
+    Run the frame loop stages over the video.
+
+    Returns:
+        tuple: ({stage: [peak bytes per frame]}, frames measured, fps)
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"❌ Error: Could not open video: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or settings.DEFAULT_FPS
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    temporal, fight_detector, person_tracker = overlay_state(settings, width, height)
+    pool = FramePool(pool_size) if pooled else None
+    publisher = PreviewPublisher(lambda preview, stats: None, PreviewPolicy())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = cv2.VideoWriter(os.path.join(tmp, 'out.avi'), cv2.VideoWriter_fourcc(*'XVID'),
+                                 fps, (width, height))
+        stages = {name: [] for name in ('decode', 'fight overlay', 'person overlay',
+                                        'dashboard', 'preview', 'encode')}
+
+        def run(name, fn):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            result = fn()
+            stages[name].append(tracemalloc.get_traced_memory()[1] - before)
+            return result
+
+        tracemalloc.start()
+        count = 0
+        try:
+            while count < frames:
+                ret, frame = run('decode', lambda: pool.read(cap) if pool else cap.read())
+                if not ret:
+                    break
+                count += 1
+                temporal.push_intensity(0.5)
+                run('fight overlay', lambda: fight_detector.draw(frame))
+                run('person overlay', lambda: person_tracker.draw(frame))
+                run('dashboard', lambda: draw_advanced_dashboard(
+                    frame, 15, 1, 0.82, [0, 3], temporal.graph_history(), settings,
+                    frame_index=count, fps=fps))
+                run('preview', lambda: publisher.offer(frame, {'current_frame': count,
+                                                              'fight_frames': 0}))
+                run('encode', lambda: writer.write(frame))
+        finally:
+            tracemalloc.stop()
+            publisher.close()
+            writer.release()
+            cap.release()
+
+    return stages, count, fps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame allocations of the frame loop")
+    parser.add_argument('--video', help="Source video (default: synthetic clip)")
+    parser.add_argument('--resolution', default='3840x2160',
+                        help="Size of the synthetic clip, WIDTHxHEIGHT")
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--warmup', type=int, default=5,
+                        help="First frames left out of the averages (caches, pool fill)")
+    args = parser.parse_args()
+
+    settings = Settings.from_config()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = args.video
+        if not video_path:
+            width, height = (int(v) for v in args.resolution.lower().split('x'))
+            video_path = os.path.join(tmp, 'clip.avi')
+            make_clip(video_path, width, height, args.frames + args.warmup)
+
+        results = {}
+        for label, pooled in (('cap.read()', False), ('FramePool', True)):
+            stages, count, fps = measure(video_path, args.frames + args.warmup, pooled,
+                                         settings, settings.FRAME_POOL_SIZE)
+            results[label] = {name: np.mean(values[args.warmup:]) if count > args.warmup else 0.0
+                              for name, values in stages.items()}
+
+    print(f"\nAllocated per frame (tracemalloc peak, MB), {count - args.warmup} frames "
+          f"after {args.warmup} warm-up frames")
+    labels = list(results)
+    print(f"{'stage':<18}" + "".join(f"{label:>14}" for label in labels))
+    for name in results[labels[0]]:
+        print(f"{name:<18}" + "".join(f"{results[label][name] / 1e6:>14.2f}" for label in labels))
+    totals = [sum(results[label].values()) for label in labels]
+    print(f"{'total':<18}" + "".join(f"{total / 1e6:>14.2f}" for total in totals))
+    print(f"{'MB/s @ ' + format(fps, '.0f') + ' FPS':<18}"
+          + "".join(f"{total * fps / 1e6:>14.1f}" for total in totals))
+
+
+if __name__ == "__main__":
+    main()
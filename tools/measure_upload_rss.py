@@ -0,0 +1,106 @@
+"""
+Measure peak RSS of the web app's upload/result path.
+
+Simulates what app.py does around processing for a large upload, in a fresh
+process per mode:
+
+    legacy   write uploaded_file.getbuffer(), read the whole result back
+             with f.read() and keep it in session state
+    chunked  copy the upload to disk in chunks, keep only the result path,
+             read the file only when the download is clicked
+
+The upload itself is held in memory by Streamlit in both modes, so it is
+part of the baseline. Processing is replaced by a file copy (output size
+~ input size) so only the I/O path is measured.
+
+Usage:
+    python -m tools.measure_upload_rss --size-mb 500
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import config
+from utils.file_io import copy_stream_to_file, deferred_file
+
+
+def _peak_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_mode(mode, input_path, work_dir):
+    """Executed in the child process."""
+    # Streamlit's in-memory UploadedFile
+    upload = io.BytesIO()
+    with open(input_path, 'rb') as f:
+        shutil.copyfileobj(f, upload, length=config.UPLOAD_CHUNK_SIZE)
+    baseline = _peak_mb()
+
+    saved = os.path.join(work_dir, f'{mode}_input.bin')
+    output = os.path.join(work_dir, f'{mode}_output.bin')
+
+    if mode == 'legacy':
+        with open(saved, 'wb') as f:
+            f.write(upload.getbuffer())
+        shutil.copyfile(saved, output)
+        with open(output, 'rb') as f:
+            session_video = f.read()
+        after_analysis = _peak_mb()
+        download = session_video
+    else:
+        copy_stream_to_file(upload, saved, config.UPLOAD_CHUNK_SIZE)
+        shutil.copyfile(saved, output)
+        session_path = output
+        after_analysis = _peak_mb()
+        with deferred_file(session_path)() as f:
+            download = f.read()
+
+    on_download = _peak_mb()
+    del download
+    return {
+        'baseline_mb': baseline,
+        'analysis_delta_mb': after_analysis - baseline,
+        'download_delta_mb': on_download - baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of the upload/result path")
+    parser.add_argument('--size-mb', type=int, default=500)
+    parser.add_argument('--_child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._child:
+        mode, input_path, work_dir = args._child
+        print(json.dumps(_run_mode(mode, input_path, work_dir)))
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, 'upload.bin')
+        with open(input_path, 'wb') as f:
+            chunk = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(chunk)
+
+        print(f"Input: {args.size_mb} MB")
+        print(f"{'Mode':<10}{'baseline MB':>13}{'+analysis MB':>14}{'+download MB':>14}")
+        for mode in ('legacy', 'chunked'):
+            out = subprocess.run(
+                [sys.executable, '-m', 'tools.measure_upload_rss', '--_child', mode, input_path, work_dir],
+                cwd=config.BASE_DIR, capture_output=True, text=True, check=True
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{mode:<10}{r['baseline_mb']:>13.0f}{r['analysis_delta_mb']:>14.0f}"
+                  f"{r['download_delta_mb']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Build quantized model variants and report accuracy vs speed.
+
+Exports the fight and person models to ONNX, quantizes them to INT8 using
+calibration frames sampled from our own videos (and optionally converts to
+FP16), then runs every variant over the same frames and compares it with the
+full-precision model.
+
+Usage:
+    python -m tools.quantize_models
+    python -m tools.quantize_models --videos videos/a.avi --calib-frames 128 --fp16
+    python -m tools.quantize_models --report-only
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+import config
+from detection.model_variants import variant_path
+from detection.temporal import confirmed_intervals, interval_agreement
+
+
+def sample_frames(video_paths, count):
+    """
+    Sample frames evenly across the given videos (calibration coverage).
+
+    Args:
+        video_paths: List of video paths
+        count: Number of frames to return
+
+    Returns:
+        list: BGR frames
+    """
+    frames = []
+    per_video = max(1, count // max(1, len(video_paths)))
+
+    for path in video_paths:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"❌ Skipping: {path}")
+            continue
+
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            indices = None
+        else:
+            step = max(1, total // per_video)
+            indices = set(range(0, total, step))
+
+        idx = 0
+        taken = 0
+        while taken < per_video and len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if indices is None or idx in indices:
+                frames.append(frame)
+                taken += 1
+            idx += 1
+        cap.release()
+
+    return frames
+
+
+def read_frames(video_path, count):
+    """
+    Yield the first ``count`` frames of a video in order, one at a time.
+
+    Each evaluation reads the clip again instead of holding every frame in
+    memory; decoding is deterministic, so all variants see the same frames.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"❌ Skipping: {video_path}")
+        return
+    try:
+        for _ in range(count):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+
+def letterbox(frame, size):
+    """Resize with unchanged aspect ratio and pad to a square ``size`` input (Ultralytics style)."""
+    h, w = frame.shape[:2]
+    r = min(size / h, size / w)
+    new_w, new_h = int(round(w * r)), int(round(h * r))
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    out = np.full((size, size, 3), 114, dtype=np.uint8)
+    top = (size - new_h) // 2
+    left = (size - new_w) // 2
+    out[top:top + new_h, left:left + new_w] = resized
+    return out
+
+
+def to_input_tensor(frame, size):
+    """BGR frame -> 1x3xSxS float32 RGB tensor in [0, 1]."""
+    img = letterbox(frame, size)[:, :, ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(img, dtype=np.float32)[None] / 255.0
+
+
+class FrameCalibrationReader:
+    """onnxruntime CalibrationDataReader over video frames."""
+
+    def __init__(self, frames, size, input_name):
+        # Converted one at a time as the calibrator asks for them
+        self._inputs = ({input_name: to_input_tensor(f, size)} for f in frames)
+
+    def get_next(self):
+        return next(self._inputs, None)
+
+
+def export_onnx(model_path, imgsz):
+    """Export an Ultralytics checkpoint to a dynamic-shape FP32 ONNX file."""
+    from ultralytics import YOLO
+
+    os.makedirs(config.QUANTIZED_MODEL_DIR, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    target = os.path.join(config.QUANTIZED_MODEL_DIR, f"{stem}_fp32.onnx")
+    if os.path.exists(target):
+        return target
+
+    print(f"📦 Exporting {model_path} to ONNX (imgsz={imgsz})")
+    exported = YOLO(model_path).export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+    shutil.move(str(exported), target)
+    return target
+
+
+def quantize_int8(fp32_path, out_path, frames, imgsz, method):
+    """Quantize an FP32 ONNX model to INT8."""
+    try:
+        import onnxruntime as ort
+        from onnxruntime.quantization import (
+            QuantFormat, QuantType, quantize_dynamic, quantize_static
+        )
+    except ImportError:
+        raise RuntimeError("❌ onnxruntime is required: pip install onnxruntime")
+
+    print(f"🔧 INT8 ({method}) quantization -> {out_path}")
+    if method == 'dynamic':
+        quantize_dynamic(fp32_path, out_path, weight_type=QuantType.QUInt8)
+        return
+
+    input_name = ort.InferenceSession(
+        fp32_path, providers=['CPUExecutionProvider']
+    ).get_inputs()[0].name
+    quantize_static(
+        fp32_path, out_path,
+        FrameCalibrationReader(frames, imgsz, input_name),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+
+
+def convert_fp16(fp32_path, out_path):
+    """Convert an FP32 ONNX model to FP16 weights (FP32 inputs/outputs kept)."""
+    try:
+        import onnx
+        from onnxconverter_common import float16
+    except ImportError:
+        raise RuntimeError("❌ onnx and onnxconverter-common are required for --fp16")
+
+    print(f"🔧 FP16 conversion -> {out_path}")
+    model = float16.convert_float_to_float16(onnx.load(fp32_path), keep_io_types=True)
+    onnx.save(model, out_path)
+
+
+def build_variants(name, model_path, imgsz, frames, method, fp16):
+    """Export and quantize one model, returning the variants available on disk."""
+    fp32_onnx = export_onnx(model_path, imgsz)
+
+    int8_path = variant_path(model_path, 'int8')
+    quantize_int8(fp32_onnx, int8_path, frames, imgsz, method)
+    variants = ['fp32', 'int8']
+
+    if fp16:
+        convert_fp16(fp32_onnx, variant_path(model_path, 'fp16'))
+        variants.append('fp16')
+
+    print(f"✅ {name} variants: {', '.join(variants)}")
+    return variants
+
+
+def _latency_summary(latencies):
+    ms = sorted(t * 1000 for t in latencies)
+    return {
+        'mean_ms': statistics.fmean(ms),
+        'p50_ms': ms[len(ms) // 2],
+        'p95_ms': ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        'fps': 1000 / statistics.fmean(ms),
+    }
+
+
+def evaluate_fight_variant(variant, frames):
+    """Run FightDetector with a variant over frames (any iterable), return flags and latencies."""
+    from detection.fight_detector import FightDetector
+
+    detector = FightDetector(variant=variant)
+    detector.model  # load and warm up outside the timed loop
+    flags, latencies = [], []
+    try:
+        for frame in frames:
+            start = time.perf_counter()
+            frame_has_fight, _, _, _ = detector.detect(frame, draw=False)
+            latencies.append(time.perf_counter() - start)
+            flags.append(frame_has_fight)
+    finally:
+        detector.close()
+    return flags, latencies
+
+
+def evaluate_person_variant(variant, frames):
+    """Run PersonTracker with a variant over frames (any iterable), return counts and latencies."""
+    from detection.person_tracker import PersonTracker
+
+    tracker = PersonTracker(variant=variant)
+    tracker.model  # load and warm up outside the timed loop
+    counts, latencies = [], []
+    try:
+        for frame in frames:
+            start = time.perf_counter()
+            person_count, _ = tracker.track(frame, draw=False)
+            latencies.append(time.perf_counter() - start)
+            counts.append(person_count)
+    finally:
+        tracker.close()
+    return counts, latencies
+
+
+def build_report(video_path, count, fight_variants, person_variants):
+    """Compare every variant against fp32 on the first ``count`` frames of a video."""
+    report = {'frames': 0, 'fight': {}, 'person': {}}
+
+    ref_flags = None
+    ref_intervals = None
+    for variant in fight_variants:
+        print(f"⏱️ Fight model [{variant}]")
+        flags, latencies = evaluate_fight_variant(variant, read_frames(video_path, count))
+        if not flags:
+            raise RuntimeError(f"❌ No evaluation frames could be read from {video_path}")
+        intervals = confirmed_intervals(flags)
+        if ref_flags is None:
+            ref_flags, ref_intervals = flags, intervals
+            report['frames'] = len(flags)
+
+        entry = _latency_summary(latencies)
+        entry['fight_frames'] = sum(flags)
+        entry['fight_frame_agreement'] = \
+            sum(a == b for a, b in zip(ref_flags, flags)) / len(flags)
+        entry['confirmed_intervals'] = intervals
+        entry['interval_agreement'] = interval_agreement(ref_intervals, intervals)
+        report['fight'][variant] = entry
+
+    ref_counts = None
+    for variant in person_variants:
+        print(f"⏱️ Person model [{variant}]")
+        counts, latencies = evaluate_person_variant(variant, read_frames(video_path, count))
+        if ref_counts is None:
+            ref_counts = counts
+
+        entry = _latency_summary(latencies)
+        entry['mean_person_count'] = statistics.fmean(counts)
+        entry['mean_count_abs_diff'] = \
+            statistics.fmean(abs(a - b) for a, b in zip(ref_counts, counts))
+        report['person'][variant] = entry
+
+    return report
+
+
+def print_report(report):
+    print("\n" + "=" * 78)
+    print(f"Accuracy vs speed ({report['frames']} frames, fp32 is the reference)")
+    print("=" * 78)
+
+    print(f"{'Fight':<8}{'mean ms':>10}{'p95 ms':>10}{'FPS':>8}"
+          f"{'frame agr.':>12}{'interval IoU':>14}{'recall':>9}")
+    for variant, e in report['fight'].items():
+        ia = e['interval_agreement']
+        print(f"{variant:<8}{e['mean_ms']:>10.1f}{e['p95_ms']:>10.1f}{e['fps']:>8.1f}"
+              f"{e['fight_frame_agreement']:>12.1%}{ia['frame_iou']:>14.1%}"
+              f"{ia['interval_recall']:>9.1%}")
+
+    print(f"\n{'Person':<8}{'mean ms':>10}{'p95 ms':>10}{'FPS':>8}{'count diff':>12}")
+    for variant, e in report['person'].items():
+        print(f"{variant:<8}{e['mean_ms']:>10.1f}{e['p95_ms']:>10.1f}{e['fps']:>8.1f}"
+              f"{e['mean_count_abs_diff']:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build quantized VAMS model variants")
+    parser.add_argument('--videos', nargs='+', default=config.VIDEO_PATHS,
+                        help="Videos used for calibration and evaluation")
+    parser.add_argument('--calib-frames', type=int, default=64,
+                        help="Frames sampled for INT8 calibration")
+    parser.add_argument('--eval-frames', type=int, default=300,
+                        help="Consecutive frames used for the accuracy/speed report")
+    parser.add_argument('--method', choices=['static', 'dynamic'], default='static',
+                        help="INT8 method: calibrated static QDQ or weight-only dynamic")
+    parser.add_argument('--fp16', action='store_true', help="Also build FP16 variants")
+    parser.add_argument('--person-imgsz', type=int, default=640,
+                        help="Input size used for the person model export")
+    parser.add_argument('--report-only', action='store_true',
+                        help="Skip building, only evaluate variants already on disk")
+    parser.add_argument('--report', default=os.path.join(config.QUANTIZED_MODEL_DIR, 'report.json'),
+                        help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    if args.report_only:
+        fight_variants = ['fp32'] + [v for v in ('int8', 'fp16')
+                                     if os.path.exists(variant_path(config.FIGHT_MODEL_PATH, v))]
+        person_variants = ['fp32'] + [v for v in ('int8', 'fp16')
+                                      if os.path.exists(variant_path(config.PERSON_MODEL_PATH, v))]
+    else:
+        calib = sample_frames(args.videos, args.calib_frames)
+        if not calib:
+            raise RuntimeError("❌ No calibration frames could be read")
+        print(f"🎞️ {len(calib)} calibration frames")
+
+        fight_variants = build_variants("Fight model", config.FIGHT_MODEL_PATH,
+                                        config.IMG_SIZE, calib, args.method, args.fp16)
+        person_variants = build_variants("Person model", config.PERSON_MODEL_PATH,
+                                         args.person_imgsz, calib, args.method, args.fp16)
+
+    report = build_report(args.videos[0], args.eval_frames, fight_variants, person_variants)
+    print_report(report)
+
+    os.makedirs(os.path.dirname(args.report), exist_ok=True)
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Report saved to: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure startup (import) time of the entry points.
+
+Each case runs in a fresh interpreter so nothing is cached between runs.
+The `ultralytics` row is the cost that is now deferred until a model is
+actually loaded, i.e. what every entry point used to pay up front.
+
+Usage:
+    python -m tools.startup_time
+    python -m tools.startup_time --repeats 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import config
+
+_PROBE = (
+    "import json, sys, time\n"
+    "t = time.perf_counter()\n"
+    "{stmt}\n"
+    "print(json.dumps({{'seconds': time.perf_counter() - t, "
+    "'torch': 'torch' in sys.modules}}))\n"
+)
+
+CASES = [
+    ("import processing (main.py / app.py)", "import processing"),
+    ("import detection", "import detection"),
+    ("import visualization", "import visualization"),
+    ("import ultralytics (deferred)", "import ultralytics"),
+]
+
+
+def time_import(stmt):
+    """Run one import in a fresh interpreter, return (seconds, torch_loaded)."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(stmt=stmt)],
+        cwd=config.BASE_DIR, capture_output=True, text=True, check=True
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result['seconds'], result['torch']
+
+
+def time_check():
+    """Wall time of `python main.py --check` (exit code ignored), (seconds, torch_loaded)."""
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, os.path.join(config.BASE_DIR, "main.py"), "--check"],
+                         cwd=config.BASE_DIR, capture_output=True, text=True)
+    return time.perf_counter() - start, 'torch imported: True' in out.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure VAMS startup time")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Case':<40}{'median s':>10}{'torch':>8}")
+    for label, stmt in CASES:
+        runs = [time_import(stmt) for _ in range(args.repeats)]
+        median = statistics.median(r[0] for r in runs)
+        print(f"{label:<40}{median:>10.3f}{'yes' if runs[0][1] else 'no':>8}")
+
+    runs = [time_check() for _ in range(args.repeats)]
+    median = statistics.median(r[0] for r in runs)
+    print(f"{'python main.py --check (wall)':<40}{median:>10.3f}{'yes' if runs[0][1] else 'no':>8}")
+
+
+if __name__ == "__main__":
+    main()
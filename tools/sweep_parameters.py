@@ -0,0 +1,292 @@
+"""
+Sweep the confirmation parameters with a single inference run.
+
+Runs the pipeline once at the lowest CONF_THRESHOLD of the grid and keeps
+the maximum fight confidence of every inference frame (the detection log),
+or reads an existing detection log. Every (CONF_THRESHOLD, WINDOW,
+FIGHT_TRIGGER, MAX_PATIENCE) combination is then evaluated on the whole
+timeline with NumPy sliding-window sums instead of re-running the video:
+
+- a frame has a fight region when one of the last MAX_PATIENCE + 1
+  inference frames had a detection >= CONF_THRESHOLD (current detection or
+  ghost); strided frames carry the last inference frame forward
+- a frame is confirmed when at least FIGHT_TRIGGER of the last WINDOW
+  frames had a fight region, as in TemporalState
+
+Like a run, the videos form one timeline: the window and the ghosts carry
+over from one video to the next. Logs of archive scans (frame ranges) are
+not supported, since those reset the state at every range.
+
+For each combination it prints the confirmed fight frames and intervals,
+and with a label file the frame precision/recall and the share of labelled
+fights found. The motion gate and load shedding are disabled for the
+inference run, since their decisions would depend on the threshold. Higher
+thresholds are applied to the tracked detections of the low-threshold run,
+so tracker-dependent results may differ slightly from a full re-run.
+
+Label file (JSON): labelled fights in seconds per video, keyed by the video
+file name or its index in the input list:
+    {"a.avi": [[12.0, 18.5], [40.2, 44.0]], "b.avi": []}
+
+Usage:
+    python -m tools.sweep_parameters --videos videos/a.avi --labels labels.json
+    python -m tools.sweep_parameters --log detections.jsonl --conf 0.15 0.25 --window 10 15 20
+    python -m tools.sweep_parameters --log detections.jsonl --videos videos/a.avi videos/b.avi --labels labels.json
+    python -m tools.sweep_parameters --videos videos/a.avi --save-log sweep_log.jsonl --output sweep.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import config
+from processing import VideoProcessor
+from processing.detection_log import read_detection_log
+from settings import Settings
+
+
+def sliding_sum(values, window):
+    """
+    Sum of the last ``window`` values (including the current one) along the
+    last axis; frames before the start count as 0.
+    """
+    cumsum = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,), dtype=np.int32)
+    np.cumsum(values, axis=-1, out=cumsum[..., 1:])
+    end = np.arange(1, values.shape[-1] + 1)
+    return cumsum[..., end] - cumsum[..., np.maximum(end - window, 0)]
+
+
+def run_inference(video_paths, conf_threshold, profile, log_path):
+    """Run the pipeline once at conf_threshold and write the detection log."""
+    settings = Settings.from_config(
+        profile,
+        CONF_THRESHOLD=conf_threshold,
+        MOTION_GATE_ENABLED=False,
+        LOAD_SHEDDING_ENABLED=False,
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        processor = VideoProcessor(
+            video_paths=video_paths,
+            output_path=os.path.join(temp_dir, 'sweep.avi'),
+            headless=True,
+            settings=settings,
+            detection_log_path=log_path
+        )
+        start = time.perf_counter()
+        stats = processor.process()
+    print(f"✅ Inference: {stats['total_frames']} frames in {time.perf_counter() - start:.1f}s "
+          f"at CONF_THRESHOLD {conf_threshold}")
+
+
+def load_timeline(log_path):
+    """
+    Timeline of a detection log.
+
+    A run keeps its temporal window and fight regions from one video to
+    the next, so the videos form one timeline (in log order).
+
+    Returns:
+        dict: Per-frame arrays 'conf' (max fight confidence, 0 where nothing
+              was detected), 'inference' (bool), 'source' (video index),
+              'source_frame' and 'time' (s)
+    """
+    records = read_detection_log(log_path)
+    return {
+        'conf': np.array([r['max_conf'] for r in records], dtype=np.float32),
+        'inference': np.array([r.get('inference', 1) for r in records], dtype=bool),
+        'source': np.array([r.get('source', 0) for r in records], dtype=int),
+        'source_frame': np.array([r['source_frame'] for r in records], dtype=int),
+        'time': np.array([r['time'] for r in records], dtype=np.float64),
+    }
+
+
+def load_labels(path, timeline, video_paths):
+    """
+    Labelled fights of a label file on the timeline.
+
+    Returns:
+        tuple: (per-frame bool flags, (N, 2) array of labelled (start, end)
+               timeline intervals)
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    names = [os.path.basename(p) for p in video_paths or []]
+    flags = np.zeros(len(timeline['conf']), dtype=bool)
+    intervals = []
+    for source in np.unique(timeline['source']).tolist():
+        spans = data.get(str(source))
+        if spans is None and source < len(names):
+            spans = data.get(names[source], data.get(video_paths[source]))
+        if spans is None:
+            raise ValueError(f"❌ No labels for video {names[source] if source < len(names) else source}")
+
+        frames = np.flatnonzero(timeline['source'] == source)
+        times = timeline['time'][frames]
+        for start_s, end_s in spans:
+            inside = frames[(times >= start_s) & (times <= end_s)]
+            if len(inside):
+                flags[inside] = True
+                intervals.append((inside[0], inside[-1]))
+    return flags, np.array(intervals, dtype=int).reshape(-1, 2)
+
+
+def _intervals(flags, source):
+    """
+    Inclusive (start, end) intervals of a bool array, as an (N, 2) array.
+    Intervals are split where the video changes.
+    """
+    same = source[1:] == source[:-1]
+    starts = flags & ~np.concatenate(([False], flags[:-1] & same))
+    ends = flags & ~np.concatenate((flags[1:] & same, [False]))
+    return np.stack((np.flatnonzero(starts), np.flatnonzero(ends)), axis=1)
+
+
+def _overlapping(intervals, others):
+    """Number of intervals that overlap any of the others."""
+    if not len(intervals) or not len(others):
+        return 0
+    overlap = (intervals[:, None, 0] <= others[None, :, 1]) & (others[None, :, 0] <= intervals[:, None, 1])
+    return int(overlap.any(axis=1).sum())
+
+
+def sweep(timeline, thresholds, windows, triggers, patiences, labels=None):
+    """
+    Evaluate every parameter combination on the timeline.
+
+    The thresholds and triggers of one (WINDOW, MAX_PATIENCE) pair are
+    evaluated together as one (triggers x thresholds x frames) array.
+
+    Args:
+        timeline: Output of load_timeline()
+        thresholds, windows, triggers, patiences: Values to combine
+            (combinations with trigger > window are skipped)
+        labels: Optional output of load_labels()
+
+    Returns:
+        list: One dict per combination with its counts, metrics and
+              confirmed intervals ([video, start frame, end frame, start s, end s])
+    """
+    thresholds = np.unique(np.asarray(thresholds, dtype=np.float32))
+    windows, triggers, patiences = (sorted(set(v)) for v in (windows, triggers, patiences))
+
+    inference = np.flatnonzero(timeline['inference'])
+    # Inference frame whose results each frame shows (strided frames carry
+    # the last one forward)
+    shown = np.maximum(np.cumsum(timeline['inference']) - 1, 0)
+    detected = timeline['conf'][inference][None, :] >= thresholds[:, None]
+
+    source, source_frame, times = timeline['source'], timeline['source_frame'], timeline['time']
+    rows = []
+    for patience in patiences:
+        region = sliding_sum(detected, patience + 1)[:, shown] > 0
+        for window in windows:
+            counts = sliding_sum(region, window)
+            valid = [t for t in triggers if 0 < t <= window]
+            confirmed = counts[None, :, :] >= np.asarray(valid)[:, None, None]
+            fight_frames = confirmed.sum(axis=-1)
+            if labels:
+                true_frames = (confirmed & labels[0]).sum(axis=-1)
+
+            for (k, trigger), (j, threshold) in itertools.product(enumerate(valid), enumerate(thresholds)):
+                found = _intervals(confirmed[k, j], source)
+                row = {
+                    'CONF_THRESHOLD': round(float(threshold), 4), 'WINDOW': window,
+                    'FIGHT_TRIGGER': trigger, 'MAX_PATIENCE': patience,
+                    'fight_frames': int(fight_frames[k, j]),
+                    'intervals': [
+                        frames + seconds for frames, seconds in zip(
+                            np.stack((source[found[:, 0]], source_frame[found[:, 0]],
+                                      source_frame[found[:, 1]]), axis=1).tolist(),
+                            np.round(times[found], 3).tolist())
+                    ],
+                }
+
+                if labels:
+                    label_flags, label_intervals = labels
+                    tp, predicted, labelled = int(true_frames[k, j]), row['fight_frames'], int(label_flags.sum())
+                    row['precision'] = tp / predicted if predicted else 1.0
+                    row['recall'] = tp / labelled if labelled else 1.0
+                    total = row['precision'] + row['recall']
+                    row['f1'] = 2 * row['precision'] * row['recall'] / total if total else 0.0
+                    row['interval_recall'] = _overlapping(label_intervals, found) / len(label_intervals) \
+                        if len(label_intervals) else 1.0
+                    row['interval_precision'] = _overlapping(found, label_intervals) / len(found) \
+                        if len(found) else 1.0
+                rows.append(row)
+    return rows
+
+
+def print_table(rows, labelled, top):
+    """Print the combinations, best first when labels are given."""
+    if labelled:
+        rows = sorted(rows, key=lambda r: (r['f1'], r['recall']), reverse=True)
+    if top:
+        rows = rows[:top]
+
+    header = f"{'conf':>6}{'window':>8}{'trigger':>9}{'patience':>10}{'frames':>8}{'intervals':>11}"
+    if labelled:
+        header += f"{'precision':>11}{'recall':>8}{'f1':>7}{'found':>7}"
+    print(header)
+
+    for r in rows:
+        line = (f"{r['CONF_THRESHOLD']:>6.2f}{r['WINDOW']:>8}{r['FIGHT_TRIGGER']:>9}"
+                f"{r['MAX_PATIENCE']:>10}{r['fight_frames']:>8}{len(r['intervals']):>11}")
+        if labelled:
+            line += (f"{r['precision']:>11.3f}{r['recall']:>8.3f}{r['f1']:>7.3f}"
+                     f"{r['interval_recall']:>7.0%}")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep CONF_THRESHOLD, WINDOW, FIGHT_TRIGGER and MAX_PATIENCE")
+    parser.add_argument('--videos', nargs='+',
+                        help="Videos to run inference on (default: config.VIDEO_PATHS); with --log, "
+                             "the videos of the log, to match label file names")
+    parser.add_argument('--log', help="Existing detection log to sweep instead of running inference; "
+                                      "its CONF_THRESHOLD must not exceed the lowest --conf")
+    parser.add_argument('--profile', choices=list(config.PERFORMANCE_PROFILES), default=None,
+                        help="Performance profile of the inference run")
+    parser.add_argument('--conf', nargs='+', type=float, default=[0.1, 0.15, 0.2, 0.25, 0.3, 0.4])
+    parser.add_argument('--window', nargs='+', type=int, default=[10, 15, 20, 30])
+    parser.add_argument('--trigger', nargs='+', type=int, default=[3, 4, 6, 8, 10])
+    parser.add_argument('--patience', nargs='+', type=int, default=[0, 5, 10, 20])
+    parser.add_argument('--labels', help="JSON file with labelled fights (see module docstring)")
+    parser.add_argument('--save-log', help="Keep the detection log of the inference run here")
+    parser.add_argument('--output', help="Write every combination with its intervals to this JSON file")
+    parser.add_argument('--top', type=int, default=20, help="Rows to print (0 = all)")
+    args = parser.parse_args()
+
+    video_paths = args.videos or (None if args.log else config.VIDEO_PATHS)
+
+    if args.log:
+        log_path = args.log
+        timeline = load_timeline(log_path)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = args.save_log or os.path.join(temp_dir, 'sweep_log.jsonl')
+            run_inference(video_paths, min(args.conf), args.profile, log_path)
+            timeline = load_timeline(log_path)
+
+    labels = load_labels(args.labels, timeline, video_paths) if args.labels else None
+
+    start = time.perf_counter()
+    rows = sweep(timeline, args.conf, args.window, args.trigger, args.patience, labels)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Evaluated {len(rows)} combinations on {len(timeline['conf'])} frames in {elapsed:.2f}s")
+    print_table(rows, labels is not None, args.top)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+        print(f"✅ Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 """
 Utils package for fight detection system.
-Provides drawing and geometry utilities.
+Provides drawing, label sprite and geometry utilities.
 """
 
 from .drawing import draw_text_with_background
-from .geometry import check_overlap, point_in_box
+from .sprites import SpriteCache, blit_sprites, default_sprite_cache
+from .geometry import check_overlap, point_in_box, box_centers, points_in_boxes, boxes_overlap, box_iou
 
 __all__ = [
     'draw_text_with_background',
+    'SpriteCache',
+    'blit_sprites',
+    'default_sprite_cache',
     'check_overlap',
     'point_in_box',
+    'box_centers',
+    'points_in_boxes',
+    'boxes_overlap',
+    'box_iou',
 ]
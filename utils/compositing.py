@@ -0,0 +1,117 @@
+"""
+Alpha compositing core.
+Applies premultiplied BGRA layers to BGR uint8 frames in fixed-point
+arithmetic, in place and only over the layer's region of interest:
+
+    out = dst * (255 - a) / 255 + premul,    premul = color * a / 255
+
+All translucent drawing (panels, shadows, glows, labels, watermark) goes
+through composite() or composite_pixels().
+"""
+
+import cv2
+import numpy as np
+
+_INV_255 = 1.0 / 255
+
+
+class Layer:
+    """
+    A premultiplied BGRA layer.
+
+    Stored as two uint8 (H, W, 3) planes: the premultiplied color and the
+    inverse alpha replicated per channel, so compositing is one in-place
+    multiply and one in-place add on the frame ROI with no temporaries.
+    """
+
+    __slots__ = ('premul', 'inv_alpha')
+
+    def __init__(self, premul, inv_alpha):
+        self.premul = premul
+        self.inv_alpha = inv_alpha
+
+    @property
+    def shape(self):
+        return self.premul.shape[:2]
+
+    @classmethod
+    def from_bgra(cls, bgra):
+        """Layer from a BGRA image with straight (non-premultiplied) alpha."""
+        alpha = bgra[:, :, 3:4].astype(np.uint16)
+        premul = ((bgra[:, :, :3] * alpha + 127) // 255).astype(np.uint8)
+        inv_alpha = np.repeat(255 - bgra[:, :, 3:4], 3, axis=2)
+        return cls(premul, inv_alpha)
+
+    @classmethod
+    def from_mask(cls, mask, color, alpha=1.0):
+        """
+        Solid color layer.
+
+        Args:
+            mask: (H, W) uint8 coverage (255 = fully covered, anti-aliased
+                  edges in between)
+            color: BGR color
+            alpha: Opacity of the color (0-1)
+        """
+        coverage = mask if alpha >= 1.0 else \
+            cv2.convertScaleAbs(mask, alpha=alpha)  # round(mask * alpha)
+        coverage = cv2.merge((coverage, coverage, coverage))
+        premul = cv2.multiply(coverage, tuple(float(c) for c in color) + (0.0,), scale=_INV_255)
+        inv_alpha = cv2.bitwise_not(coverage, dst=coverage)  # 255 - coverage
+        return cls(premul, inv_alpha)
+
+    @classmethod
+    def from_blend(cls, scale, offset):
+        """
+        Layer from a float blend out = img * scale + offset.
+
+        Args:
+            scale: (H, W, 1) remaining weight of the background (0-1)
+            offset: (H, W, 3) color added on top (0-255)
+        """
+        inv_alpha = np.repeat(np.rint(scale * 255).astype(np.uint8), 3, axis=2)
+        premul = np.rint(offset).astype(np.uint8)
+        return cls(premul, inv_alpha)
+
+
+def composite(img, layer, x=0, y=0):
+    """
+    Composite a layer onto img in place.
+
+    Args:
+        img: BGR uint8 image
+        layer: Layer
+        x, y: Position of the layer's top-left corner in img (may be
+              partly or fully outside; the layer is clipped)
+    """
+    layer_h, layer_w = layer.shape
+    img_h, img_w = img.shape[:2]
+
+    gx1, gy1 = max(x, 0), max(y, 0)
+    gx2, gy2 = min(x + layer_w, img_w), min(y + layer_h, img_h)
+    if gx2 <= gx1 or gy2 <= gy1:
+        return
+    lx, ly = gx1 - x, gy1 - y
+    h, w = gy2 - gy1, gx2 - gx1
+
+    roi = img[gy1:gy2, gx1:gx2]
+    cv2.multiply(roi, layer.inv_alpha[ly:ly + h, lx:lx + w], dst=roi, scale=_INV_255)
+    cv2.add(roi, layer.premul[ly:ly + h, lx:lx + w], dst=roi)
+
+
+def composite_pixels(img, ys, xs, premul, inv_alpha):
+    """
+    Composite scattered pixels onto img in place (same arithmetic as composite()).
+
+    Args:
+        img: BGR uint8 image
+        ys, xs: (N,) pixel coordinates, inside img and without duplicates
+        premul: (N, 3) uint8 premultiplied colors
+        inv_alpha: (N, 1) or (N, 3) uint8 inverse alphas
+    """
+    dst = img[ys, xs].astype(np.uint16)
+    dst *= inv_alpha
+    dst += 127
+    dst //= 255
+    dst += premul
+    img[ys, xs] = np.minimum(dst, 255)
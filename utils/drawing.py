@@ -1,7 +1,10 @@
 
+import functools
+
 import cv2
 import numpy as np
 import config
+from .compositing import Layer, composite
 
 
 def draw_rounded_rectangle(img, pt1, pt2, color, thickness=-1, radius=15, alpha=1.0):
@@ -17,42 +20,62 @@ def draw_rounded_rectangle(img, pt1, pt2, color, thickness=-1, radius=15, alpha=
         radius: Corner radius
         alpha: Transparency (0-1)
     """
+    if alpha >= 1.0:
+        _rounded_rectangle_shape(img, pt1, pt2, color, thickness, radius)
+        return
+
+    # Translucent: draw the shape into a coverage mask of its bounding box
+    # and composite only that region
     x1, y1 = pt1
     x2, y2 = pt2
-
-    # Create overlay for transparency
-    if alpha < 1.0:
-        overlay = img.copy()
+    margin = max(thickness, 0) + 1
+    ox, oy = min(x1, x2) - margin, min(y1, y2) - margin
+    height, width = abs(y2 - y1) + 2 * margin + 1, abs(x2 - x1) + 2 * margin + 1
+
+    # An outline only covers a band along the edges (corners included), so
+    # large outlines are composited as four strips instead of the whole box
+    band = radius + 2 * margin
+    if thickness >= 0 and min(width, height) > 4 * band:
+        strips = [(0, 0, width, band), (0, height - band, width, band),
+                  (0, band, band, height - 2 * band), (width - band, band, band, height - 2 * band)]
     else:
-        overlay = img
+        strips = [(0, 0, width, height)]
+
+    for sx, sy, sw, sh in strips:
+        mask = np.zeros((sh, sw), dtype=np.uint8)
+        _rounded_rectangle_shape(mask, (x1 - ox - sx, y1 - oy - sy), (x2 - ox - sx, y2 - oy - sy),
+                                 255, thickness, radius)
+        composite(img, Layer.from_mask(mask, color, alpha), ox + sx, oy + sy)
+
+
+def _rounded_rectangle_shape(img, pt1, pt2, color, thickness, radius):
+    """Draw an opaque rounded rectangle (filled or outline)."""
+    x1, y1 = pt1
+    x2, y2 = pt2
 
     # Draw rectangles and circles for rounded corners
     if thickness == -1:  # Filled
         # Main rectangles
-        cv2.rectangle(overlay, (x1 + radius, y1), (x2 - radius, y2), color, -1)
-        cv2.rectangle(overlay, (x1, y1 + radius), (x2, y2 - radius), color, -1)
+        cv2.rectangle(img, (x1 + radius, y1), (x2 - radius, y2), color, -1)
+        cv2.rectangle(img, (x1, y1 + radius), (x2, y2 - radius), color, -1)
 
         # Corner circles
-        cv2.circle(overlay, (x1 + radius, y1 + radius), radius, color, -1)
-        cv2.circle(overlay, (x2 - radius, y1 + radius), radius, color, -1)
-        cv2.circle(overlay, (x1 + radius, y2 - radius), radius, color, -1)
-        cv2.circle(overlay, (x2 - radius, y2 - radius), radius, color, -1)
+        cv2.circle(img, (x1 + radius, y1 + radius), radius, color, -1)
+        cv2.circle(img, (x2 - radius, y1 + radius), radius, color, -1)
+        cv2.circle(img, (x1 + radius, y2 - radius), radius, color, -1)
+        cv2.circle(img, (x2 - radius, y2 - radius), radius, color, -1)
     else:  # Outline
         # Draw lines
-        cv2.line(overlay, (x1 + radius, y1), (x2 - radius, y1), color, thickness)
-        cv2.line(overlay, (x1 + radius, y2), (x2 - radius, y2), color, thickness)
-        cv2.line(overlay, (x1, y1 + radius), (x1, y2 - radius), color, thickness)
-        cv2.line(overlay, (x2, y1 + radius), (x2, y2 - radius), color, thickness)
+        cv2.line(img, (x1 + radius, y1), (x2 - radius, y1), color, thickness)
+        cv2.line(img, (x1 + radius, y2), (x2 - radius, y2), color, thickness)
+        cv2.line(img, (x1, y1 + radius), (x1, y2 - radius), color, thickness)
+        cv2.line(img, (x2, y1 + radius), (x2, y2 - radius), color, thickness)
 
         # Corner arcs
-        cv2.ellipse(overlay, (x1 + radius, y1 + radius), (radius, radius), 180, 0, 90, color, thickness)
-        cv2.ellipse(overlay, (x2 - radius, y1 + radius), (radius, radius), 270, 0, 90, color, thickness)
-        cv2.ellipse(overlay, (x1 + radius, y2 - radius), (radius, radius), 90, 0, 90, color, thickness)
-        cv2.ellipse(overlay, (x2 - radius, y2 - radius), (radius, radius), 0, 0, 90, color, thickness)
-
-    # Apply transparency
-    if alpha < 1.0:
-        cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+        cv2.ellipse(img, (x1 + radius, y1 + radius), (radius, radius), 180, 0, 90, color, thickness)
+        cv2.ellipse(img, (x2 - radius, y1 + radius), (radius, radius), 270, 0, 90, color, thickness)
+        cv2.ellipse(img, (x1 + radius, y2 - radius), (radius, radius), 90, 0, 90, color, thickness)
+        cv2.ellipse(img, (x2 - radius, y2 - radius), (radius, radius), 0, 0, 90, color, thickness)
 
 
 def draw_shadow_rectangle(img, pt1, pt2, color, shadow_offset=5, radius=15, alpha=0.85):
@@ -116,7 +139,8 @@ def draw_text_with_outline(img, text, pos, font=cv2.FONT_HERSHEY_SIMPLEX,
 def draw_text_with_background(img, text, pos, font=cv2.FONT_HERSHEY_SIMPLEX,
                               font_scale=0.6, text_color=(255, 255, 255),
                               bg_color=(45, 45, 45), thickness=2,
-                              padding=10, radius=8, alpha=0.9):
+                              padding=10, radius=8, alpha=0.9, shadow=None, shadow_offset=None,
+                              settings=None):
     """
     Enhanced text drawing with rounded background and padding.
 
@@ -132,7 +156,16 @@ def draw_text_with_background(img, text, pos, font=cv2.FONT_HERSHEY_SIMPLEX,
         padding: Padding around text
         radius: Corner radius
         alpha: Background transparency
+        shadow: Draw a drop shadow (defaults to SHADOW_ENABLED of settings)
+        shadow_offset: Shadow offset (defaults to PANEL_SHADOW_OFFSET of settings)
+        settings: Per-run Settings for the defaults (config.py values by default)
     """
+    s = settings or config
+    if shadow is None:
+        shadow = s.SHADOW_ENABLED
+    if shadow_offset is None:
+        shadow_offset = s.PANEL_SHADOW_OFFSET
+
     x, y = pos
     (text_w, text_h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
 
@@ -142,9 +175,9 @@ def draw_text_with_background(img, text, pos, font=cv2.FONT_HERSHEY_SIMPLEX,
     bg_x2 = x + text_w + padding
     bg_y2 = y + padding
 
-    if config.SHADOW_ENABLED:
+    if shadow:
         draw_shadow_rectangle(img, (bg_x1, bg_y1), (bg_x2, bg_y2), bg_color,
-                            shadow_offset=config.PANEL_SHADOW_OFFSET,
+                            shadow_offset=shadow_offset,
                             radius=radius, alpha=alpha)
     else:
         draw_rounded_rectangle(img, (bg_x1, bg_y1), (bg_x2, bg_y2), bg_color, -1, radius, alpha)
@@ -184,6 +217,57 @@ def draw_glow_effect(img, pt1, pt2, color, intensity=20, radius=15):
         )
 
 
+@functools.lru_cache(maxsize=64)
+def _glow_layer(width, height, color, intensity, radius):
+    """
+    Glow of draw_glow_effect() precomputed as one premultiplied layer,
+    so it can be applied to any background in one pass over the glow area.
+
+    Returns:
+        tuple: (margin, Layer) or None if empty
+    """
+    if intensity <= 0:
+        return None
+
+    # Layers reach `intensity` pixels out, plus the line thickness
+    margin = intensity + 2
+    layer_h = height + 2 * margin + 1
+    layer_w = width + 2 * margin + 1
+    scale = np.ones((layer_h, layer_w, 1), dtype=np.float32)
+    offset = np.zeros((layer_h, layer_w, 3), dtype=np.float32)
+    glow_color = np.array([int(c * 0.8) for c in color], dtype=np.float32)
+
+    # Fold the successive translucent outlines into out = img * scale + offset
+    x1, y1 = margin, margin
+    x2, y2 = margin + width, margin + height
+    mask = np.zeros((layer_h, layer_w), dtype=np.uint8)
+    for i in range(intensity, 0, -2):
+        alpha = 0.05 * (intensity - i) / intensity
+        mask[:] = 0
+        _rounded_rectangle_shape(mask, (x1 - i, y1 - i), (x2 + i, y2 + i), 255, 2, radius + i)
+        stroke = mask > 0
+        scale[stroke] *= 1 - alpha
+        offset[stroke] = offset[stroke] * (1 - alpha) + glow_color * alpha
+
+    return margin, Layer.from_blend(scale, offset)
+
+
+def draw_cached_glow(img, pt1, pt2, color, intensity=20, radius=15):
+    """
+    Same glow as draw_glow_effect(), rendered from a cached layer.
+
+    The layer is computed once per (size, color, intensity, radius) and
+    only blends the glow area instead of drawing every outline.
+    """
+    x1, y1 = pt1
+    x2, y2 = pt2
+    layer = _glow_layer(x2 - x1, y2 - y1, tuple(color), intensity, radius)
+    if layer is None:
+        return
+    margin, glow = layer
+    composite(img, glow, x1 - margin, y1 - margin)
+
+
 def draw_watermark(img, text="VAMS", position="bottom-right", alpha=0.3):
     """
     Draw a watermark on the image.
@@ -199,7 +283,7 @@ def draw_watermark(img, text="VAMS", position="bottom-right", alpha=0.3):
     font_scale = 1.5
     thickness = 3
 
-    (text_w, text_h), _ = cv2.getTextSize(text, font, font_scale, thickness)
+    (text_w, text_h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
 
     # Calculate position
     margin = 20
@@ -212,7 +296,9 @@ def draw_watermark(img, text="VAMS", position="bottom-right", alpha=0.3):
     else:  # bottom-right
         pos = (w - text_w - margin, h - margin)
 
-    # Draw watermark with transparency
-    overlay = img.copy()
-    cv2.putText(overlay, text, pos, font, font_scale, (200, 200, 200), thickness, cv2.LINE_AA)
-    cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+    # Draw watermark with transparency: text coverage mask over its box only
+    margin = thickness + 2
+    ox, oy = pos[0] - margin, pos[1] - text_h - margin
+    mask = np.zeros((text_h + baseline + 2 * margin, text_w + 2 * margin), dtype=np.uint8)
+    cv2.putText(mask, text, (margin, text_h + margin), font, font_scale, 255, thickness, cv2.LINE_AA)
+    composite(img, Layer.from_mask(mask, (200, 200, 200), alpha), ox, oy)
@@ -0,0 +1,57 @@
+"""
+File helpers for large uploads and outputs.
+Copy streams in fixed-size chunks so a video never has to be held in memory
+twice, and hand files to consumers lazily.
+"""
+
+import glob
+import os
+import shutil
+import time
+
+
+def copy_stream_to_file(stream, path, chunk_size=8 * 1024 * 1024):
+    """
+    Copy a file-like object to disk in chunks.
+
+    Args:
+        stream: Readable binary file-like object (e.g. a Streamlit UploadedFile)
+        path: Destination path
+        chunk_size: Bytes per read
+
+    Returns:
+        int: Bytes written
+    """
+    if hasattr(stream, 'seek'):
+        stream.seek(0)
+    with open(path, 'wb') as f:
+        shutil.copyfileobj(stream, f, length=chunk_size)
+        return f.tell()
+
+
+def deferred_file(path):
+    """
+    Callable that opens ``path`` only when invoked.
+
+    Used as ``st.download_button(data=...)`` so the file is read when the
+    user clicks download instead of on every script run.
+    """
+    def _open():
+        return open(path, 'rb')
+    return _open
+
+
+def prune_stale_dirs(pattern, max_age_seconds):
+    """
+    Delete directories matching ``pattern`` not modified for ``max_age_seconds``.
+
+    Returns:
+        int: Number of directories removed
+    """
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for path in glob.glob(pattern):
+        if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
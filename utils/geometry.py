@@ -1,3 +1,4 @@
+import numpy as np
 
 
 def check_overlap(box1, box2):
@@ -16,3 +17,79 @@ def point_in_box(point, box):
     px, py = point
     x1, y1, x2, y2 = box
     return x1 <= px <= x2 and y1 <= py <= y2
+
+
+def box_centers(boxes):
+    """
+    Integer centre points of boxes.
+
+    Args:
+        boxes: (N, 4) array of x1, y1, x2, y2
+
+    Returns:
+        np.ndarray: (N, 2) int array of cx, cy
+    """
+    boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+    return np.stack(((boxes[:, 0] + boxes[:, 2]) // 2,
+                     (boxes[:, 1] + boxes[:, 3]) // 2), axis=1)
+
+
+def points_in_boxes(points, boxes):
+    """
+    Array version of point_in_box.
+
+    Args:
+        points: (P, 2) array of x, y
+        boxes: (B, 4) array of x1, y1, x2, y2
+
+    Returns:
+        np.ndarray: (P, B) bool matrix, True where point p lies inside box b
+    """
+    points = np.asarray(points).reshape(-1, 2)
+    boxes = np.asarray(boxes).reshape(-1, 4)
+
+    px = points[:, 0:1]
+    py = points[:, 1:2]
+    return (boxes[:, 0] <= px) & (px <= boxes[:, 2]) & \
+           (boxes[:, 1] <= py) & (py <= boxes[:, 3])
+
+
+def boxes_overlap(boxes_a, boxes_b):
+    """
+    Array version of check_overlap.
+
+    Args:
+        boxes_a: (A, 4) array of x1, y1, x2, y2
+        boxes_b: (B, 4) array of x1, y1, x2, y2
+
+    Returns:
+        np.ndarray: (A, B) bool matrix, True where the boxes intersect
+    """
+    a = np.asarray(boxes_a).reshape(-1, 1, 4)
+    b = np.asarray(boxes_b).reshape(1, -1, 4)
+    return ~((a[..., 0] > b[..., 2]) | (a[..., 2] < b[..., 0]) |
+             (a[..., 1] > b[..., 3]) | (a[..., 3] < b[..., 1]))
+
+
+def box_iou(boxes_a, boxes_b):
+    """
+    Intersection over union of every pair of boxes.
+
+    Args:
+        boxes_a: (A, 4) array of x1, y1, x2, y2
+        boxes_b: (B, 4) array of x1, y1, x2, y2
+
+    Returns:
+        np.ndarray: (A, B) float matrix
+    """
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(1, -1, 4)
+
+    iw = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    ih = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = iw * ih
+
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
@@ -0,0 +1,174 @@
+"""
+Streaming media server for the web app.
+Serves result videos straight from disk over HTTP, with byte ranges so the
+browser can seek, instead of loading whole files into server memory the way
+st.video(path) does.
+"""
+
+import mimetypes
+import os
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlsplit
+
+
+def media_type(path):
+    """MIME type of a file from its extension (application/octet-stream if unknown)."""
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def parse_range(header, size):
+    """
+    Byte range of a Range header.
+
+    Args:
+        header: Value of the Range header (None if absent)
+        size: File size in bytes
+
+    Returns:
+        tuple: Inclusive (start, end), or None for the whole file
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', (header or '').strip())
+    if not match or match.groups() == ('', ''):
+        # No range, or a form not supported here (several ranges): whole file
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, end
+
+
+class MediaServer:
+    """
+    Serves registered files at /<token>/<file name> on a background thread.
+
+    Only files passed to register() are reachable, under a random token, and
+    only until they are forgotten or deleted.
+    """
+
+    def __init__(self, host='0.0.0.0', port=0, chunk_size=1024 * 1024):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 = any free port)
+            chunk_size: Bytes read from disk per write to the client
+        """
+        self.chunk_size = chunk_size
+        self._files = {}  # token -> path
+        self._lock = threading.Lock()
+
+        self._httpd = ThreadingHTTPServer((host, port), _MediaHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.media = self
+        self.port = self._httpd.server_address[1]
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name="vams-media", daemon=True)
+        self._thread.start()
+
+    def register(self, path):
+        """
+        Make a file reachable.
+
+        Returns:
+            str: URL path of the file (append to the server's base URL)
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            token = next((t for t, p in self._files.items() if p == path), None)
+            if token is None:
+                token = secrets.token_urlsafe(16)
+                self._files[token] = path
+        return f"/{token}/{quote(os.path.basename(path))}"
+
+    def forget(self, path):
+        """Stop serving a file, or every file under a directory."""
+        path = os.path.abspath(path)
+        with self._lock:
+            for token, served in list(self._files.items()):
+                if served == path or served.startswith(path + os.sep):
+                    del self._files[token]
+
+    def lookup(self, url_path):
+        """File registered under the token of a request path, or None."""
+        token = urlsplit(url_path).path.lstrip('/').split('/', 1)[0]
+        with self._lock:
+            return self._files.get(token)
+
+    def close(self):
+        """Stop the server."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class _MediaHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body):
+        media = self.server.media
+        path = media.lookup(self.path)
+        if path is None or not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(path)
+        try:
+            byte_range = parse_range(self.headers.get('Range'), size)
+        except ValueError:
+            self.send_response(416)
+            self.send_header('Content-Range', f"bytes */{size}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        start, end = byte_range or (0, size - 1)
+        self.send_response(206 if byte_range else 200)
+        self.send_header('Content-Type', media_type(path))
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        if byte_range:
+            self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        # The player page is served by Streamlit from another origin
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        if not send_body:
+            return
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            try:
+                _copy_bytes(f, self.wfile, end - start + 1, media.chunk_size)
+            except (BrokenPipeError, ConnectionResetError):
+                # The browser dropped the request (seek, pause, page closed)
+                pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _copy_bytes(src, dst, length, chunk_size):
+    """Copy length bytes from src to dst in chunks."""
+    while length > 0:
+        chunk = src.read(min(chunk_size, length))
+        if not chunk:
+            break
+        dst.write(chunk)
+        length -= len(chunk)
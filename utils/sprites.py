@@ -0,0 +1,186 @@
+"""
+Label sprites.
+Labels rendered once into BGRA tiles, cached by text and style, and
+composited onto frames with vectorized alpha blends.
+"""
+
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+import config
+from .compositing import Layer, composite_pixels
+from .drawing import draw_text_with_background
+from .geometry import boxes_overlap
+
+
+class Sprite:
+    """
+    A rendered label.
+
+    The BGRA tile is kept for inspection; blitting uses only the pixels with
+    non-zero alpha, stored as coordinates plus their premultiplied layer values.
+    """
+
+    __slots__ = ('bgra', 'anchor', 'ys', 'xs', 'premul', 'inv_alpha')
+
+    def __init__(self, bgra, anchor):
+        """
+        Args:
+            bgra: (H, W, 4) uint8 tile with straight alpha
+            anchor: (dx, dy) of the tile's top-left corner relative to the
+                    text origin passed to draw_text_with_background
+        """
+        self.bgra = bgra
+        self.anchor = anchor
+
+        layer = Layer.from_bgra(bgra)
+        ys, xs = np.nonzero(bgra[:, :, 3])
+        self.ys = ys.astype(np.int32)
+        self.xs = xs.astype(np.int32)
+        self.premul = layer.premul[ys, xs]
+        self.inv_alpha = layer.inv_alpha[ys, xs, :1]
+
+    @property
+    def size(self):
+        """(width, height) of the tile."""
+        return self.bgra.shape[1], self.bgra.shape[0]
+
+
+def render_label_sprite(text, font_scale=0.6, text_color=(255, 255, 255),
+                        bg_color=(45, 45, 45), thickness=2, padding=10, radius=8,
+                        alpha=0.9, shadow=True, shadow_offset=5):
+    """
+    Render a draw_text_with_background() label into a Sprite.
+
+    The label is drawn on a black and on a white tile; alpha and color are
+    recovered from the difference, so every translucent layer of the label
+    (shadow, background, outline) ends up in one BGRA tile.
+    """
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (text_w, text_h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+
+    # Tile covers background, shadow and text outline with a small margin
+    margin = thickness + 2
+    left = padding + margin
+    top = text_h + padding + margin
+    width = left + text_w + padding + shadow_offset + margin
+    height = top + max(padding, baseline) + shadow_offset + margin
+
+    tiles = []
+    for value in (0, 255):
+        tile = np.full((height, width, 3), value, dtype=np.uint8)
+        draw_text_with_background(tile, text, (left, top), font, font_scale, text_color,
+                                  bg_color, thickness, padding, radius, alpha,
+                                  shadow=shadow, shadow_offset=shadow_offset)
+        tiles.append(tile.astype(np.float32))
+    on_black, on_white = tiles
+
+    # on_black = a * c, on_white = a * c + (1 - a) * 255
+    a = 1.0 - (on_white - on_black).max(axis=2) / 255.0
+    a = np.clip(a, 0.0, 1.0)
+    color = np.where(a[..., None] > 0, on_black / np.maximum(a[..., None], 1e-6), 0)
+
+    bgra = np.empty((height, width, 4), dtype=np.uint8)
+    bgra[:, :, :3] = np.clip(color + 0.5, 0, 255)
+    bgra[:, :, 3] = np.clip(a * 255 + 0.5, 0, 255)
+    return Sprite(bgra, (-left, -top))
+
+
+class SpriteCache:
+    """Thread-safe LRU cache of label sprites keyed by text and style."""
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or config.LABEL_SPRITE_CACHE_SIZE
+        self._sprites = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def label(self, text, font_scale=0.6, text_color=(255, 255, 255),
+              bg_color=(45, 45, 45), thickness=2, padding=10, radius=8,
+              alpha=0.9, shadow=True, shadow_offset=5):
+        """Sprite for a label; arguments as for draw_text_with_background()."""
+        key = (text, font_scale, tuple(text_color), tuple(bg_color), thickness,
+               padding, radius, alpha, bool(shadow), shadow_offset)
+
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+                self.hits += 1
+                return sprite
+            self.misses += 1
+
+        # Rendered outside the lock; a concurrent duplicate render is harmless
+        sprite = render_label_sprite(*key)
+        with self._lock:
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.maxsize:
+                self._sprites.popitem(last=False)
+        return sprite
+
+    def clear(self):
+        with self._lock:
+            self._sprites.clear()
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+def _draw_layers(placements):
+    """
+    Group placements into layers of mutually non-overlapping sprites.
+
+    A sprite goes one layer above the highest earlier sprite it overlaps,
+    so drawing the layers in order gives the same result as drawing the
+    sprites one by one.
+    """
+    rects = np.array([
+        (x + sprite.anchor[0], y + sprite.anchor[1],
+         x + sprite.anchor[0] + sprite.size[0] - 1, y + sprite.anchor[1] + sprite.size[1] - 1)
+        for sprite, x, y in placements
+    ]).reshape(-1, 4)
+    overlap = boxes_overlap(rects, rects)
+
+    layer_of = []
+    for j in range(len(placements)):
+        earlier = [layer_of[i] for i in np.flatnonzero(overlap[j, :j])]
+        layer_of.append(max(earlier) + 1 if earlier else 0)
+
+    layers = [[] for _ in range(max(layer_of, default=-1) + 1)]
+    for placement, layer in zip(placements, layer_of):
+        layers[layer].append(placement)
+    return layers
+
+
+def blit_sprites(img, placements):
+    """
+    Composite sprites onto img.
+
+    Args:
+        img: BGR uint8 image, modified in place
+        placements: List of (sprite, x, y) with (x, y) the text origin as
+                    for draw_text_with_background(); later ones are on top
+    """
+    if not placements:
+        return
+
+    img_h, img_w = img.shape[:2]
+
+    # All sprites of a layer are blended with one gather/blend/scatter
+    for layer in _draw_layers(placements):
+        ys = np.concatenate([s.ys + (y + s.anchor[1]) for s, x, y in layer])
+        xs = np.concatenate([s.xs + (x + s.anchor[0]) for s, x, y in layer])
+        premul = np.concatenate([s.premul for s, _, _ in layer])
+        inv_alpha = np.concatenate([s.inv_alpha for s, _, _ in layer])
+
+        inside = (ys >= 0) & (ys < img_h) & (xs >= 0) & (xs < img_w)
+        if not inside.all():
+            ys, xs, premul, inv_alpha = ys[inside], xs[inside], premul[inside], inv_alpha[inside]
+
+        composite_pixels(img, ys, xs, premul, inv_alpha)
+
+
+default_sprite_cache = SpriteCache()
@@ -1,30 +1,59 @@
 
+import functools
+
 import cv2
-import time
 import config
-from utils.drawing import draw_rounded_rectangle, draw_shadow_rectangle, draw_text_with_outline, draw_glow_effect, draw_watermark
+from utils.drawing import draw_rounded_rectangle, draw_shadow_rectangle, draw_text_with_outline, draw_cached_glow, draw_watermark
+
+# Pulse animation: ANIM_STEPS_PER_SECOND phase steps per second of video,
+# cycling through ANIM_PHASES phases
+ANIM_STEPS_PER_SECOND = 3
+ANIM_PHASES = 20
+
+
+def animation_phase(frame_index, fps):
+    """Pulse phase (0 - ANIM_PHASES-1) of a frame, from its position in the video."""
+    return int(frame_index * ANIM_STEPS_PER_SECOND / fps) % ANIM_PHASES
+
+
+@functools.lru_cache(maxsize=None)
+def _pulse(phase):
+    """0.0 to 1.0 pulse of a phase."""
+    half = ANIM_PHASES // 2
+    return abs(phase - half) / half
+
+
+@functools.lru_cache(maxsize=256)
+def _pulse_color(color, phase):
+    """Color dimmed to 70-100% with the pulse."""
+    pulse_intensity = 0.7 + 0.3 * _pulse(phase)
+    return tuple(int(c * pulse_intensity) for c in color)
 
 
 def draw_advanced_dashboard(frame, person_count, fight_active, fight_conf,
-                           fighting_people_ids, graph_history):
+                           fighting_people_ids, graph_history, settings=None,
+                           frame_index=0, fps=None):
+
+    # Per-run Settings (config.py values by default)
+    s = settings or config
 
     h, w = frame.shape[:2]
 
     # Scale based on resolution (use width as reference)
-    scale = min(w / 1000, config.DASHBOARD_SCALE_MAX)
+    scale = min(w / 1000, s.DASHBOARD_SCALE_MAX)
 
     # Common Settings - all scaled
     font = cv2.FONT_HERSHEY_SIMPLEX
 
     # Font sizes scaled using config
-    font_large = config.FONT_SCALE_LARGE * scale
-    font_medium = config.FONT_SCALE_MEDIUM * scale
-    font_small = config.FONT_SCALE_SMALL * scale
-    text_thickness = config.FONT_THICKNESS
+    font_large = s.FONT_SCALE_LARGE * scale
+    font_medium = s.FONT_SCALE_MEDIUM * scale
+    font_small = s.FONT_SCALE_SMALL * scale
+    text_thickness = s.FONT_THICKNESS
 
-    # Animation frame counter (using time for smooth animation)
-    anim_phase = int(time.time() * 3) % 20  # 0-19 cycle
-    pulse = abs(anim_phase - 10) / 10.0  # 0.0 to 1.0 pulse
+    # Animation phase from the frame position (not wall-clock time), so
+    # rendering is reproducible and the pulse layers can be cached
+    anim_phase = animation_phase(frame_index, fps or s.DEFAULT_FPS)
 
     # BOTTOM PANEL LAYOUT - Three sections side by side
     panel_h = int(130 * scale)  # Height of bottom panel (slightly taller for rounded corners)
@@ -49,50 +78,50 @@ def draw_advanced_dashboard(frame, person_count, fight_active, fight_conf,
 
     # --- SECTION 1: STATUS & TOTAL PEOPLE (Bottom Left) ---
     _draw_status_section(frame, s1_x, panel_y, s1_w, panel_h,
-                        fight_active, pulse, person_count, font, font_medium,
-                        text_thickness, padding, scale)
+                        fight_active, anim_phase, person_count, font, font_medium,
+                        text_thickness, padding, scale, s)
 
     # --- SECTION 2: FIGHTING PEOPLE & INTENSITY (Bottom Middle) ---
     _draw_fighting_section(frame, s2_x, panel_y, s2_w, panel_h,
-                          fighting_people_ids, fight_active, fight_conf, pulse,
-                          font, font_small, font_medium, text_thickness, padding, scale)
+                          fighting_people_ids, fight_active, fight_conf, anim_phase,
+                          font, font_small, font_medium, text_thickness, padding, scale, s)
 
     # --- SECTION 3: FREQUENCY GRAPH (Bottom Right) ---
-    _draw_graph_section(frame, s3_x, panel_y, s3_w, panel_h, graph_history, scale)
+    _draw_graph_section(frame, s3_x, panel_y, s3_w, panel_h, graph_history, scale, s)
 
     # Add watermark if enabled
-    if config.ENABLE_WATERMARK:
-        draw_watermark(frame, config.WATERMARK_TEXT, config.WATERMARK_POSITION, config.WATERMARK_ALPHA)
+    if s.ENABLE_WATERMARK:
+        draw_watermark(frame, s.WATERMARK_TEXT, s.WATERMARK_POSITION, s.WATERMARK_ALPHA)
 
 
-def _draw_status_section(frame, x, y, w, h, fight_active, pulse, person_count,
-                        font, font_medium, text_thickness, padding, scale):
+def _draw_status_section(frame, x, y, w, h, fight_active, anim_phase, person_count,
+                        font, font_medium, text_thickness, padding, scale, s):
     """Draw status and total people section with unique rounded style."""
 
     # Draw panel with shadow
-    radius = int(config.PANEL_CORNER_RADIUS * scale)
+    radius = int(s.PANEL_CORNER_RADIUS * scale)
     draw_shadow_rectangle(
         frame, (x, y), (x + w, y + h),
-        config.COLOR_PANEL_BG,
-        shadow_offset=config.PANEL_SHADOW_OFFSET,
+        s.COLOR_PANEL_BG,
+        shadow_offset=s.PANEL_SHADOW_OFFSET,
         radius=radius,
-        alpha=config.DASHBOARD_ALPHA
+        alpha=s.DASHBOARD_ALPHA
     )
 
-    # Pulsing border/glow if fight active
-    if fight_active and config.GLOW_ENABLED:
-        glow_color = config.COLOR_FIGHT
-        draw_glow_effect(frame, (x, y), (x + w, y + h), glow_color,
-                        intensity=int(15 * pulse), radius=radius)
+    # Pulsing border/glow if fight active (one cached layer per phase)
+    if fight_active and s.GLOW_ENABLED:
+        glow_color = s.COLOR_FIGHT
+        draw_cached_glow(frame, (x, y), (x + w, y + h), glow_color,
+                         intensity=int(15 * _pulse(anim_phase)), radius=radius)
 
     # Draw border
-    border_color = config.COLOR_FIGHT if fight_active else config.COLOR_BORDER
+    border_color = s.COLOR_FIGHT if fight_active else s.COLOR_BORDER
     border_thickness = max(2, int(3 * scale)) if fight_active else max(1, int(2 * scale))
     draw_rounded_rectangle(frame, (x, y), (x + w, y + h), border_color,
                           thickness=border_thickness, radius=radius, alpha=1.0)
 
     status_text = "FIGHT ACTIVE" if fight_active else "SAFE"
-    status_color = config.COLOR_FIGHT if fight_active else config.COLOR_SUCCESS
+    status_color = s.COLOR_FIGHT if fight_active else s.COLOR_SUCCESS
 
     # Status text with outline
     draw_text_with_outline(
@@ -105,35 +134,35 @@ def _draw_status_section(frame, x, y, w, h, fight_active, pulse, person_count,
     draw_text_with_outline(
         frame, f"PEOPLE: {person_count}",
         (x + padding, y + int(85 * scale)),
-        font, font_medium, config.COLOR_TEXT_PRIMARY,
+        font, font_medium, s.COLOR_TEXT_PRIMARY,
         outline_color=(0, 0, 0), thickness=text_thickness - 1, outline_thickness=1
     )
 
 
 def _draw_fighting_section(frame, x, y, w, h, fighting_people_ids, fight_active,
-                          fight_conf, pulse, font, font_small, font_medium,
-                          text_thickness, padding, scale):
+                          fight_conf, anim_phase, font, font_small, font_medium,
+                          text_thickness, padding, scale, s):
     """Draw fighting people and intensity section with unique style."""
 
     # Draw panel with shadow
-    radius = int(config.PANEL_CORNER_RADIUS * scale)
+    radius = int(s.PANEL_CORNER_RADIUS * scale)
     draw_shadow_rectangle(
         frame, (x, y), (x + w, y + h),
-        config.COLOR_PANEL_BG,
-        shadow_offset=config.PANEL_SHADOW_OFFSET,
+        s.COLOR_PANEL_BG,
+        shadow_offset=s.PANEL_SHADOW_OFFSET,
         radius=radius,
-        alpha=config.DASHBOARD_ALPHA
+        alpha=s.DASHBOARD_ALPHA
     )
 
     # Border
-    draw_rounded_rectangle(frame, (x, y), (x + w, y + h), config.COLOR_BORDER,
+    draw_rounded_rectangle(frame, (x, y), (x + w, y + h), s.COLOR_BORDER,
                           thickness=max(1, int(2 * scale)), radius=radius, alpha=1.0)
 
     # Header
     draw_text_with_outline(
         frame, "FIGHTING:",
         (x + padding, y + int(30 * scale)),
-        font, font_small, config.COLOR_TEXT_SECONDARY,
+        font, font_small, s.COLOR_TEXT_SECONDARY,
         outline_color=(0, 0, 0), thickness=max(1, int(1 * scale)), outline_thickness=1
     )
 
@@ -143,14 +172,13 @@ def _draw_fighting_section(frame, x, y, w, h, fighting_people_ids, fight_active,
         draw_text_with_outline(
             frame, "None",
             (x + padding, y_offset),
-            font, font_medium, config.COLOR_TEXT_SECONDARY,
+            font, font_medium, s.COLOR_TEXT_SECONDARY,
             outline_color=(0, 0, 0), thickness=text_thickness - 1, outline_thickness=1
         )
     else:
         ids_str = ", ".join([f"P{pid}" for pid in fighting_people_ids[:4]])
         # Pulsing effect on fighting people
-        pulse_intensity = 0.7 + 0.3 * pulse
-        fighting_color = tuple(int(c * pulse_intensity) for c in config.COLOR_DANGER)
+        fighting_color = _pulse_color(s.COLOR_DANGER, anim_phase)
         draw_text_with_outline(
             frame, ids_str,
             (x + padding, y_offset),
@@ -162,7 +190,7 @@ def _draw_fighting_section(frame, x, y, w, h, fighting_people_ids, fight_active,
     draw_text_with_outline(
         frame, "INTENSITY:",
         (x + padding, y + int(100 * scale)),
-        font, font_small, config.COLOR_TEXT_SECONDARY,
+        font, font_small, s.COLOR_TEXT_SECONDARY,
         outline_color=(0, 0, 0), thickness=max(1, int(1 * scale)), outline_thickness=1
     )
 
@@ -184,29 +212,29 @@ def _draw_fighting_section(frame, x, y, w, h, fighting_people_ids, fight_active,
         for i in range(fill_w):
             ratio = i / bar_w
             if ratio > 0.7:
-                color = config.COLOR_DANGER  # Red
+                color = s.COLOR_DANGER  # Red
             elif ratio > 0.4:
-                color = config.COLOR_WARNING  # Orange
+                color = s.COLOR_WARNING  # Orange
             else:
                 color = (0, int(200 * (1 - ratio)), int(200 * ratio))  # Green to yellow
             cv2.line(frame, (bar_x + i, bar_y + 2), (bar_x + i, bar_y + bar_h - 2), color, 1)
 
 
-def _draw_graph_section(frame, x, y, w, h, graph_history, scale):
+def _draw_graph_section(frame, x, y, w, h, graph_history, scale, s):
     """Draw frequency graph section with unique style."""
 
     # Draw panel with shadow
-    radius = int(config.PANEL_CORNER_RADIUS * scale)
+    radius = int(s.PANEL_CORNER_RADIUS * scale)
     draw_shadow_rectangle(
         frame, (x, y), (x + w, y + h),
-        config.COLOR_PANEL_BG,
-        shadow_offset=config.PANEL_SHADOW_OFFSET,
+        s.COLOR_PANEL_BG,
+        shadow_offset=s.PANEL_SHADOW_OFFSET,
         radius=radius,
-        alpha=config.DASHBOARD_ALPHA
+        alpha=s.DASHBOARD_ALPHA
     )
 
     # Border
-    draw_rounded_rectangle(frame, (x, y), (x + w, y + h), config.COLOR_BORDER,
+    draw_rounded_rectangle(frame, (x, y), (x + w, y + h), s.COLOR_BORDER,
                           thickness=max(1, int(2 * scale)), radius=radius, alpha=1.0)
 
     # Draw Graph with glow effect
@@ -222,15 +250,15 @@ def _draw_graph_section(frame, x, y, w, h, graph_history, scale):
             points.append((px, py))
 
         # Draw glow layers for unique effect
-        if config.GLOW_ENABLED:
+        if s.GLOW_ENABLED:
             for thickness_mult in [3, 2, 1]:
                 glow_alpha = 0.2 if thickness_mult == 3 else (0.4 if thickness_mult == 2 else 0.7)
-                glow_color = tuple(int(c * glow_alpha) for c in config.COLOR_SUCCESS)
+                glow_color = tuple(int(c * glow_alpha) for c in s.COLOR_SUCCESS)
                 for i in range(1, len(points)):
                     cv2.line(frame, points[i-1], points[i], glow_color,
                             max(1, int(thickness_mult * 2 * scale)), cv2.LINE_AA)
 
         # Main line with unique color
         for i in range(1, len(points)):
-            cv2.line(frame, points[i-1], points[i], config.COLOR_SUCCESS,
+            cv2.line(frame, points[i-1], points[i], s.COLOR_SUCCESS,
                     max(2, int(2 * scale)), cv2.LINE_AA)